@@ -69,6 +69,6 @@ setup(
     },
     package_data=package_data("video_xblock", [
         "static", "public", "locale", "translations",
-        "backends", "workbench"
+        "backends", "management", "workbench"
     ]),
 )
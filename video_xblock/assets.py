@@ -0,0 +1,130 @@
+"""
+In-process registry of VideoXBlock's static assets.
+
+Static files (JS, CSS, HTML templates) never change between releases,
+so each of them is read from the package and decoded only once per process.
+"""
+
+from collections import namedtuple
+import hashlib
+import sys
+import threading
+
+import pkg_resources
+
+AssetBundle = namedtuple('AssetBundle', ['digest', 'extension', 'content_type', 'content'])
+
+# Separators make concatenated files safe, e.g. if a script isn't terminated with a semicolon.
+BUNDLE_TYPES = {
+    'css': ('text/css', b'\n'),
+    'js': ('application/javascript', b'\n;\n'),
+}
+
+
+class StaticAssetRegistry:
+    """
+    Memoized loader of package resources.
+
+    Keeps both raw (bytes) and decoded (str) payloads of every loaded resource,
+    and counts cache hits, misses and loaded bytes for the sake of monitoring.
+    """
+
+    def __init__(self, package=__name__, encoding='utf8'):
+        """
+        Initialize empty registry for resources of given `package`.
+        """
+        self.package = package
+        self.encoding = encoding
+        self._assets = {}
+        self._bundles = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_loaded = 0
+
+    def _load(self, path):
+        """
+        Return (bytes, str) payloads of a resource, reading it from the package on the first access only.
+        """
+        asset = self._assets.get(path)
+        if asset is not None:
+            self.hits += 1
+            return asset
+
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None:
+                data = pkg_resources.resource_string(self.package, path)
+                asset = (data, sys.intern(data.decode(self.encoding)))
+                self._assets[path] = asset
+                self.misses += 1
+                self.bytes_loaded += len(data)
+            else:
+                self.hits += 1
+        return asset
+
+    def get_bytes(self, path):
+        """
+        Return raw content of a resource.
+        """
+        return self._load(path)[0]
+
+    def get_text(self, path):
+        """
+        Return decoded content of a resource.
+        """
+        return self._load(path)[1]
+
+    def get_bundle(self, paths, extension):
+        """
+        Return resources of the same type concatenated into a single content-hashed bundle.
+
+        Arguments:
+            paths (list): Paths of resources to be bundled, in order.
+            extension (str): Bundle type, either 'js' or 'css'.
+        Returns:
+            AssetBundle: Bundle's digest, extension, content type and content (bytes).
+        """
+        key = (extension, tuple(paths))
+        bundle = self._bundles.get(key)
+        if bundle is None:
+            content_type, separator = BUNDLE_TYPES[extension]
+            content = separator.join(self.get_bytes(path) for path in paths)
+            digest = hashlib.sha1(content).hexdigest()[:16]
+            bundle = self._bundles[key] = AssetBundle(digest, extension, content_type, content)
+        return bundle
+
+    def __contains__(self, path):
+        """
+        Check if resource has already been loaded.
+        """
+        return path in self._assets
+
+    @property
+    def stats(self):
+        """
+        Return registry usage counters.
+
+        Returns:
+            dict: E.g. {'assets': 12, 'hits': 340, 'misses': 12, 'bytes_loaded': 412345}
+        """
+        return {
+            'assets': len(self._assets),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes_loaded': self.bytes_loaded,
+        }
+
+    def clear(self):
+        """
+        Drop all loaded resources and reset counters.
+        """
+        with self._lock:
+            self._assets = {}
+            self._bundles = {}
+            self.hits = 0
+            self.misses = 0
+            self.bytes_loaded = 0
+
+
+static_assets = StaticAssetRegistry()  # pylint: disable=invalid-name
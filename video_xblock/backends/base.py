@@ -7,6 +7,7 @@ Base Video player plugin.
 """
 
 import abc
+from collections import namedtuple
 import itertools
 import json
 import operator
@@ -19,9 +20,13 @@ from xblock.validation import ValidationMessage
 
 from django.conf import settings
 
+from video_xblock.assets import static_assets
 from video_xblock.exceptions import VideoXBlockException
 from video_xblock.utils import render_resource, render_template, resource_string, ugettext as _
 
+# Static part of player's fragment: a Fragment with player's resources and bundles to be referred by url.
+FragmentSkeleton = namedtuple('FragmentSkeleton', ['fragment', 'bundles'])
+
 
 class BaseApiClient:
     """
@@ -74,12 +79,30 @@ class BaseVideoPlayer(Plugin):
     entry_point = 'video_xblock.v1'
     advanced_tab_enabled = True
 
+    # Video player classes loaded from entry points, by entry point name and registered extra identifiers.
+    _player_classes = {}
+
     def __init__(self, xblock):
         """
         Initialize base video player class object.
         """
         self.xblock = xblock
 
+    @classmethod
+    def load_classes(cls, fail_silently=True):
+        """
+        Load all video player classes, resolving entry points once per process.
+
+        Returns:
+            tuple: (name, class) pairs of all available video players.
+        """
+        key = (cls.entry_point, tuple(identifier for identifier, _entry_point in cls.extra_entry_points))
+        player_classes = cls._player_classes.get(key)
+        if player_classes is None:
+            player_classes = tuple(super(BaseVideoPlayer, cls).load_classes(fail_silently))
+            cls._player_classes[key] = player_classes
+        return player_classes
+
     @abc.abstractmethod
     def url_re(self):
         """
@@ -204,28 +227,30 @@ class BaseVideoPlayer(Plugin):
         """
         pass
 
-    def get_frag(self, **context):
+    css_urls = [
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/4.7.0/css/font-awesome.min.css',
+    ]
+    js_urls = []
+
+    def get_css_files(self):
         """
-        Return a Fragment required to render video player on the client side.
+        List of static CSS files required by the player.
         """
-        context['player_state'] = json.dumps(context['player_state'])
-
-        frag = Fragment()
-        frag.add_css_url(
-            'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/4.7.0/css/font-awesome.min.css'
-        )
-        css_files = [
+        return [
             'static/vendor/css/video-js.min.css',
             'static/css/videojs.css',
             'static/css/videojs-contextmenu-ui.css',
         ]
-        for css_file in css_files:
-            frag.add_css(self.resource_string(css_file))
 
-        frag.add_javascript(
-            self.render_resource('static/js/context.js', **context)
-        )
+    def get_js_files(self, transcripts_enabled):
+        """
+        List of static JavaScript files required by the player, in the order of execution.
 
+        Subclasses extend the list with platform specific scripts.
+
+        Arguments:
+            transcripts_enabled (bool): Whether transcripts plugin is to be loaded.
+        """
         js_files = [
             'static/js/base.js',
             'static/vendor/js/video.min.js',
@@ -237,7 +262,7 @@ class BaseVideoPlayer(Plugin):
             'static/js/videojs/videojs-speed-handler.js'
         ]
 
-        if json.loads(context['player_state'])['transcripts']:
+        if transcripts_enabled:
             js_files += [
                 'static/vendor/js/videojs-transcript.min.js',
                 'static/js/student-view/transcript-download.js',
@@ -250,9 +275,119 @@ class BaseVideoPlayer(Plugin):
             'static/js/videojs/videojs-event-plugin.js',
             'static/js/videojs/fullscreen-extends.js',
         ]
+        return js_files
+
+    @property
+    def bundle_assets(self):
+        """
+        Return True if static files are to be served as cacheable bundles instead of being inlined.
+
+        Enabled by `"bundle_player_assets": true` in `XBLOCK_SETTINGS["video_xblock"]`.
+        """
+        return bool(self.xblock.settings.get('bundle_player_assets'))
+
+    def get_asset_bundles(self):
+        """
+        Return all asset bundles the player may refer to.
+        """
+        bundles = [
+            static_assets.get_bundle(self.get_js_files(transcripts_enabled), 'js')
+            for transcripts_enabled in (False, True)
+        ]
+        css_files = self.get_css_files()
+        if css_files:
+            bundles.append(static_assets.get_bundle(css_files, 'css'))
+        return bundles
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
+    def get_bundle_url(self, files, extension):
+        """
+        Return url of a content-hashed bundle of given static files, served by `VideoXBlock.player_bundle`.
+        """
+        bundle = static_assets.get_bundle(files, extension)
+        return self.xblock.runtime.handler_url(
+            self.xblock, 'player_bundle', '{}.{}'.format(bundle.digest, bundle.extension)
+        )
+
+    _fragment_skeletons = {}
+
+    def build_fragment_skeleton(self, transcripts_enabled):
+        """
+        Build static part of player's fragment: external urls, and static files either inlined or bundled.
+
+        Arguments:
+            transcripts_enabled (bool): Whether transcripts plugin is to be loaded.
+        Returns:
+            FragmentSkeleton: Fragment with player's resources and bundles to be referred by url.
+        """
+        frag = Fragment()
+        for css_url in self.css_urls:
+            frag.add_css_url(css_url)
+
+        css_files, js_files = self.get_css_files(), self.get_js_files(transcripts_enabled)
+        bundles = ()
+        if self.bundle_assets:
+            bundles = tuple(
+                static_assets.get_bundle(files, extension)
+                for files, extension in ((css_files, 'css'), (js_files, 'js')) if files
+            )
+        else:
+            for css_file in css_files:
+                frag.add_css(self.resource_string(css_file))
+            for js_file in js_files:
+                frag.add_javascript(self.resource_string(js_file))
+
+        for js_url in self.js_urls:
+            frag.add_javascript_url(js_url)
+        return FragmentSkeleton(frag, bundles)
+
+    def get_fragment_skeleton(self, transcripts_enabled):
+        """
+        Return fragment skeleton, built once per process for each player class and variant.
+        """
+        key = (type(self), transcripts_enabled, self.bundle_assets)
+        skeleton = self._fragment_skeletons.get(key)
+        if skeleton is None:
+            skeleton = BaseVideoPlayer._fragment_skeletons[key] = self.build_fragment_skeleton(transcripts_enabled)
+        return skeleton
+
+    @classmethod
+    def clear_fragment_skeletons(cls):
+        """
+        Drop fragment skeletons of all the players, e.g. when static files have changed during development.
+        """
+        BaseVideoPlayer._fragment_skeletons.clear()
+
+    def add_fragment_skeleton(self, frag, transcripts_enabled):
+        """
+        Add player's static resources to a fragment, rendered for a particular video xblock.
+
+        Only bundles' urls are made per request, since they point to the xblock's handler.
+        """
+        skeleton = self.get_fragment_skeleton(transcripts_enabled)
+        frag.add_fragment_resources(skeleton.fragment)
+        for bundle in skeleton.bundles:
+            bundle_url = self.xblock.runtime.handler_url(
+                self.xblock, 'player_bundle', '{}.{}'.format(bundle.digest, bundle.extension)
+            )
+            if bundle.extension == 'css':
+                frag.add_css_url(bundle_url)
+            else:
+                frag.add_javascript_url(bundle_url)
+
+    def get_frag(self, **context):
+        """
+        Return a Fragment required to render video player on the client side.
+
+        Player's static resources are taken from the fragment skeleton, so only `context.js` is rendered per request.
+        """
+        transcripts_enabled = bool(context['player_state']['transcripts'])
+        context['player_state'] = json.dumps(context['player_state'])
+
+        frag = Fragment()
+        frag.add_javascript(
+            self.render_resource('static/js/context.js', **context)
+        )
+        self.add_fragment_skeleton(frag, transcripts_enabled)
 
         return frag
 
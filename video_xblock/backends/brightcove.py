@@ -9,16 +9,21 @@ import json
 import http.client as http_client
 import logging
 import re
+import time
 
 import requests
 from xblock.fragment import Fragment
 
+from video_xblock.assets import static_assets
 from video_xblock.backends.base import BaseVideoPlayer, BaseApiClient
+from video_xblock.cache import DEFAULT_CACHE_ALIAS, get_cache_backend
 from video_xblock.constants import TranscriptSource
 from video_xblock.exceptions import ApiClientError, VideoXBlockException
+from video_xblock.http_client import get_http_client
 from video_xblock.utils import ugettext as _, remove_escaping
 
 log = logging.getLogger(__name__)
+brightcove_http = get_http_client('brightcove')  # pylint: disable=invalid-name
 
 
 class BrightcoveApiClientError(ApiClientError):
@@ -37,19 +42,76 @@ class BrightcoveApiClient(BaseApiClient):
     Responsible for API credentials issuing and access_token refreshing.
     """
 
-    def __init__(self, api_key, api_secret, token=None, account_id=None):
+    # Access tokens are refreshed this number of seconds before they expire.
+    ACCESS_TOKEN_REFRESH_MARGIN = 30
+    # Brightcove access tokens expire in 5 minutes, unless API response says otherwise.
+    ACCESS_TOKEN_LIFETIME = 5 * 60
+
+    def __init__(self, api_key, api_secret, token=None, account_id=None, cache=None):
         """
         Initialize Brightcove API client.
+
+        Access token isn't requested until an authorised API call is made.
         """
         if token and account_id:
             self.create_credentials(token, account_id)
         else:
             self.api_key = api_key
             self.api_secret = api_secret
-        if api_key and api_secret:
-            self.access_token = self._refresh_access_token()
-        else:
-            self.access_token = ''
+        self.token_cache = cache if cache is not None else get_cache_backend()
+        self._access_token = None
+
+    @property
+    def token_cache_key(self):
+        """
+        Return key of access token in the cache shared between workers.
+        """
+        return 'video_xblock:brightcove:access_token:{}'.format(self.api_key)
+
+    @property
+    def access_token(self):
+        """
+        Return valid access token, requesting new one only if there is no cached token which is about to expire.
+        """
+        if not (self.api_key and self.api_secret):
+            return ''
+
+        now = time.time()
+        cached = self._access_token
+        if cached is None or cached['client_id'] != self.api_key:
+            cached = self.token_cache.get(self.token_cache_key)
+        if cached and cached['expires_at'] - self.ACCESS_TOKEN_REFRESH_MARGIN > now:
+            self._access_token = cached
+            return cached['token']
+        return self.refresh_access_token()
+
+    def refresh_access_token(self):
+        """
+        Request new access token and share it with other workers via the cache.
+        """
+        self._access_token = None
+        token, expires_in = self._refresh_access_token()
+        if not token:
+            self.token_cache.delete(self.token_cache_key)
+            return token
+
+        cached = {'client_id': self.api_key, 'token': token, 'expires_at': time.time() + expires_in}
+        timeout = max(expires_in - self.ACCESS_TOKEN_REFRESH_MARGIN, 1)
+        self.token_cache.set(self.token_cache_key, cached, timeout)
+        self._access_token = cached
+        return token
+
+    def get_authorization(self):
+        """
+        Return value of Authorization header for authorised API calls.
+
+        Raises:
+            BrightcoveApiClientError: If there is no access token, e.g. it couldn't be refreshed.
+        """
+        access_token = self.access_token
+        if not access_token:
+            raise BrightcoveApiClientError(_("Couldn't get Brightcove API access token."))
+        return 'Bearer ' + access_token
 
     @staticmethod
     def create_credentials(token, account_id):
@@ -78,7 +140,7 @@ class BrightcoveApiClient(BaseApiClient):
             "name": "Open edX Video XBlock"
         }
         url = 'https://oauth.brightcove.com/v4/client_credentials'
-        response = requests.post(url, json=data, headers=headers)
+        response = brightcove_http.post(url, json=data, headers=headers)
         response_data = response.json()
         # New resource must have been created.
         if response.status_code == http_client.CREATED and response_data:
@@ -95,6 +157,9 @@ class BrightcoveApiClient(BaseApiClient):
     def _refresh_access_token(self):
         """
         Request new access token to send with requests to Brightcove. Access Token expires every 5 minutes.
+
+        Returns:
+            tuple: Access token (None on failure) and its lifetime in seconds.
         """
         url = "https://oauth.brightcove.com/v3/access_token"
         params = {"grant_type": "client_credentials"}
@@ -106,13 +171,13 @@ class BrightcoveApiClient(BaseApiClient):
             "Authorization": "Basic " + auth_string
         }
         try:
-            resp = requests.post(url, headers=headers, data=params)
+            resp = brightcove_http.post(url, headers=headers, data=params)
             if resp.status_code == http_client.OK:
                 result = resp.json()
-                return result['access_token']
+                return result['access_token'], result.get('expires_in', self.ACCESS_TOKEN_LIFETIME)
         except IOError:
             log.exception(_("Connection issue. Couldn't refresh API access token."))
-            return None
+        return None, 0
 
     def get(self, url, headers=None, can_retry=True):
         """
@@ -125,14 +190,14 @@ class BrightcoveApiClient(BaseApiClient):
         Returns:
             Response in python native data format.
         """
-        headers_ = {'Authorization': 'Bearer ' + str(self.access_token)}
+        headers_ = {'Authorization': self.get_authorization()}
         if headers is not None:
             headers_.update(headers)
-        resp = requests.get(url, headers=headers_)
+        resp = brightcove_http.get(url, headers=headers_)
         if resp.status_code == http_client.OK:  # pylint: disable=no-else-return
             return resp.json()
         elif resp.status_code == http_client.UNAUTHORIZED and can_retry:
-            self.access_token = self._refresh_access_token()
+            self.refresh_access_token()
             return self.get(url, headers, can_retry=False)
         else:
             raise BrightcoveApiClientError
@@ -150,18 +215,18 @@ class BrightcoveApiClient(BaseApiClient):
             Response in Python native data format.
         """
         headers_ = {
-            'Authorization': 'Bearer ' + self.access_token,
+            'Authorization': self.get_authorization(),
             'Content-type': 'application/json'
         }
         if headers is not None:
             headers_.update(headers)
 
-        resp = requests.post(url, data=payload, headers=headers_)
+        resp = brightcove_http.post(url, data=payload, headers=headers_)
         log.debug("BC response status: {}".format(resp.status_code))
         if resp.status_code in (http_client.OK, http_client.CREATED):  # pylint: disable=no-else-return
             return resp.json()
         elif resp.status_code == http_client.UNAUTHORIZED and can_retry:
-            self.access_token = self._refresh_access_token()
+            self.refresh_access_token()
             return self.post(url, payload, headers, can_retry=False)
 
         try:
@@ -417,7 +482,7 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
             return
 
         try:
-            response = requests.head(self.get_js_url(data.account_id, data.player_id))
+            response = brightcove_http.head(self.get_js_url(data.account_id, data.player_id))
             if not response.ok:
                 self.add_validation_message(validation, _(
                     u"Invalid Account ID or Player ID, please recheck."
@@ -444,7 +509,10 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
         super(BrightcovePlayer, self).__init__(xblock)
         self.api_key = xblock.metadata.get('client_id')
         self.api_secret = xblock.metadata.get('client_secret')
-        self.api_client = BrightcoveApiClient(self.api_key, self.api_secret)
+        self.api_client = BrightcoveApiClient(
+            self.api_key, self.api_secret,
+            cache=get_cache_backend(getattr(xblock, 'settings', {}).get('cache_alias', DEFAULT_CACHE_ALIAS))
+        )
 
     def media_id(self, href):
         """
@@ -465,18 +533,28 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
         frag = Fragment(
             self.render_template('brightcove.html', **context)
         )
-        frag.add_css_url(
-            'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/4.7.0/css/font-awesome.min.css'
-        )
         frag.add_javascript(
             self.render_resource('static/js/context.js', **context)
         )
-        js_files = [
+        self.add_fragment_skeleton(frag, transcripts_enabled=False)
+        return frag
+
+    def get_css_files(self):
+        """
+        List of static CSS files required by Brightcove player.
+        """
+        return ['static/css/brightcove.css']
+
+    def get_js_files(self, transcripts_enabled):
+        """
+        List of static JavaScript files required by Brightcove player.
+
+        Video.js plugins are listed separately, see `get_vjs_plugin_files`.
+        """
+        return [
             'static/js/base.js',
             'static/vendor/js/array-from-polyfill.js',
-            'static/js/student-view/player-state.js'
-        ]
-        js_files += [
+            'static/js/student-view/player-state.js',
             'static/js/videojs/videojs-tabindex.js',
             'static/js/videojs/toggle-button.js',
             'static/js/videojs/videojs-event-plugin.js',
@@ -484,43 +562,61 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
             'static/js/videojs/fullscreen-extends.js',
         ]
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
-
-        frag.add_css(
-            self.resource_string('static/css/brightcove.css')
-        )
-        log.debug("[get_frag] initialized scripts: %s", js_files)
-        return frag
-
-    def get_player_html(self, **context):
+    @staticmethod
+    def get_vjs_plugin_files(transcripts_enabled):
         """
-        Add VideoJS plugins to the context and render player html using base class logic.
+        List of VideoJS plugins, to be loaded after Brightcove player script.
         """
         vjs_plugins = [
             'static/vendor/js/videojs-offset.min.js',
             'static/js/videojs/videojs-speed-handler.js'
         ]
-        if context.get('transcripts'):
+        if transcripts_enabled:
             vjs_plugins += [
                 'static/vendor/js/videojs-transcript.min.js',
                 'static/js/videojs/videojs-transcript.js'
             ]
-        context['vjs_plugins'] = map(self.resource_string, vjs_plugins)
-        log.debug("Initialized scripts: %s", vjs_plugins)
-        return super(BrightcovePlayer, self).get_player_html(**context)
+        return vjs_plugins
 
-    def dispatch(self, _request, suffix):
+    def get_asset_bundles(self):
         """
-        Brightcove dispatch method exposes different utility entry points.
+        Return all asset bundles Brightcove player may refer to, including VideoJS plugins bundles.
+        """
+        bundles = [
+            static_assets.get_bundle(self.get_js_files(transcripts_enabled=False), 'js'),
+            static_assets.get_bundle(self.get_css_files(), 'css'),
+        ]
+        bundles += [
+            static_assets.get_bundle(self.get_vjs_plugin_files(transcripts_enabled), 'js')
+            for transcripts_enabled in (False, True)
+        ]
+        return bundles
 
-        Entry point can either return info about video or Brightcove account
-        or perform some action via Brightcove API.
+    def get_player_html(self, **context):
         """
-        if not self.api_key and self.api_secret:
-            raise BrightcoveApiClientError(_('No API credentials provided'))
+        Add VideoJS plugins to the context and render player html using base class logic.
+        """
+        vjs_plugins = self.get_vjs_plugin_files(bool(context.get('transcripts')))
+        if self.bundle_assets:
+            context['vjs_plugins_url'] = self.get_bundle_url(vjs_plugins, 'js')
+        else:
+            context['vjs_plugins'] = map(self.resource_string, vjs_plugins)
+        log.debug("Initialized scripts: %s", vjs_plugins)
+        return super(BrightcovePlayer, self).get_player_html(**context)
+
+    # Entry points making slow API calls, which are run as background jobs.
+    background_dispatch_routes = (
+        'ensure_ingest_profiles',
+        'submit_retranscode_default',
+        'submit_retranscode_autoquality',
+        'submit_retranscode_encryption',
+    )
 
-        routes = {
+    def get_dispatch_routes(self):
+        """
+        Return entry points exposed by `dispatch`.
+        """
+        return {
             'create_credentials': lambda: self.create_credentials(
                 self.xblock.token, self.xblock.account_id
             ),
@@ -544,9 +640,23 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
             ),
         }
 
-        if suffix in routes:
-            return routes[suffix]()
-        return {'success': False, 'message': 'Unknown method'}
+    def dispatch(self, _request, suffix, background=True):
+        """
+        Brightcove dispatch method exposes different utility entry points.
+
+        Entry point can either return info about video or Brightcove account
+        or perform some action via Brightcove API. Slow actions are enqueued as background jobs
+        (unless `background` is False), and state of the enqueued job is returned instead.
+        """
+        if not self.api_key and self.api_secret:
+            raise BrightcoveApiClientError(_('No API credentials provided'))
+
+        routes = self.get_dispatch_routes()
+        if suffix not in routes:
+            return {'success': False, 'message': 'Unknown method'}
+        if background and suffix in self.background_dispatch_routes:
+            return self.xblock.enqueue_job('dispatch_job', suffix=suffix)
+        return routes[suffix]()
 
     def can_show_settings(self):
         """
@@ -660,6 +770,6 @@ class BrightcovePlayer(BaseVideoPlayer, BrightcoveHlsMixin):
         log.debug("BC: downloading default transcript from url:{}".format(url))
         if url is None:
             raise VideoXBlockException(_('`url` parameter is required.'))
-        data = requests.get(url)
+        data = brightcove_http.get(url)
 
         return remove_escaping(data.content)
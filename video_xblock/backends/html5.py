@@ -64,16 +64,17 @@ class Html5Player(BaseVideoPlayer):
         frag.add_content(
             self.render_resource('static/html/html5.html', **context)
         )
-        js_files = [
+        return frag
+
+    def get_js_files(self, transcripts_enabled):
+        """
+        Extend player's JavaScript files with offset and context menu plugins.
+        """
+        return super(Html5Player, self).get_js_files(transcripts_enabled) + [
             'static/vendor/js/videojs-offset.min.js',
             'static/js/videojs/player-context-menu.js'
         ]
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
-
-        return frag
-
     @staticmethod
     def player_data_setup(context):
         """
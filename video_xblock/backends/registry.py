@@ -0,0 +1,102 @@
+"""
+Dispatch table detecting video player by video URL.
+
+URL patterns of all video players are compiled into a single regex, so a video URL
+is classified, and its named groups (e.g. `media_id`) are extracted, in one pass.
+"""
+
+from collections import namedtuple
+import re
+
+from video_xblock.constants import PlayerName
+
+from .base import BaseVideoPlayer
+
+PlayerUrlMatch = namedtuple('PlayerUrlMatch', ['player_name', 'player_class', 'groups'])
+
+NAMED_GROUP_RE = re.compile(r'\(\?P(?P<kind>[<=])(?P<name>\w+)')
+# Only these flags can be applied to a part of a regex.
+SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+class PlayerUrlRegistry:
+    """
+    Combined URL regex of video players.
+
+    Players are tried in the given order, except for the dummy player which matches any URL
+    and thus is tried last. Each player's pattern is searched in the whole URL, as `BaseVideoPlayer.match` does.
+    """
+
+    def __init__(self, players):
+        """
+        Compile URL patterns of given players.
+
+        Arguments:
+            players (iterable): (name, class) pairs of video players.
+        """
+        self.players = players
+        self._alternatives = {}
+        alternatives = []
+        for player_name, player_class in sorted(players, key=lambda player: player[0] == PlayerName.DUMMY):
+            for pattern, flags in self.get_patterns(player_class.url_re):
+                group = 'player{}'.format(len(alternatives))
+                prefix = group + '_'
+                group_names = []
+
+                def rename_group(match, prefix=prefix, group_names=group_names):
+                    """
+                    Prefix group name, so that group names of different players don't clash.
+                    """
+                    if match.group('kind') == '<':
+                        group_names.append(match.group('name'))
+                    return '(?P{}{}{}'.format(match.group('kind'), prefix, match.group('name'))
+
+                pattern = NAMED_GROUP_RE.sub(rename_group, pattern)
+                scoped_flags = ''.join(letter for flag, letter in SCOPED_FLAGS if flags & flag)
+                alternatives.append(r'(?P<{}>[\s\S]*?(?{}:{}))'.format(group, scoped_flags, pattern))
+                self._alternatives[group] = (player_name, player_class, prefix, group_names)
+        self.regex = re.compile('|'.join(alternatives)) if alternatives else None
+
+    @staticmethod
+    def get_patterns(url_re):
+        """
+        Return (pattern, flags) pairs out of player's `url_re` attribute.
+
+        `url_re` can be a regex object, a list of regex objects, or a string (matched case-insensitively).
+        """
+        if isinstance(url_re, list):
+            return [(regex.pattern, regex.flags) for regex in url_re]
+        if isinstance(url_re, type(re.compile(''))):
+            return [(url_re.pattern, url_re.flags)]
+        if isinstance(url_re, str):
+            return [(url_re, re.IGNORECASE)]
+        return []
+
+    def match(self, href):
+        """
+        Detect video player able to render a video URL.
+
+        Returns:
+            PlayerUrlMatch: Player's name, class and values of named groups of player's URL pattern
+            (e.g. {'media_id': '12345'}), None if no player matches the URL.
+        """
+        match = self.regex.match(href) if self.regex else None
+        if match is None:
+            return None
+        player_name, player_class, prefix, group_names = self._alternatives[match.lastgroup]
+        groups = {name: match.group(prefix + name) for name in group_names}
+        return PlayerUrlMatch(player_name, player_class, groups)
+
+
+_registry = None
+
+
+def get_player_url_registry():
+    """
+    Return URL registry of all available video players, compiled once per process.
+    """
+    global _registry  # pylint: disable=global-statement
+    players = BaseVideoPlayer.load_classes()
+    if _registry is None or _registry.players is not players:
+        _registry = PlayerUrlRegistry(players)
+    return _registry
@@ -26,6 +26,11 @@ class TencentPlayer(BaseVideoPlayer):
     fields_help = {
         'href': _('Your FileID of the video to be played. E.g. 5285890799710670616'),
     }
+    css_urls = ['//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/tcplayer.css']
+    js_urls = [
+        '//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/libs/hls.min.0.12.4.js',
+        '//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/tcplayer.v4.min.js',
+    ]
 
     @property
     def basic_fields(self):
@@ -67,20 +72,21 @@ class TencentPlayer(BaseVideoPlayer):
         frag = Fragment(
             self.render_template('tencent.html', **context)
         )
-        frag.add_javascript(
-            self.resource_string('static/js/base.js')
-        )
+        self.add_fragment_skeleton(frag, transcripts_enabled=False)
         frag.add_javascript(
             self.render_resource('static/js/videojs/tencent-player-init.js', **context)
         )
 
-        js_urls = [
-            '//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/libs/hls.min.0.12.4.js',
-            '//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/tcplayer.v4.min.js',
-        ]
-        for js_url in js_urls:
-            frag.add_javascript_url(js_url)
+        return frag
 
-        frag.add_css_url('//cloudcache.tencent-cloud.com/open/qcloud/video/tcplayer/tcplayer.css')
+    def get_css_files(self):
+        """
+        Tencent player is styled by its own stylesheet, see `css_urls`.
+        """
+        return []
 
-        return frag
+    def get_js_files(self, transcripts_enabled):
+        """
+        List of static JavaScript files required by Tencent player.
+        """
+        return ['static/js/base.js']
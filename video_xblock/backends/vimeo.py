@@ -8,13 +8,13 @@ import json
 import logging
 import re
 
-import requests
-
 from video_xblock import BaseVideoPlayer, ApiClientError
 from video_xblock.backends.base import BaseApiClient
+from video_xblock.http_client import get_http_client
 from video_xblock.utils import ugettext as _, remove_escaping
 
 log = logging.getLogger(__name__)
+vimeo_http = get_http_client('vimeo')  # pylint: disable=invalid-name
 
 
 class VimeoApiClientError(ApiClientError):
@@ -56,7 +56,7 @@ class VimeoApiClient(BaseApiClient):
         }
         if headers is not None:
             headers_.update(headers)
-        resp = requests.get(url, headers=headers_)
+        resp = vimeo_http.get(url, headers=headers_)
         if resp.status_code == http_client.OK:
             return resp.json()
         else:
@@ -166,16 +166,17 @@ class VimeoPlayer(BaseVideoPlayer):
         frag.add_content(
             self.render_resource('static/html/vimeo.html', **context)
         )
-        js_files = [
+        return frag
+
+    def get_js_files(self, transcripts_enabled):
+        """
+        Extend player's JavaScript files with Vimeo tech.
+        """
+        return super(VimeoPlayer, self).get_js_files(transcripts_enabled) + [
             'static/vendor/js/Vimeo.js',
             'static/vendor/js/videojs-offset.min.js'
         ]
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
-
-        return frag
-
     @staticmethod
     def player_data_setup(context):
         """
@@ -274,6 +275,6 @@ class VimeoPlayer(BaseVideoPlayer):
         Returns:
             sub (unicode): Transcripts formatted per WebVTT format https://w3c.github.io/webvtt/
         """
-        data = requests.get(url)
+        data = vimeo_http.get(url)
 
         return remove_escaping(data.content)
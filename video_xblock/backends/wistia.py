@@ -9,14 +9,15 @@ import http.client as http_client
 import logging
 import re
 
-import requests
 import babelfish
 
 from video_xblock import BaseVideoPlayer
 from video_xblock.constants import TranscriptSource
+from video_xblock.http_client import get_http_client
 from video_xblock.utils import ugettext as _
 
 log = logging.getLogger(__name__)
+wistia_http = get_http_client('wistia')  # pylint: disable=invalid-name
 
 
 class WistiaPlayer(BaseVideoPlayer):
@@ -100,18 +101,18 @@ class WistiaPlayer(BaseVideoPlayer):
         frag.add_content(
             self.render_resource('static/html/wistiavideo.html', **context)
         )
+        return frag
 
-        js_files = [
+    def get_js_files(self, transcripts_enabled):
+        """
+        Extend player's JavaScript files with Wistia tech.
+        """
+        return super(WistiaPlayer, self).get_js_files(transcripts_enabled) + [
             'static/vendor/js/vjs.wistia.js',
             'static/vendor/js/videojs-offset.min.js',
             'static/js/videojs/player-context-menu.js'
         ]
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
-
-        return frag
-
     @staticmethod
     def player_data_setup(context):
         """
@@ -145,7 +146,7 @@ class WistiaPlayer(BaseVideoPlayer):
         auth_data, error_message = {}, ''
         auth_data['token'] = token
         url = self.captions_api.get('auth_sample_url').format(token=str(token))
-        response = requests.get('https://' + url)
+        response = wistia_http.get('https://' + url)
         if response.status_code == http_client.UNAUTHORIZED:
             error_message = "Authentication failed. " \
                             "Please ensure you have provided a valid master token, using Video API Token field."
@@ -183,7 +184,7 @@ class WistiaPlayer(BaseVideoPlayer):
         # Fetch available transcripts' languages (codes and English labels), and assign its' urls.
         try:
             # get all languages caps data:
-            response = requests.get('https://{}'.format(url))
+            response = wistia_http.get('https://{}'.format(url))
         except IOError as exc:
             # Probably, current API has changed
             message = _('No timed transcript may be fetched from a video platform.\nError details: {}').format(
@@ -287,7 +288,7 @@ class WistiaPlayer(BaseVideoPlayer):
             text (unicode): Text of transcripts.
         """
         try:
-            response = requests.get(url)
+            response = wistia_http.get(url)
             json_data = response.json()
             return json_data['text']
         except IOError:
@@ -15,10 +15,13 @@ import requests
 
 from video_xblock.constants import TranscriptSource
 from video_xblock.exceptions import VideoXBlockException
+from video_xblock.http_client import get_http_client
 from video_xblock.utils import ugettext as _
 
 from .base import BaseVideoPlayer
 
+youtube_http = get_http_client('youtube')  # pylint: disable=invalid-name
+
 
 class YoutubePlayer(BaseVideoPlayer):
     """
@@ -65,17 +68,17 @@ class YoutubePlayer(BaseVideoPlayer):
         frag.add_content(
             self.render_resource('static/html/youtube.html', **context)
         )
+        return frag
 
-        js_files = [
+    def get_js_files(self, transcripts_enabled):
+        """
+        Extend player's JavaScript files with Youtube tech.
+        """
+        return super(YoutubePlayer, self).get_js_files(transcripts_enabled) + [
             'static/vendor/js/Youtube.min.js',
             'static/vendor/js/videojs-offset.min.js'
         ]
 
-        for js_file in js_files:
-            frag.add_javascript(self.resource_string(js_file))
-
-        return frag
-
     @staticmethod
     def player_data_setup(context):
         """
@@ -117,7 +120,7 @@ class YoutubePlayer(BaseVideoPlayer):
         message = ''
 
         try:
-            data = requests.get('http://' + self.captions_api['url'], params=transcripts_param)
+            data = youtube_http.get('http://' + self.captions_api['url'], params=transcripts_param)
         except requests.exceptions.RequestException as exception:
             # Probably, current API has changed
             message = 'No timed transcript may be fetched from a video platform. ' \
@@ -225,7 +228,7 @@ class YoutubePlayer(BaseVideoPlayer):
         if url is None:
             raise VideoXBlockException(_('`url` parameter is required.'))
         utf8_parser = etree.XMLParser()
-        data = requests.get(url)
+        data = youtube_http.get(url)
         xmltree = etree.fromstring(data.content.encode(), parser=utf8_parser)
         sub = [
             self.format_transcript_element(element, i)
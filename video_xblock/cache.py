@@ -0,0 +1,244 @@
+"""
+Shared caching of external API responses.
+
+Django cache backend is used when it's available, so cached data is shared between all
+LMS/CMS workers. In-process LRU cache is used as a fallback otherwise.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import caches, InvalidCacheBackendError
+from django.core.exceptions import ImproperlyConfigured
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ALIAS = 'default'
+# Revalidation of a stale entry is done once per this number of seconds at most.
+REVALIDATION_LOCK_TIMEOUT = 30
+# Concurrent fetches of a key wait for the first one this number of seconds at most, then fetch themselves.
+FETCH_LOCK_TIMEOUT = 10
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache with a size limit and expiring entries.
+
+    Implements the subset of Django cache API used by VideoXBlock.
+    """
+
+    def __init__(self, max_size=1024):
+        """
+        Initialize empty cache holding up to `max_size` entries.
+        """
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_alive(self, key):
+        """
+        Return (value, expires_at) tuple for a key or None if it is missing or expired.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    def _set(self, key, value, timeout):
+        """
+        Store a value evicting the least recently used entries if cache is full.
+        """
+        expires_at = None if timeout is None else time.time() + timeout
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        """
+        Fetch a given key from the cache.
+        """
+        with self._lock:
+            item = self._get_alive(key)
+        return default if item is None else item[0]
+
+    def set(self, key, value, timeout=None):
+        """
+        Set a value in the cache for `timeout` seconds, or forever if `timeout` is None.
+        """
+        with self._lock:
+            self._set(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        """
+        Set a value in the cache if the key does not already exist.
+
+        Returns:
+            bool: True if the value was stored, False otherwise.
+        """
+        with self._lock:
+            if self._get_alive(key) is not None:
+                return False
+            self._set(key, value, timeout)
+            return True
+
+    def delete(self, key):
+        """
+        Delete a key from the cache.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LRUCache()  # pylint: disable=invalid-name
+
+
+def get_cache_backend(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Return Django cache backend with a given alias, or in-process cache if Django cache isn't available.
+    """
+    try:
+        return caches[alias]
+    except (ImproperlyConfigured, InvalidCacheBackendError):
+        return local_cache
+
+
+class TTLCache:
+    """
+    Cache of values produced by (slow) fetch functions.
+
+    Fresh values are served for `timeout` seconds. Afterwards they are considered stale,
+    but are still served for another `stale_timeout` seconds while a single background
+    thread fetches an up-to-date value. Failures (fetch function returned None) are
+    cached for `failure_timeout` seconds, so a failing API isn't called on every request.
+    """
+
+    # Key -> [lock, number of threads using it], shared by all instances.
+    _fetch_locks = {}
+    _fetch_locks_guard = threading.Lock()
+
+    def __init__(self, namespace, timeout, stale_timeout=0, failure_timeout=0, backend=None):
+        """
+        Initialize cache storing its entries in a given cache backend.
+        """
+        self.namespace = namespace
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.failure_timeout = failure_timeout
+        self.backend = backend if backend is not None else get_cache_backend()
+
+    def make_key(self, *parts):
+        """
+        Build backend-safe cache key out of arbitrary key parts.
+
+        Key parts are hashed, so they may contain secrets and characters not allowed by memcached.
+        """
+        digest = hashlib.sha1(repr(parts).encode('utf8')).hexdigest()
+        return 'video_xblock:{}:{}'.format(self.namespace, digest)
+
+    def get_or_fetch(self, key_parts, fetch):
+        """
+        Return cached value for given key parts, calling `fetch` if there is no such value.
+
+        Arguments:
+            key_parts (tuple): Values identifying cached entry.
+            fetch (callable): Function with no arguments returning a value to be cached or None on failure.
+        Returns:
+            Cached or just fetched value, None if fetching has failed.
+        """
+        key = self.make_key(*key_parts)
+        entry = self.backend.get(key)
+        if entry is None:
+            with self._fetch_lock(key) as locked:
+                # Concurrent requests wait for the first one to fetch the value instead of repeating the call.
+                entry = self.backend.get(key) if locked else None
+                if entry is None:
+                    return self._fetch(key, fetch)
+
+        value, fresh_until = entry
+        if value is not None and fresh_until <= time.time():
+            self.revalidate(key, fetch)
+        return value
+
+    @contextmanager
+    def _fetch_lock(self, key):
+        """
+        Hold in-process lock serializing fetches of a given key.
+
+        A lock is created per key and dropped once no thread uses it, so a slow fetch blocks only
+        fetches of the same key. The lock is waited for `FETCH_LOCK_TIMEOUT` seconds at most.
+
+        Yields:
+            bool: Whether the lock has been acquired.
+        """
+        with self._fetch_locks_guard:
+            lock_users = self._fetch_locks.setdefault(key, [threading.Lock(), 0])
+            lock_users[1] += 1
+        lock = lock_users[0]
+        locked = lock.acquire(timeout=FETCH_LOCK_TIMEOUT)
+        try:
+            yield locked
+        finally:
+            if locked:
+                lock.release()
+            with self._fetch_locks_guard:
+                lock_users[1] -= 1
+                if not lock_users[1]:
+                    del self._fetch_locks[key]
+
+    def _fetch(self, key, fetch):
+        """
+        Fetch a value and store it in the cache.
+        """
+        value = fetch()
+        self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        """
+        Store fetched value, or failure marker if the value is None.
+        """
+        timeout = self.failure_timeout if value is None else self.timeout
+        if not timeout:
+            return
+        backend_timeout = timeout if value is None else timeout + self.stale_timeout
+        self.backend.set(key, (value, time.time() + timeout), backend_timeout)
+
+    def revalidate(self, key, fetch):
+        """
+        Refresh a stale entry in a background thread, unless other process or thread is doing it already.
+        """
+        lock_key = '{}:revalidate'.format(key)
+        if not self.backend.add(lock_key, True, REVALIDATION_LOCK_TIMEOUT):
+            return
+        thread = threading.Thread(target=self._revalidate, args=(key, fetch, lock_key))
+        thread.daemon = True
+        thread.start()
+
+    def _revalidate(self, key, fetch, lock_key):
+        """
+        Replace stale entry with a fetched value. Stale entry is kept if fetching has failed.
+        """
+        try:
+            value = fetch()
+            if value is not None:
+                self._store(key, value)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed to revalidate cached entry %s", key)
+        finally:
+            self.backend.delete(lock_key)
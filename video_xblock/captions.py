@@ -0,0 +1,455 @@
+"""
+Streaming parsing and conversion of captions.
+
+SRT and WebVTT captions are read line by line from a string, a file object or an iterable of chunks
+(e.g. contentstore's `stream_data()`), parsed one cue at a time and converted output is produced
+incrementally, so memory use doesn't depend on the length of captions.
+WebVTT captions are only validated and passed through as they are.
+Text of SRT cues is escaped as WebVTT requires; of SRT markup only `<b>`, `<i>` and `<u>` tags are kept.
+Other formats (DFXP/TTML, SAMI, SCC) are left to pycaption.
+
+Parsed captions which have to be kept in memory are stored in a compact `CueList`;
+`CueIndex` additionally finds cues by time and is cheaply (de)serialized to be cached.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import codecs
+from collections import namedtuple
+import html
+import itertools
+import re
+import struct
+import sys
+
+from .exceptions import CaptionsFormatError
+
+CHUNK_SIZE = 64 * 1024
+TIMING_SEPARATOR = '-->'
+VTT_HEADER = 'WEBVTT'
+# Tags SRT players support; `<font>` has no WebVTT counterpart and is dropped.
+SRT_TAG_RE = re.compile(r'<(/?)(b|i|u|font)(?:\s[^<>]*)?>', re.IGNORECASE)
+VTT_SRT_TAGS = ('b', 'i', 'u')
+VTT_TAG_RE = re.compile(r'<[^>]*>')
+
+
+class CaptionsFormat:
+    """
+    Caption formats handled without pycaption.
+    """
+
+    SRT = 'srt'
+    WEBVTT = 'vtt'
+
+
+Cue = namedtuple('Cue', ['start', 'end', 'text'])  # Start and end are in milliseconds.
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield chunks of a string, bytes, a file object or an iterable of chunks.
+    """
+    if isinstance(source, (str, bytes)):
+        yield source
+        return
+    read = getattr(source, 'read', None)
+    if read is None:
+        yield from source
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_lines(source):
+    """
+    Yield lines of captions decoded as UTF-8, without line endings and byte order mark.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = None
+    for chunk in iter_chunks(source):
+        chunk = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        pending = chunk.lstrip('\ufeff') if pending is None else pending + chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+    pending = (pending or '') + decoder.decode(b'', final=True)
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def iter_blocks(lines):
+    """
+    Yield blocks of consecutive non-blank lines.
+    """
+    block = []
+    for line in lines:
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def parse_timestamp(value):
+    """
+    Convert SRT (`00:01:02,003`) or WebVTT (`00:01:02.003`, `01:02.003`) timestamp to milliseconds.
+    """
+    value = value.strip()
+    # Fast path for the most common `HH:MM:SS,mmm` form.
+    if len(value) == 12 and value[2] == ':' and value[5] == ':' and value[8] in ',.':
+        try:
+            return ((int(value[:2]) * 60 + int(value[3:5])) * 60 + int(value[6:8])) * 1000 + int(value[9:])
+        except ValueError:
+            raise CaptionsFormatError("Invalid timestamp: {}".format(value))
+
+    clock, _separator, fraction = value.replace(',', '.').partition('.')
+    parts = clock.split(':')
+    if len(parts) not in (2, 3) or not fraction.isdigit() or not all(part.isdigit() for part in parts):
+        raise CaptionsFormatError("Invalid timestamp: {}".format(value))
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds * 1000 + int(fraction[:3].ljust(3, '0'))
+
+
+def format_timestamp(milliseconds):
+    """
+    Format milliseconds as WebVTT timestamp.
+    """
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return '%02d:%02d:%02d.%03d' % (hours, minutes, seconds, milliseconds)
+
+
+def parse_timing(line):
+    """
+    Parse cue timing line, e.g. `00:01:02,003 --> 00:01:04,005`; cue settings are dropped.
+
+    Returns:
+        tuple: Start and end of a cue in milliseconds.
+    """
+    start, _separator, end = line.partition(TIMING_SEPARATOR)
+    end = end.split(None, 1)
+    if not end:
+        raise CaptionsFormatError("Invalid cue timing: {}".format(line))
+    return parse_timestamp(start), parse_timestamp(end[0])
+
+
+def iter_cues(lines):
+    """
+    Yield cues of SRT or WebVTT captions.
+
+    A cue is a block with timing on its first or second (after a cue identifier) line.
+    Other blocks, i.e. WebVTT header, NOTE, STYLE and REGION blocks, are skipped.
+    """
+    for block in iter_blocks(lines):
+        for index, line in enumerate(block[:2]):
+            if TIMING_SEPARATOR in line:
+                start, end = parse_timing(line)
+                yield Cue(start, end, '\n'.join(block[index + 1:]))
+                break
+
+
+def escape_cue_text(text):
+    """
+    Escape characters which aren't allowed in WebVTT cue text as they are.
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def srt_text_to_vtt(text):
+    """
+    Convert SRT cue text to WebVTT cue text.
+
+    Special characters are escaped, `<b>`, `<i>` and `<u>` tags are kept, `<font>` tags are dropped.
+    """
+    parts = []
+    position = 0
+    for match in SRT_TAG_RE.finditer(text):
+        parts.append(escape_cue_text(text[position:match.start()]))
+        closing, name = match.group(1), match.group(2).lower()
+        if name in VTT_SRT_TAGS:
+            parts.append('<{}{}>'.format(closing, name))
+        position = match.end()
+    parts.append(escape_cue_text(text[position:]))
+    return ''.join(parts)
+
+
+def iter_srt_cues(lines):
+    """
+    Yield cues of SRT captions, with their text converted to WebVTT cue text.
+    """
+    for cue in iter_cues(lines):
+        yield cue._replace(text=srt_text_to_vtt(cue.text))
+
+
+def vtt_text_to_plain(text):
+    """
+    Drop markup of WebVTT cue text and unescape it.
+    """
+    return html.unescape(VTT_TAG_RE.sub('', text))
+
+
+class CueList:
+    """
+    Compact list of cues.
+
+    Cues are stored in parallel arrays of start and end times (in milliseconds) and of offsets
+    of cues' text in a single string, instead of a Python object per cue.
+    """
+
+    __slots__ = ('starts', 'ends', 'offsets', 'text')
+
+    def __init__(self, cues=()):
+        """
+        Pack given cues.
+        """
+        self.starts = array('q')
+        self.ends = array('q')
+        self.offsets = array('q', [0])
+        texts = []
+        for cue in cues:
+            self.starts.append(cue.start)
+            self.ends.append(cue.end)
+            self.offsets.append(self.offsets[-1] + len(cue.text))
+            texts.append(cue.text)
+        self.text = ''.join(texts)
+
+    def __len__(self):
+        """
+        Return number of cues.
+        """
+        return len(self.starts)
+
+    def get_text(self, index):
+        """
+        Return text of a cue.
+        """
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, index):
+        """
+        Return a cue.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('cue index out of range')
+        return Cue(self.starts[index], self.ends[index], self.get_text(index))
+
+    def __iter__(self):
+        """
+        Iterate over cues.
+        """
+        for index in range(len(self)):
+            yield Cue(self.starts[index], self.ends[index], self.get_text(index))
+
+
+class CueIndex(CueList):
+    """
+    Cues ordered by start time, searchable by time.
+
+    Built once per transcript, it's shared by everything which needs transcript's cues,
+    e.g. search indexing, trimming of captions and lookup of the cue shown at a given time.
+    """
+
+    __slots__ = ()
+    HEADER = struct.Struct('<4sI')
+    MAGIC = b'VXC1'
+
+    def __init__(self, cues=()):
+        """
+        Pack given cues, ordering them by start time if needed.
+        """
+        super().__init__(cues)
+        starts = self.starts
+        if any(starts[index] > starts[index + 1] for index in range(len(starts) - 1)):
+            super().__init__(sorted(CueList.__iter__(self), key=lambda cue: cue.start))
+
+    @classmethod
+    def from_arrays(cls, starts, ends, offsets, text):
+        """
+        Create index out of already packed and ordered cues.
+        """
+        cue_index = cls.__new__(cls)
+        cue_index.starts, cue_index.ends, cue_index.offsets, cue_index.text = starts, ends, offsets, text
+        return cue_index
+
+    def find(self, time):
+        """
+        Return index of the latest started cue shown at a given time (in milliseconds), None if there is no such cue.
+        """
+        index = bisect_right(self.starts, time) - 1
+        if index >= 0 and time < self.ends[index]:
+            return index
+        return None
+
+    def cue_at(self, time):
+        """
+        Return the latest started cue shown at a given time (in milliseconds), None if there is no such cue.
+        """
+        index = self.find(time)
+        return None if index is None else self[index]
+
+    def slice(self, start=0, end=None):
+        """
+        Return index of cues shown within [start, end) window, in milliseconds; `end=None` means until the end.
+
+        Cues overlapping window's bounds are included as they are.
+        """
+        high = len(self) if end is None else bisect_left(self.starts, end)
+        low = bisect_right(self.starts, start, 0, high)
+        while low > 0 and self.ends[low - 1] > start:
+            low -= 1
+        offsets = array('q', (offset - self.offsets[low] for offset in self.offsets[low:high + 1]))
+        return self.from_arrays(
+            self.starts[low:high], self.ends[low:high], offsets,
+            self.text[self.offsets[low]:self.offsets[high]]
+        )
+
+    def get_plain_text(self):
+        """
+        Return text of all cues without markup, separated by spaces.
+        """
+        return ' '.join(vtt_text_to_plain(self.get_text(index)).replace('\n', ' ') for index in range(len(self)))
+
+    def to_bytes(self):
+        """
+        Serialize the index.
+        """
+        arrays = [self.starts, self.ends, self.offsets]
+        if sys.byteorder == 'big':
+            arrays = [array('q', values) for values in arrays]
+            for values in arrays:
+                values.byteswap()
+        return b''.join(
+            [self.HEADER.pack(self.MAGIC, len(self))]
+            + [values.tobytes() for values in arrays]
+            + [self.text.encode('utf-8')]
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Deserialize the index.
+        """
+        magic, length = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a serialized cue index.")
+        arrays = []
+        position = cls.HEADER.size
+        for size in (length, length, length + 1):
+            values = array('q')
+            values.frombytes(data[position:position + size * values.itemsize])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            arrays.append(values)
+            position += size * values.itemsize
+        return cls.from_arrays(*arrays, text=data[position:].decode('utf-8'))
+
+
+def parse_cues(source):
+    """
+    Parse SRT or WebVTT captions into `CueList`; cue text is WebVTT cue text.
+
+    Arguments:
+        source: Captions as a string, bytes, a file object or an iterable of chunks.
+    Returns:
+        CueList: Parsed cues, None if captions are neither SRT nor WebVTT.
+    """
+    captions_format, lines = sniff_format(iter_lines(source))
+    if captions_format is None:
+        return None
+    return CueList(iter_srt_cues(lines) if captions_format == CaptionsFormat.SRT else iter_cues(lines))
+
+
+def sniff_format(lines):
+    """
+    Detect format of captions by their first lines.
+
+    Returns:
+        tuple: Captions format (`CaptionsFormat` value, None if the format isn't SRT or WebVTT)
+            and an iterator over all lines of captions.
+    """
+    lines = iter(lines)
+    head, first_lines = [], []
+    for line in lines:
+        head.append(line)
+        if line.strip():
+            first_lines.append(line.strip())
+            if len(first_lines) == 2:
+                break
+    lines = itertools.chain(head, lines)
+
+    if not first_lines:
+        return None, lines
+    if first_lines[0] == VTT_HEADER or first_lines[0].startswith((VTT_HEADER + ' ', VTT_HEADER + '\t')):
+        return CaptionsFormat.WEBVTT, lines
+    for line in first_lines:
+        if TIMING_SEPARATOR in line:
+            try:
+                parse_timing(line)
+            except CaptionsFormatError:
+                break
+            return CaptionsFormat.SRT, lines
+    return None, lines
+
+
+def iter_vtt(cues):
+    """
+    Yield WebVTT captions, cue by cue.
+    """
+    yield VTT_HEADER + '\n\n'
+    for cue in cues:
+        yield '{} {} {}\n{}\n\n'.format(
+            format_timestamp(cue.start), TIMING_SEPARATOR, format_timestamp(cue.end), cue.text
+        )
+
+
+def iter_validated_vtt(lines):
+    """
+    Yield lines of WebVTT captions as they are, checking cue timings on the way.
+
+    Raises:
+        CaptionsFormatError: Captions have malformed cue timing.
+    """
+    for line in lines:
+        if TIMING_SEPARATOR in line:
+            parse_timing(line)
+        yield line + '\n'
+
+
+def iter_trimmed_vtt(lines, start=0, end=None):
+    """
+    Yield WebVTT captions block by block, keeping only cues shown within [start, end) window, in milliseconds.
+
+    Captions are filtered as text, so the header, NOTE, STYLE and REGION blocks, cue identifiers and cue settings
+    are kept as they are. Cues overlapping window's bounds are kept too.
+
+    Raises:
+        CaptionsFormatError: Captions have malformed cue timing.
+    """
+    for block in iter_blocks(lines):
+        for line in block[:2]:
+            if TIMING_SEPARATOR in line:
+                cue_start, cue_end = parse_timing(line)
+                if cue_end <= start or (end is not None and cue_start >= end):
+                    block = None
+                break
+        if block is not None:
+            yield '\n'.join(block) + '\n\n'
+
+
+def iter_text(lines):
+    """
+    Yield text lines of WebVTT captions, skipping timings and blank lines.
+    """
+    for line in lines:
+        if line and TIMING_SEPARATOR not in line:
+            yield line
@@ -0,0 +1,482 @@
+"""
+Course-wide transcripts operations.
+
+Python API behind `video_xblock_transcripts` management command:
+- `import_course_default_transcripts` fetches default transcripts of all video xblocks of a course
+  from video platforms, stores them as course assets and enables them;
+- `export_course_transcripts` dumps all enabled (managed) transcripts of a course to a directory;
+- `migrate_course_transcripts_to_vtt` converts enabled non-WebVTT transcript assets to WebVTT ones.
+
+Slow network calls and conversions are made by a bounded pool of worker threads, while modulestore
+and contentstore are accessed from the calling thread only. Blocks are processed in batches, and
+progress is saved to an optional checkpoint file after every batch, so an interrupted run can be resumed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import logging
+import os
+
+from .constants import PlayerName, TranscriptSource
+from .exceptions import ApiClientError
+from .mixins import TranscriptsMixin
+from .utils import import_from
+
+log = logging.getLogger(__name__)
+
+VIDEO_XBLOCK_CATEGORY = 'video_xblock'
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 50
+
+
+class ProgressCheckpoint:
+    """
+    Set of processed block IDs persisted to a JSON file.
+
+    Without a file path progress is kept in memory only.
+    """
+
+    def __init__(self, path=None):
+        """
+        Load progress saved to a file by a previous run, if any.
+        """
+        self.path = path
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self.done = set(json.load(checkpoint_file).get('done', []))
+
+    def __contains__(self, block_id):
+        """
+        Check if a block has already been processed.
+        """
+        return block_id in self.done
+
+    def add(self, block_ids):
+        """
+        Mark blocks as processed.
+        """
+        self.done.update(block_ids)
+
+    def save(self):
+        """
+        Atomically write progress to the file.
+        """
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as checkpoint_file:
+            json.dump({'done': sorted(self.done)}, checkpoint_file)
+        os.replace(tmp_path, self.path)
+
+
+class BulkReport:
+    """
+    Summary of a course-wide operation.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty report.
+        """
+        self.blocks_total = 0
+        self.blocks_processed = 0
+        self.blocks_skipped = 0
+        self.transcripts_processed = 0
+        self.failures = []
+
+    def add_failure(self, block_id, message):
+        """
+        Register a failure related to a block.
+        """
+        log.warning("Block %s: %s", block_id, message)
+        self.failures.append((block_id, message))
+
+    @property
+    def failed_block_ids(self):
+        """
+        Return IDs of blocks which have failed to be processed completely.
+        """
+        return {block_id for block_id, _message in self.failures}
+
+    def as_dict(self):
+        """
+        Return report as a JSON serializable dict.
+        """
+        return {
+            'blocks_total': self.blocks_total,
+            'blocks_processed': self.blocks_processed,
+            'blocks_skipped': self.blocks_skipped,
+            'transcripts_processed': self.transcripts_processed,
+            'failures': [{'block_id': block_id, 'message': message} for block_id, message in self.failures],
+        }
+
+    def summary(self):
+        """
+        Return human readable report.
+        """
+        lines = [
+            "Blocks: {} total, {} processed, {} skipped (already processed).".format(
+                self.blocks_total, self.blocks_processed, self.blocks_skipped
+            ),
+            "Transcripts: {}.".format(self.transcripts_processed),
+            "Failures: {}.".format(len(self.failures)),
+        ]
+        lines.extend("  {}: {}".format(block_id, message) for block_id, message in self.failures)
+        return '\n'.join(lines)
+
+
+def get_course_video_blocks(course_key, store=None):
+    """
+    Return all video xblocks of a course.
+    """
+    if store is None:
+        store = import_from('xmodule.modulestore.django', 'modulestore')()
+    return store.get_items(course_key, qualifiers={'category': VIDEO_XBLOCK_CATEGORY})
+
+
+def iter_batches(items, batch_size):
+    """
+    Split a list into consecutive batches.
+    """
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def get_block_id(block):
+    """
+    Return block's usage ID as a string.
+    """
+    return str(block.location)
+
+
+def _list_default_transcripts(player, kwargs):
+    """
+    Fetch a list of default transcripts of a video from a video platform (worker thread).
+    """
+    try:
+        default_transcripts, _message = player.get_default_transcripts(**kwargs)
+    except (ApiClientError, IOError) as exc:
+        return None, str(exc)
+    return player.clean_default_transcripts(default_transcripts), ''
+
+
+def _fetch_default_transcript(download):
+    """
+    Download a default transcript from a video platform and convert it to WebVTT (worker thread).
+
+    Returns:
+        tuple: Reference name and WebVTT content of the transcript (empty on failure), and an error message.
+    """
+    block, player, video_id, transcript = download
+    try:
+        reference_name, vtt_content = block.fetch_default_transcript(player, video_id, transcript)
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, '', str(exc)
+    return reference_name, vtt_content, ''
+
+
+def import_course_default_transcripts(
+        course_key, user_id, store=None, max_workers=DEFAULT_MAX_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+        checkpoint=None, dry_run=False
+):
+    """
+    Fetch default transcripts of all course's video xblocks and enable them.
+
+    Transcripts of languages already enabled in a block are skipped.
+
+    Arguments:
+        course_key (CourseKey): Course to be processed.
+        user_id (int): ID of a user the blocks are updated by.
+        store: Modulestore, the default one is used if not provided.
+        max_workers (int): Number of concurrent requests to video platforms.
+        batch_size (int): Number of blocks saved at once.
+        checkpoint (ProgressCheckpoint): Progress of a previous run to resume.
+        dry_run (bool): Only report transcripts which would be imported.
+    Returns:
+        BulkReport: Summary of the import.
+    """
+    if store is None:
+        store = import_from('xmodule.modulestore.django', 'modulestore')()
+    checkpoint = checkpoint if checkpoint is not None else ProgressCheckpoint()
+    report = BulkReport()
+
+    blocks = []
+    for block in get_course_video_blocks(course_key, store):
+        report.blocks_total += 1
+        if get_block_id(block) in checkpoint:
+            report.blocks_skipped += 1
+        elif block.player_name != PlayerName.DUMMY and block.href:
+            blocks.append(block)
+        else:
+            checkpoint.add([get_block_id(block)])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in iter_batches(blocks, batch_size):
+            _import_batch(batch, executor, store, user_id, report, dry_run)
+            if not dry_run:
+                # Blocks with failed downloads are left to be retried by a resumed run.
+                failed_block_ids = report.failed_block_ids
+                checkpoint.add(
+                    get_block_id(block) for block in batch if get_block_id(block) not in failed_block_ids
+                )
+                checkpoint.save()
+
+    log.info("Default transcripts import of %s finished:\n%s", course_key, report.summary())
+    return report
+
+
+def _import_batch(blocks, executor, store, user_id, report, dry_run):
+    """
+    Import default transcripts of a batch of blocks.
+    """
+    # Fields are read in the calling thread only; workers get plain data.
+    players = [block.get_player() for block in blocks]
+    video_ids = [player.media_id(block.href) for block, player in zip(blocks, players)]
+    listing_kwargs = []
+    for block, video_id in zip(blocks, video_ids):
+        kwargs = dict(block.metadata, video_id=video_id)
+        # For a Brightcove player only
+        if block.account_id != block.fields['account_id'].default:
+            kwargs['account_id'] = block.account_id
+        listing_kwargs.append(kwargs)
+    listings = list(executor.map(_list_default_transcripts, players, listing_kwargs))
+
+    downloads = []
+    for block, player, video_id, (default_transcripts, error) in zip(blocks, players, video_ids, listings):
+        if default_transcripts is None:
+            report.add_failure(get_block_id(block), "Failed to fetch default transcripts: {}".format(error))
+            continue
+        enabled_transcripts = block.get_enabled_managed_transcripts()
+        for transcript in player.filter_default_transcripts(default_transcripts, enabled_transcripts):
+            transcript = dict(transcript, source=TranscriptSource.DEFAULT)
+            downloads.append((block, player, video_id, transcript))
+
+    if dry_run:
+        for block, _player, _video_id, transcript in downloads:
+            log.info("Block %s: would import %s transcript.", get_block_id(block), transcript['lang'])
+        report.transcripts_processed += len(downloads)
+        report.blocks_processed += len(blocks)
+        return
+
+    fetched = executor.map(_fetch_default_transcript, downloads)
+    new_transcripts = {}
+    for (block, _player, _video_id, transcript), (reference_name, vtt_content, error) in zip(downloads, fetched):
+        if not vtt_content:
+            message = "Couldn't download {} transcript{}".format(transcript['lang'], ': ' + error if error else '.')
+            report.add_failure(get_block_id(block), message)
+            continue
+        try:
+            _file_name, external_url = block.create_transcript_file(
+                trans_str=vtt_content, reference_name=reference_name
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            report.add_failure(get_block_id(block), "Couldn't save {} transcript: {}".format(transcript['lang'], exc))
+            continue
+        new_transcripts.setdefault(get_block_id(block), []).append({
+            'lang': transcript['lang'],
+            'label': transcript['label'],
+            'url': external_url,
+            'source': TranscriptSource.DEFAULT,
+        })
+        report.transcripts_processed += 1
+
+    for block in blocks:
+        block_transcripts = new_transcripts.get(get_block_id(block))
+        if block_transcripts:
+            block.transcripts = json.dumps(block.get_enabled_managed_transcripts() + block_transcripts)
+            try:
+                store.update_item(block, user_id)
+            except Exception as exc:  # pylint: disable=broad-except
+                report.add_failure(get_block_id(block), "Couldn't save imported transcripts: {}".format(exc))
+        report.blocks_processed += 1
+
+
+def convert_to_vtt(caps):
+    """
+    Convert transcript to WebVTT format (worker process).
+
+    Returns:
+        tuple: WebVTT transcript (empty if the format isn't supported) and an error message.
+    """
+    try:
+        return TranscriptsMixin.convert_caps_to_vtt(caps), ''
+    except Exception as exc:  # pylint: disable=broad-except
+        return '', str(exc)
+
+
+def is_vtt_transcript(transcript):
+    """
+    Check if a transcript asset is stored in WebVTT format, judging by its URL.
+    """
+    return transcript['url'].endswith('.vtt')
+
+
+def migrate_course_transcripts_to_vtt(
+        course_key, user_id, store=None, max_workers=DEFAULT_MAX_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+        checkpoint=None, dry_run=False
+):
+    """
+    Convert enabled non-WebVTT transcripts of all course's video xblocks to WebVTT assets.
+
+    Converted transcripts are saved as new `.vtt` assets next to the original ones, and blocks' `transcripts`
+    field is updated to point to them, so they are served as static files instead of being converted
+    by `srt_to_vtt` handler on every view. Original assets are left intact.
+
+    Arguments:
+        course_key (CourseKey): Course to be processed.
+        user_id (int): ID of a user the blocks are updated by.
+        store: Modulestore, the default one is used if not provided.
+        max_workers (int): Number of worker processes converting transcripts.
+        batch_size (int): Number of blocks saved at once.
+        checkpoint (ProgressCheckpoint): Progress of a previous run to resume.
+        dry_run (bool): Only report transcripts which would be converted.
+    Returns:
+        BulkReport: Summary of the migration.
+    """
+    if store is None:
+        store = import_from('xmodule.modulestore.django', 'modulestore')()
+    checkpoint = checkpoint if checkpoint is not None else ProgressCheckpoint()
+    report = BulkReport()
+
+    blocks = []
+    for block in get_course_video_blocks(course_key, store):
+        report.blocks_total += 1
+        if get_block_id(block) in checkpoint:
+            report.blocks_skipped += 1
+        elif not all(is_vtt_transcript(transcript) for transcript in block.get_enabled_managed_transcripts()):
+            blocks.append(block)
+        else:
+            checkpoint.add([get_block_id(block)])
+
+    # Conversion is CPU bound, so it's made by processes rather than threads.
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for batch in iter_batches(blocks, batch_size):
+            _migrate_batch(batch, executor, store, user_id, report, dry_run)
+            if not dry_run:
+                failed_block_ids = report.failed_block_ids
+                checkpoint.add(
+                    get_block_id(block) for block in batch if get_block_id(block) not in failed_block_ids
+                )
+                checkpoint.save()
+
+    log.info("Transcripts migration of %s to WebVTT finished:\n%s", course_key, report.summary())
+    return report
+
+
+def _find_vtt_asset(block, reference_name):
+    """
+    Return content of `<reference_name>.vtt` course asset, None if there is no such asset.
+
+    The asset is named the same way `create_transcript_file` names it.
+    """
+    file_name = reference_name.replace(" ", "_") + '.vtt'
+    asset_location = block.static_content.compute_location(block.course_key, file_name)
+    asset = block.contentstore().find(asset_location, throw_on_not_found=False)  # pylint: disable=not-callable
+    if asset is None:
+        return None
+    data = asset.data
+    return data.decode('utf8') if isinstance(data, bytes) else data
+
+
+def _migrate_batch(blocks, executor, store, user_id, report, dry_run):
+    """
+    Convert non-WebVTT transcripts of a batch of blocks to WebVTT.
+    """
+    conversions = []
+    for block in blocks:
+        for transcript in block.get_enabled_managed_transcripts():
+            if is_vtt_transcript(transcript):
+                continue
+            if dry_run:
+                log.info("Block %s: would convert %s transcript.", get_block_id(block), transcript['url'])
+                report.transcripts_processed += 1
+                continue
+            try:
+                asset_location = block.static_content.get_location_from_path(transcript['url'])
+                data = block.contentstore().find(asset_location).data  # pylint: disable=not-callable
+            except Exception as exc:  # pylint: disable=broad-except
+                report.add_failure(get_block_id(block), "Can't read {} transcript: {}".format(transcript['url'], exc))
+                continue
+            conversions.append((block, transcript, data))
+    if dry_run:
+        report.blocks_processed += len(blocks)
+        return
+
+    converted = executor.map(convert_to_vtt, [caps for _block, _transcript, caps in conversions])
+    new_urls = {}
+    for (block, transcript, _caps), (vtt_content, error) in zip(conversions, converted):
+        if not vtt_content:
+            message = "Can't convert {} transcript: {}".format(transcript['url'], error or "unknown format")
+            report.add_failure(get_block_id(block), message)
+            continue
+        reference_name = os.path.splitext(block.get_file_name_from_path(transcript['url']))[0]
+        try:
+            existing_content = _find_vtt_asset(block, reference_name)
+            if existing_content is not None and existing_content != vtt_content:
+                message = "Can't convert {} transcript: {}.vtt asset already exists".format(
+                    transcript['url'], reference_name
+                )
+                report.add_failure(get_block_id(block), message)
+                continue
+            _file_name, external_url = block.create_transcript_file(
+                trans_str=vtt_content, reference_name=reference_name
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            report.add_failure(get_block_id(block), "Couldn't save {} transcript: {}".format(transcript['url'], exc))
+            continue
+        new_urls[(get_block_id(block), transcript['url'])] = external_url
+        report.transcripts_processed += 1
+
+    for block in blocks:
+        block_id = get_block_id(block)
+        transcripts = block.get_enabled_managed_transcripts()
+        if any((block_id, transcript['url']) in new_urls for transcript in transcripts):
+            for transcript in transcripts:
+                transcript['url'] = new_urls.get((block_id, transcript['url']), transcript['url'])
+            block.transcripts = json.dumps(transcripts)
+            try:
+                store.update_item(block, user_id)
+            except Exception as exc:  # pylint: disable=broad-except
+                report.add_failure(block_id, "Couldn't save converted transcripts: {}".format(exc))
+        report.blocks_processed += 1
+
+
+def export_course_transcripts(course_key, output_dir, store=None):
+    """
+    Write enabled transcripts of all course's video xblocks to a directory.
+
+    Transcripts are saved to `<output_dir>/<block ID>/<asset file name>`,
+    `<output_dir>/manifest.json` describes the transcripts of each block.
+
+    Returns:
+        BulkReport: Summary of the export.
+    """
+    report = BulkReport()
+    manifest = {}
+    for block in get_course_video_blocks(course_key, store):
+        report.blocks_total += 1
+        block_id = get_block_id(block)
+        block_dir = os.path.join(output_dir, block.location.block_id)
+        exported = []
+        for transcript in block.get_enabled_managed_transcripts():
+            file_name = block.get_file_name_from_path(transcript['url'])
+            try:
+                asset_location = block.static_content.compute_location(course_key, file_name)
+                asset = block.contentstore().find(asset_location)  # pylint: disable=not-callable
+            except Exception as exc:  # pylint: disable=broad-except
+                report.add_failure(block_id, "Can't read {} transcript: {}".format(file_name, exc))
+                continue
+            os.makedirs(block_dir, exist_ok=True)
+            with open(os.path.join(block_dir, file_name), 'wb') as transcript_file:
+                data = asset.data
+                transcript_file.write(data.encode('utf8') if isinstance(data, str) else data)
+            exported.append(dict(transcript, file=os.path.join(block.location.block_id, file_name)))
+            report.transcripts_processed += 1
+        manifest[block_id] = {'display_name': block.display_name, 'href': block.href, 'transcripts': exported}
+        report.blocks_processed += 1
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    return report
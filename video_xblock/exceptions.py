@@ -49,3 +49,11 @@ class ApiClientError(VideoXBlockException):
     """
 
     default_msg = _('API error occurred.')
+
+
+class CaptionsFormatError(VideoXBlockException, ValueError):
+    """
+    Malformed captions exception.
+    """
+
+    default_msg = _('Captions are malformed.')
@@ -0,0 +1,173 @@
+"""
+HTTP client shared by video backends and mixins.
+
+Keeps a pooled `requests.Session` per remote host, so keep-alive connections
+(and their TLS sessions) are reused between requests. Applies default timeouts,
+retries idempotent requests with exponential backoff and limits number of
+concurrent requests per client.
+
+Clients are configured with `http` key of video_xblock's XBLOCK_SETTINGS, e.g.:
+    "http": {
+        "timeout": [3.05, 30],
+        "retries": 2,
+        "backoff_factor": 0.3,
+        "max_connections": 10,
+        "brightcove": {"timeout": [3.05, 60]}
+    }
+Top level values are defaults for all clients, nested dicts override them for a named client.
+"""
+
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .utils import import_from
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CONFIG = {
+    'timeout': (3.05, 30),  # (connect, read) timeouts, in seconds
+    'retries': 2,
+    'backoff_factor': 0.3,
+    'max_connections': 10,
+}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def get_http_config(name):
+    """
+    Return configuration of a named HTTP client.
+    """
+    django_settings = import_from('django.conf', 'settings')
+    try:
+        http_settings = getattr(django_settings, 'XBLOCK_SETTINGS', {}).get('video_xblock', {}).get('http', {})
+    except Exception:  # pylint: disable=broad-except
+        # Django settings aren't configured, e.g. in unit tests.
+        http_settings = {}
+
+    config = dict(DEFAULT_HTTP_CONFIG)
+    config.update({key: val for key, val in http_settings.items() if key in DEFAULT_HTTP_CONFIG})
+    config.update(http_settings.get(name, {}))
+    if isinstance(config['timeout'], list):
+        config['timeout'] = tuple(config['timeout'])
+    return config
+
+
+class HttpClient:
+    """
+    Named HTTP client with per-host pooled sessions.
+
+    Mimics `requests` API: `get`, `head`, `post` and `request` methods accept the same arguments.
+    """
+
+    def __init__(self, name='default'):
+        """
+        Initialize client; its configuration is read on the first request.
+        """
+        self.name = name
+        self._config = None
+        self._sessions = {}
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        """
+        Return client's configuration.
+        """
+        if self._config is None:
+            self._config = get_http_config(self.name)
+        return self._config
+
+    def _make_session(self):
+        """
+        Create session with connection pool and retry policy set according to client's configuration.
+        """
+        config = self.config
+        retry = Retry(
+            total=config['retries'],
+            backoff_factor=config['backoff_factor'],
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config['max_connections'], max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get_session(self, url):
+        """
+        Return pooled session for the host of given URL.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._sessions[key] = self._make_session()
+                    if self._semaphore is None:
+                        self._semaphore = threading.BoundedSemaphore(self.config['max_connections'])
+        return session
+
+    def request(self, method, url, **kwargs):
+        """
+        Send HTTP request, waiting for a free slot if client's concurrency limit is reached.
+
+        Returns:
+            requests.Response: Response object.
+        """
+        session = self.get_session(url)
+        kwargs.setdefault('timeout', self.config['timeout'])
+        with self._semaphore:
+            return session.request(method, url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        """
+        Send GET request.
+        """
+        return self.request('GET', url, params=params, **kwargs)
+
+    def head(self, url, **kwargs):
+        """
+        Send HEAD request.
+        """
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        """
+        Send POST request.
+        """
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def close(self):
+        """
+        Close all pooled connections and forget configuration.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+            self._config = None
+            self._semaphore = None
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(name='default'):
+    """
+    Return process-wide HTTP client with a given name, e.g. a backend's name.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.setdefault(name, HttpClient(name))
+    return client
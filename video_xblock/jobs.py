@@ -0,0 +1,290 @@
+"""
+Background jobs for long-running video platform operations.
+
+Handlers which would otherwise hold a web worker for the duration of several remote calls
+(e.g. Brightcove re-transcoding, default transcript download) enqueue a job and return its id right away.
+The studio polls `job_status` handler until the job is finished.
+
+Jobs are allowed methods of `VideoXBlock` (marked with `job` decorator), run with JSON-serializable
+keyword arguments against the block reloaded from the modulestore. Jobs are run by Celery when it's
+installed, or by a local thread pool otherwise (the latter is used by tests and workbench, too).
+
+Job state is kept in Django cache. Jobs marked as persistent also record their final state in block's
+`metadata` under `jobs` key, along with metadata keys changed by the job: they are merged into the block
+freshly reloaded right before saving, so that edits made while the job was running aren't overwritten.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from datetime import datetime
+import logging
+import threading
+import traceback
+import uuid
+
+from django.core.exceptions import ImproperlyConfigured
+from opaque_keys.edx.keys import UsageKey
+
+from .cache import get_cache_backend
+from .utils import import_from
+
+try:
+    from celery import shared_task
+except ImportError:
+    shared_task = None
+
+log = logging.getLogger(__name__)
+
+JOB_STATE_TIMEOUT = 24 * 60 * 60  # seconds
+MAX_PERSISTED_JOBS = 10
+DEFAULT_MAX_WORKERS = 4
+
+
+class JobStatus:
+    """
+    States of a background job.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCESS = 'success'
+    FAILURE = 'failure'
+
+    FINISHED = (SUCCESS, FAILURE)
+
+
+def job(persist=True):
+    """
+    Mark `VideoXBlock` method as allowed to be run as a background job.
+
+    Arguments:
+        persist (bool): Whether job's final state and metadata changes are to be saved, besides the cache.
+            Only `metadata` keys changed by the job are merged into the block reloaded after the job:
+            changes of other fields are discarded, not to overwrite edits made in the meantime.
+    """
+    def decorator(method):
+        """
+        Store job options on the method.
+        """
+        method.job_options = {'persist': persist}
+        return method
+    return decorator
+
+
+def get_job_state_key(job_id):
+    """
+    Return cache key of job's state.
+    """
+    return 'video_xblock:jobs:{}'.format(job_id)
+
+
+def get_job_state(job_id, backend=None):
+    """
+    Return job's state stored in the cache, None if there is no such job or its state has expired.
+    """
+    backend = backend if backend is not None else get_cache_backend()
+    return backend.get(get_job_state_key(job_id))
+
+
+def set_job_state(job_id, name, status, usage_id, result=None, error=None, backend=None):
+    """
+    Store job's state in the cache.
+
+    Arguments:
+        usage_id (str): Usage key of the block the job is run against, only its `job_status` reports the job.
+
+    Returns:
+        dict: Job's state.
+    """
+    state = {
+        'job_id': job_id,
+        'name': name,
+        'status': status,
+        'usage_id': usage_id,
+        'result': result,
+        'error': error,
+        'updated': datetime.utcnow().isoformat(),
+    }
+    backend = backend if backend is not None else get_cache_backend()
+    backend.set(get_job_state_key(job_id), state, JOB_STATE_TIMEOUT)
+    return state
+
+
+def load_block(usage_id):
+    """
+    Load a block from the modulestore.
+    """
+    store = import_from('xmodule.modulestore.django', 'modulestore')()
+    return store.get_item(UsageKey.from_string(usage_id))
+
+
+def save_block(block, user_id):
+    """
+    Save block's fields: to the modulestore, or via block's runtime if the block isn't stored there (workbench).
+    """
+    if hasattr(block, 'location'):
+        import_from('xmodule.modulestore.django', 'modulestore')().update_item(block, user_id)
+    else:
+        block.save()
+
+
+def persist_job_state(block, state, metadata_changes=None):
+    """
+    Record job's final state in block's metadata, keeping only the most recent jobs.
+
+    Arguments:
+        block (VideoXBlock): Block to record the state in.
+        state (dict): Job's final state.
+        metadata_changes (dict): Metadata keys changed by the job, to be merged into block's metadata.
+    """
+    metadata = dict(block.metadata)
+    metadata.update(metadata_changes or {})
+    jobs = dict(metadata.get('jobs', {}))
+    jobs[state['job_id']] = state
+    for job_id in sorted(jobs, key=lambda key: jobs[key]['updated'])[:-MAX_PERSISTED_JOBS]:
+        del jobs[job_id]
+    metadata['jobs'] = jobs
+    block.metadata = metadata
+
+
+def execute_job(job_id, name, usage_id, user_id, kwargs, block=None):
+    """
+    Run a job and record its state.
+
+    Arguments:
+        job_id (str): Job's id.
+        name (str): Name of `VideoXBlock` method marked with `job` decorator.
+        usage_id (str): Usage key of the block the job is run against.
+        user_id (int): Id of the user who has submitted the job, modulestore changes are made on behalf of.
+        kwargs (dict): Keyword arguments of the job.
+        block (VideoXBlock): Block to run the job against; it's loaded by `usage_id` if not given.
+    Returns:
+        dict: Job's final state.
+    """
+    set_job_state(job_id, name, JobStatus.RUNNING, usage_id)
+    try:
+        job_block = block if block is not None else load_block(usage_id)
+        method = getattr(job_block, name, None)
+        options = getattr(method, 'job_options', None)
+        if options is None:
+            raise ValueError("{} isn't a job".format(name))
+        metadata_before = copy.deepcopy(job_block.metadata)
+        result = method(**kwargs)
+    except Exception as exc:  # pylint: disable=broad-except
+        log.error("Job %s (%s) of %s has failed:\n%s", job_id, name, usage_id, traceback.format_exc())
+        return set_job_state(job_id, name, JobStatus.FAILURE, usage_id, error=str(exc))
+
+    state = set_job_state(job_id, name, JobStatus.SUCCESS, usage_id, result=result)
+    if options['persist']:
+        try:
+            # The block may have been edited while the job was running: fields loaded before are stale.
+            saved_block = block if block is not None else load_block(usage_id)
+            metadata_changes = {
+                key: value for key, value in job_block.metadata.items()
+                if key != 'jobs' and metadata_before.get(key) != value
+            }
+            persist_job_state(saved_block, state, metadata_changes)
+            save_block(saved_block, user_id)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed to save %s after job %s (%s)", usage_id, job_id, name)
+    return state
+
+
+if shared_task is not None:
+    @shared_task(name='video_xblock.jobs.execute_job')
+    def execute_job_task(job_id, name, usage_id, user_id, kwargs):
+        """
+        Celery task running a job.
+        """
+        execute_job(job_id, name, usage_id, user_id, kwargs)
+
+
+class ThreadJobRunner:
+    """
+    Run jobs in a pool of threads of the current process.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Create a pool of a given size.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, job_id, name, block, user_id, kwargs):
+        """
+        Schedule a job.
+
+        Blocks, which can't be reloaded from the modulestore (e.g. in workbench), are passed to the job as they are.
+        """
+        block_to_run = None if hasattr(block, 'location') else block
+        return self.executor.submit(
+            execute_job, job_id, name, str(block.scope_ids.usage_id), user_id, kwargs, block_to_run
+        )
+
+
+class CeleryJobRunner:
+    """
+    Run jobs as Celery tasks.
+
+    Celery workers are to import `video_xblock.jobs` module, e.g. it should be listed in `CELERY_IMPORTS`.
+    """
+
+    def __init__(self, queue=None):
+        """
+        Check Celery is available.
+
+        Arguments:
+            queue (str): Name of a queue to send tasks to, the default queue is used if not given.
+        """
+        if shared_task is None:
+            raise ImproperlyConfigured("Celery isn't installed.")
+        self.queue = queue
+
+    def submit(self, job_id, name, block, user_id, kwargs):
+        """
+        Send a job to Celery workers.
+        """
+        options = {'queue': self.queue} if self.queue else {}
+        return execute_job_task.apply_async(
+            args=[job_id, name, str(block.scope_ids.usage_id), user_id, kwargs], **options
+        )
+
+
+_runners = {}
+_runners_lock = threading.Lock()
+
+
+def get_job_runner(xblock_settings):
+    """
+    Return job runner configured by `job_runner` setting, created once per process.
+
+    `job_runner` is either "celery", "thread" or "auto" (default): Celery if it's installed, thread pool otherwise.
+    Size of the thread pool is set by `job_runner_max_workers`, Celery queue by `job_runner_queue` setting.
+    """
+    runner_name = xblock_settings.get('job_runner', 'auto')
+    if runner_name == 'auto':
+        runner_name = 'thread' if shared_task is None else 'celery'
+    with _runners_lock:
+        if runner_name not in _runners:
+            if runner_name == 'celery':
+                _runners[runner_name] = CeleryJobRunner(xblock_settings.get('job_runner_queue'))
+            elif runner_name == 'thread':
+                _runners[runner_name] = ThreadJobRunner(
+                    xblock_settings.get('job_runner_max_workers', DEFAULT_MAX_WORKERS)
+                )
+            else:
+                raise ImproperlyConfigured("Unknown job runner: {}".format(runner_name))
+        return _runners[runner_name]
+
+
+def submit_job(block, name, user_id, **kwargs):
+    """
+    Enqueue a job and return right away.
+
+    Returns:
+        dict: Job's pending state.
+    """
+    job_id = uuid.uuid4().hex
+    state = set_job_state(job_id, name, JobStatus.PENDING, str(block.scope_ids.usage_id))
+    get_job_runner(getattr(block, 'settings', {})).submit(job_id, name, block, user_id, kwargs)
+    return state
@@ -0,0 +1,3 @@
+"""
+Django management integration of video xblock.
+"""
@@ -0,0 +1,87 @@
+"""
+Import, export or migrate to WebVTT transcripts of all video xblocks of a course.
+
+Examples:
+    ./manage.py cms video_xblock_transcripts import course-v1:Org+Course+Run --user-id 3 \
+        --checkpoint /tmp/import.json
+    ./manage.py cms video_xblock_transcripts export course-v1:Org+Course+Run --output-dir /tmp/transcripts
+    ./manage.py cms video_xblock_transcripts migrate-to-vtt course-v1:Org+Course+Run --user-id 3 --dry-run
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from video_xblock.course_transcripts import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    ProgressCheckpoint,
+    export_course_transcripts,
+    import_course_default_transcripts,
+    migrate_course_transcripts_to_vtt,
+)
+
+
+class Command(BaseCommand):
+    """
+    Course-wide transcripts import/export and migration to WebVTT.
+    """
+
+    help = (
+        "Import default transcripts from video platforms into all video xblocks of a course, "
+        "export enabled transcripts of a course to a directory, "
+        "or convert enabled non-WebVTT transcripts of a course to WebVTT."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument('action', choices=['import', 'export', 'migrate-to-vtt'])
+        parser.add_argument('course_key', help="Course key, e.g. course-v1:Org+Course+Run")
+        parser.add_argument('--user-id', type=int, help="ID of a user blocks are updated by (import, migrate-to-vtt).")
+        parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                            help="Number of concurrent requests to video platforms, or of conversion processes.")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help="Number of blocks saved at once.")
+        parser.add_argument('--checkpoint', help="File to save progress to, and resume an interrupted run from.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report transcripts to be imported or converted.")
+        parser.add_argument('--output-dir', help="Directory to export transcripts to (export).")
+        parser.add_argument('--json', action='store_true', help="Print report as JSON.")
+
+    def handle(self, *args, **options):
+        """
+        Run requested operation.
+        """
+        try:
+            course_key = CourseKey.from_string(options['course_key'])
+        except InvalidKeyError:
+            raise CommandError("Invalid course key: {}".format(options['course_key']))
+
+        if options['action'] in ('import', 'migrate-to-vtt'):
+            if options['user_id'] is None:
+                raise CommandError("--user-id is required for {}.".format(options['action']))
+            bulk_operation = (
+                import_course_default_transcripts if options['action'] == 'import'
+                else migrate_course_transcripts_to_vtt
+            )
+            report = bulk_operation(
+                course_key,
+                options['user_id'],
+                max_workers=options['workers'],
+                batch_size=options['batch_size'],
+                checkpoint=ProgressCheckpoint(options['checkpoint']),
+                dry_run=options['dry_run'],
+            )
+        else:
+            if not options['output_dir']:
+                raise CommandError("--output-dir is required for export.")
+            report = export_course_transcripts(course_key, options['output_dir'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report.as_dict(), indent=2))
+        else:
+            self.stdout.write(report.summary())
@@ -1,30 +1,43 @@
 """
 Video XBlock mixins geared toward specific subsets of functionality.
 """
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import io
 import logging
-import requests
+import math
+import time
 
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 
+from opaque_keys import InvalidKeyError
 from pycaption import detect_format, WebVTTWriter
-from urllib.parse import urljoin
-from webob import Response
+from urllib.parse import urljoin, urlsplit
+from webob import Request, Response
 
 from xblock.core import XBlock
 from xblock.exceptions import NoSuchServiceError
 from xblock.fields import Scope, Boolean, Float, String
 
+from . import __version__
+from .captions import (
+    CaptionsFormat, CueIndex, iter_cues, iter_lines, iter_srt_cues, iter_text, iter_trimmed_vtt, iter_validated_vtt,
+    iter_vtt, sniff_format
+)
+from .cache import DEFAULT_CACHE_ALIAS, TTLCache, get_cache_backend
 from .constants import DEFAULT_LANG, TPMApiTranscriptFormatID, TPMApiLanguage, TranscriptSource, Status, PlayerName
+from .http_client import get_http_client
 from .utils import import_from, ugettext as _, underscore_to_mixedcase, Transcript
 
 from common.djangoapps.util.date_utils import get_default_time_display
 from openedx.core.djangoapps.contentserver.middleware import StaticContentServer
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from xmodule.contentstore.content import StaticContent
+from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
+threeplaymedia_http = get_http_client('threeplaymedia')  # pylint: disable=invalid-name
 
 
 @XBlock.wants('contentstore')
@@ -67,6 +80,14 @@ class TranscriptsMixin(XBlock):
     """
 
     THREE_PLAY_MEDIA_API_DOMAIN = 'https://static.3playmedia.com/'
+    # Default lifetimes (in seconds) of cached 3PlayMedia API responses, overridable in XBLOCK_SETTINGS.
+    THREE_PLAY_MEDIA_CACHE_TIMEOUT = 60 * 60
+    THREE_PLAY_MEDIA_CACHE_STALE_TIMEOUT = 24 * 60 * 60
+    THREE_PLAY_MEDIA_CACHE_FAILURE_TIMEOUT = 60
+    # Default limit of concurrent 3PlayMedia API requests made while fetching several transcripts.
+    THREE_PLAY_MEDIA_MAX_WORKERS = 4
+    # Default lifetime (in seconds) of cached transcripts converted to WebVTT by `srt_to_vtt` handler.
+    CONVERTED_TRANSCRIPTS_CACHE_TIMEOUT = 7 * 24 * 60 * 60
 
     threeplaymedia_streaming = Boolean(
         default=False,
@@ -91,6 +112,59 @@ class TranscriptsMixin(XBlock):
         resettable_editor=False
     )
 
+    @property
+    def threeplaymedia_cache(self):
+        """
+        Return cache of 3PlayMedia API responses shared between all blocks and workers.
+
+        Cache lifetimes can be tuned with `threeplaymedia_cache_timeout`, `threeplaymedia_cache_stale_timeout`
+        and `threeplaymedia_cache_failure_timeout` settings, Django cache with `cache_alias` setting.
+        """
+        xblock_settings = getattr(self, 'settings', {})
+        return TTLCache(
+            namespace='3pm',
+            timeout=xblock_settings.get('threeplaymedia_cache_timeout', self.THREE_PLAY_MEDIA_CACHE_TIMEOUT),
+            stale_timeout=xblock_settings.get(
+                'threeplaymedia_cache_stale_timeout', self.THREE_PLAY_MEDIA_CACHE_STALE_TIMEOUT
+            ),
+            failure_timeout=xblock_settings.get(
+                'threeplaymedia_cache_failure_timeout', self.THREE_PLAY_MEDIA_CACHE_FAILURE_TIMEOUT
+            ),
+            backend=get_cache_backend(xblock_settings.get('cache_alias', DEFAULT_CACHE_ALIAS)),
+        )
+
+    @property
+    def converted_transcripts_cache(self):
+        """
+        Return cache of transcripts converted to WebVTT or parsed into cue indexes.
+
+        The cache is shared between all blocks and workers.
+
+        Entries are keyed by asset's version, so they never get outdated; their lifetime
+        can be tuned with `converted_transcripts_cache_timeout` setting.
+        """
+        xblock_settings = getattr(self, 'settings', {})
+        return TTLCache(
+            namespace='vtt',
+            timeout=xblock_settings.get(
+                'converted_transcripts_cache_timeout', self.CONVERTED_TRANSCRIPTS_CACHE_TIMEOUT
+            ),
+            backend=get_cache_backend(xblock_settings.get('cache_alias', DEFAULT_CACHE_ALIAS)),
+        )
+
+    @staticmethod
+    def get_asset_version(content):
+        """
+        Return identifier of the content of a stored asset.
+
+        Arguments:
+            content (StaticContent): Asset loaded from contentstore, possibly as a stream.
+        Returns:
+            str: Asset's content digest or last modification time, None if neither is known.
+        """
+        version = getattr(content, 'content_digest', None) or getattr(content, 'last_modified_at', None)
+        return str(version) if version else None
+
     @staticmethod
     def _get_asset_json(display_name, content_type, date, location, thumbnail_location, locked):
         """
@@ -115,24 +189,142 @@ class TranscriptsMixin(XBlock):
         """
         Helper method for converting srt files to vtt format.
         """
-        caps_bytes = file.read()
-        caps = caps_bytes.decode('UTF-8')
+        transcript_file = io.BytesIO()
         try:
-            transcript_vtt = self.convert_caps_to_vtt(caps)
-        except IndexError:
+            for chunk in self.iter_caps_to_vtt(file):
+                transcript_file.write(chunk.encode('utf-8'))
+        except (IndexError, ValueError):
             return
 
         filename = filename.replace(".srt", ".vtt")
-        transcript_bytes = bytes(transcript_vtt, 'utf-8')
+        size = transcript_file.tell()
+        transcript_file.seek(0)
         return InMemoryUploadedFile(
-            file=io.BytesIO(transcript_bytes),
+            file=transcript_file,
             name=filename,
             content_type='text/plain',
-            size=len(transcript_bytes),
+            size=size,
             field_name='transcript',
             charset=None
         )
 
+    @staticmethod
+    def iter_caps_to_vtt(caps):
+        """
+        Utility method to convert any supported transcripts into WebVTT format piece by piece.
+
+        SRT transcripts are converted one cue at a time, WebVTT ones are validated and returned as they are;
+        other formats are read by pycaption at once.
+
+        Arguments:
+            caps: Raw transcripts as a string, bytes, a file object or an iterable of chunks.
+        Yields:
+            unicode: Parts of transcripts converted into WebVTT format, nothing for unsupported transcripts.
+        """
+        captions_format, lines = sniff_format(iter_lines(caps))
+        if captions_format == CaptionsFormat.WEBVTT:
+            yield from iter_validated_vtt(lines)
+            return
+        if captions_format == CaptionsFormat.SRT:
+            yield from iter_vtt(iter_srt_cues(lines))
+            return
+
+        caps = '\n'.join(lines)
+        if caps:
+            reader = detect_format(caps)
+            if reader:
+                yield WebVTTWriter().write(reader().read(caps))
+
+    @staticmethod
+    def build_cue_index(caps):
+        """
+        Parse transcripts of any supported format into a cue index.
+
+        Arguments:
+            caps: Raw transcripts as a string, bytes, a file object or an iterable of chunks.
+        Returns:
+            CueIndex: Transcripts' cues, empty for unsupported transcripts.
+        """
+        captions_format, lines = sniff_format(iter_lines(caps))
+        if captions_format == CaptionsFormat.SRT:
+            return CueIndex(iter_srt_cues(lines))
+        if captions_format is None:
+            lines = iter_lines(u''.join(TranscriptsMixin.iter_caps_to_vtt(u'\n'.join(lines))))
+        return CueIndex(iter_cues(lines))
+
+    def get_asset_cue_index(self, asset_location):
+        """
+        Return cue index of a transcript stored in contentstore.
+
+        The index is built once per asset version and cached.
+        """
+        content = self.contentstore().find(asset_location, as_stream=True)  # pylint: disable=not-callable
+        asset_version = self.get_asset_version(content)
+        if asset_version is None:
+            return self.build_cue_index(content.stream_data())
+        packed_index = self.converted_transcripts_cache.get_or_fetch(
+            ('cues', str(asset_location), asset_version, __version__),
+            lambda: self.build_cue_index(content.stream_data()).to_bytes()
+        )
+        return CueIndex.from_bytes(packed_index)
+
+    def get_transcript_cue_index(self, transcript, external_transcript=None):
+        """
+        Return cue index of an enabled transcript.
+
+        Arguments:
+            transcript (dict): Transcript's data, as returned by `get_enabled_transcripts`.
+            external_transcript (Transcript): Already fetched content of a 3PlayMedia transcript, if any.
+        Returns:
+            CueIndex: Transcript's cues, None if transcript's content isn't available.
+        """
+        if transcript['source'] == TranscriptSource.THREE_PLAY_MEDIA:
+            if external_transcript is None:
+                external_transcript = self.fetch_single_3pm_translation(
+                    transcript_data={'id': transcript['id'], 'language_id': transcript['lang_id']}
+                )
+            return external_transcript and self.build_cue_index(external_transcript.content)
+
+        asset_file_name = transcript['url'].split('@')[-1]
+        return self.get_asset_cue_index(self.static_content.compute_location(self.course_key, asset_file_name))
+
+    def get_captions_window(self):
+        """
+        Return the part of the video shown to learners, which captions are trimmed to.
+
+        Returns:
+            tuple: Start and end of the window in milliseconds (end is None if the video is played till the end),
+                None if the whole video is shown.
+        """
+        start = int(self.start_time.total_seconds() * 1000)  # pylint: disable=no-member
+        end = int(self.end_time.total_seconds() * 1000)  # pylint: disable=no-member
+        if end <= start:
+            end = None
+        if not start and end is None:
+            return None
+        return start, end
+
+    @staticmethod
+    def trim_captions(caps, window):
+        """
+        Keep only cues shown within a window.
+
+        Cue times are left as they are, since text tracks are timed by the media element,
+        not by the offset player's time. WebVTT cue blocks are filtered as text, so cue settings,
+        identifiers and styles are kept; other formats are converted cue by cue.
+
+        Arguments:
+            caps: Raw transcripts as a string, bytes, a file object or an iterable of chunks.
+            window (tuple): Start and end (or None) of the window in milliseconds.
+        Returns:
+            unicode: Trimmed transcripts in WebVTT format.
+        """
+        captions_format, lines = sniff_format(iter_lines(caps))
+        if captions_format == CaptionsFormat.WEBVTT:
+            return u''.join(iter_trimmed_vtt(lines, *window))
+        cue_index = TranscriptsMixin.build_cue_index(line + u'\n' for line in lines)
+        return u''.join(iter_vtt(cue_index.slice(*window)))
+
     @staticmethod
     def convert_caps_to_vtt(caps):
         """
@@ -141,29 +333,23 @@ class TranscriptsMixin(XBlock):
         Supported input formats: DFXP/TTML - SAMI - SCC - SRT - WebVTT.
 
         Arguments:
-            caps (unicode): Raw transcripts.
+            caps: Raw transcripts as a string, bytes, a file object or an iterable of chunks.
         Returns:
             unicode: Transcripts converted into WebVTT format.
         """
         if caps:
-            reader = detect_format(caps)
-            if reader:
-                return WebVTTWriter().write(reader().read(caps))
+            return u''.join(TranscriptsMixin.iter_caps_to_vtt(caps))
         return u''
 
     @staticmethod
     def vtt_to_text(vtt_content):
         """
         Utility method to extract text from WebVTT format transcript.
+
+        Arguments:
+            vtt_content: WebVTT transcript as a string, bytes, a file object or an iterable of chunks.
         """
-        text_lines = []
-        if isinstance(vtt_content, bytes):
-            vtt_content = str(vtt_content, 'utf-8')
-        for line in vtt_content.splitlines():
-            if '-->' in line or line == '':
-                continue
-            text_lines.append(line)
-        return ' '.join(text_lines)
+        return ' '.join(iter_text(iter_lines(vtt_content)))
 
     def route_transcripts(self):
         """
@@ -171,12 +357,14 @@ class TranscriptsMixin(XBlock):
 
         While direct 3PlayMedia transcripts enabled: to transcript fetcher
         and to `str_to_vtt` handler for non .vtt transcripts if opposite.
+        If the video is clipped, .vtt transcripts are routed to `trimmed_transcript` handler.
 
         Arguments:
             transcripts (unicode): Raw transcripts.
         """
         log.debug("Routing transcripts: 3PM status={}".format(self.threeplaymedia_streaming))
         transcripts = self.get_enabled_transcripts()
+        captions_window = self.get_captions_window()
         for tran in transcripts:
             if self.threeplaymedia_streaming:
                 # download URL remains hidden behind the handler:
@@ -194,6 +382,10 @@ class TranscriptsMixin(XBlock):
                 tran['url'] = self.runtime.handler_url(
                     self, 'srt_to_vtt', query=tran['url']
                 )
+            elif captions_window:
+                tran['url'] = self.runtime.handler_url(
+                    self, 'trimmed_transcript', query=tran['url']
+                )
             yield tran
 
     def get_transcript_download_link(self):
@@ -249,18 +441,9 @@ class TranscriptsMixin(XBlock):
                 url (str)   : External url for vtt file.
                 label (str) : Name of language.
         """
-        out, response = [], {}
-        for item in caps.splitlines():
-            if item == '':
-                item = ' \n'
-            elif '-->' in item:
-                # This line is deltatime stamp 00:05:55.030 --> 00:05:57.200.
-                # Length this line is 29 characters.
-                item = item[:29]
-            out.append(item)
-
-        caps = u'\n'.join(out).replace('\n&nbsp;', '')
-        sub = self.convert_caps_to_vtt(caps=caps)
+        response = {}
+        # WebVTT is stored as it is (cue settings included), SRT and other formats are converted.
+        sub = self.convert_caps_to_vtt(caps=caps.replace('\n&nbsp;', ''))
         reference_name = "{lang_label}_captions_video_{video_id}".format(
             lang_label=lang_label, video_id=video_id
         ).encode('utf8')
@@ -271,10 +454,14 @@ class TranscriptsMixin(XBlock):
             response = {"lang": lang, "url": external_url, "label": lang_label}
         return response
 
-    def fetch_available_3pm_transcripts(self):
+    def fetch_available_3pm_transcripts(self, with_content=False):
         """
         Fetch all available transcripts from 3PlayMedia API for current file ID.
 
+        Transcripts' data is built out of the transcripts list response, transcripts' contents are
+        downloaded (concurrently) only if `with_content` is set.
+
+        :param with_content: (bool) whether to download transcripts' contents
         :return: (generator of OrderedDicts) all transcript's data
         """
         feedback, transcripts_list = self.get_3pm_transcripts_list(
@@ -286,13 +473,16 @@ class TranscriptsMixin(XBlock):
             log.error("3PlayMedia transcripts fetching API request has failed!\n{}".format(feedback['message']))
             return
 
-        for transcript_data in transcripts_list:
-            transcript = self.fetch_single_3pm_translation(transcript_data)
-            if transcript is None:
-                return
-            transcript_ordered_dict = transcript._asdict()
-            transcript_ordered_dict['content'] = ''  # we don't want to parse it to JSON
-            yield transcript_ordered_dict
+        if with_content:
+            transcripts = [
+                transcript for transcript in self.fetch_3pm_translations(transcripts_list) if transcript is not None
+            ]
+        else:
+            # we don't want to parse content to JSON, so there is no need to download it
+            transcripts = [self.build_3pm_transcript(transcript_data) for transcript_data in transcripts_list]
+
+        for transcript in transcripts:
+            yield transcript._asdict()
 
     def get_3pm_transcripts_list(self, file_id, apikey):
         """
@@ -302,74 +492,190 @@ class TranscriptsMixin(XBlock):
         """
         domain = self.THREE_PLAY_MEDIA_API_DOMAIN
 
-        transcripts_list = []
         failure_message = _("3PlayMedia transcripts fetching API request has failed!")
         success_message = _("3PlayMedia transcripts fetched successfully.")
         feedback = {'status': Status.error, 'message': failure_message}
 
-        try:
-            response = requests.get(
-                '{domain}files/{file_id}/transcripts?apikey={api_key}'.format(
-                    domain=domain, file_id=file_id, api_key=apikey
+        def fetch():
+            """
+            Request transcripts list from 3PlayMedia API, return None on failure.
+            """
+            try:
+                response = threeplaymedia_http.get(
+                    '{domain}files/{file_id}/transcripts?apikey={api_key}'.format(
+                        domain=domain, file_id=file_id, api_key=apikey
+                    )
                 )
-            )
-            log.debug(response._content)  # pylint: disable=protected-access
-        except IOError:
-            log.exception(failure_message)
-            return feedback, transcripts_list
-
-        if response.ok and isinstance(response.json(), list):
-            transcripts_list = response.json()
-            feedback['status'] = Status.success
-            feedback['message'] = success_message
-        else:
-            feedback['status'] = Status.error
+                log.debug(response._content)  # pylint: disable=protected-access
+            except IOError:
+                log.exception(failure_message)
+                return None
+
+            if response.ok and isinstance(response.json(), list):
+                return response.json()
+            return None
+
+        transcripts_list = self.threeplaymedia_cache.get_or_fetch((file_id, None, None, apikey), fetch)
+        if transcripts_list is None:
+            return feedback, []
+
+        feedback['status'] = Status.success
+        feedback['message'] = success_message
         return feedback, transcripts_list
 
-    def fetch_single_3pm_translation(self, transcript_data, format_id=TPMApiTranscriptFormatID.WEBVTT):
+    def get_3pm_transcript_url(self, transcript_id, format_id=TPMApiTranscriptFormatID.WEBVTT):
         """
-        Fetch single transcript for given file ID in given format.
-
-        :param transcript_data:
-        :param format_id: defauts to VTT
-        :return: (namedtuple instance) transcript data
+        Return 3PlayMedia API URL of a transcript of current file ID in given format.
         """
-        transcript_id = transcript_data.get('id', '')
-        lang_id = transcript_data.get('language_id')
-        external_api_url = '{domain}files/{file_id}/transcripts/{tid}?apikey={api_key}&format_id={format_id}'.format(
+        return '{domain}files/{file_id}/transcripts/{tid}?apikey={api_key}&format_id={format_id}'.format(
             domain=self.THREE_PLAY_MEDIA_API_DOMAIN,
             file_id=self.threeplaymedia_file_id,
             tid=transcript_id,
             api_key=self.threeplaymedia_apikey,
             format_id=format_id
         )
-        try:
-            content = requests.get(external_api_url).text
-        except Exception:  # pylint: disable=broad-except
-            log.exception(_("Transcript fetching failure: language [{}]").format(TPMApiLanguage(lang_id)))
-            return
 
+    def build_3pm_transcript(self, transcript_data, content='', format_id=TPMApiTranscriptFormatID.WEBVTT):
+        """
+        Build transcript data out of 3PlayMedia transcripts list item, without making API requests.
+
+        :param transcript_data: (dict) item of 3PlayMedia transcripts list
+        :param content: (unicode) transcript's content, if already fetched
+        :param format_id: defauts to VTT
+        :return: (namedtuple instance) transcript data
+        """
+        transcript_id = transcript_data.get('id', '')
+        lang_id = transcript_data.get('language_id')
         lang_code = TPMApiLanguage(lang_id)
-        lang_label = lang_code.name
-        video_id = self.get_player().media_id(self.href)
-        source = TranscriptSource.THREE_PLAY_MEDIA
         return Transcript(
             id=transcript_id,
             content=content,
             lang=lang_code.iso_639_1_code,
             lang_id=lang_id,
-            label=lang_label,
-            video_id=video_id,
+            label=lang_code.name,
+            video_id=self.get_player().media_id(self.href),
             format=format_id,
-            source=source,
-            url=external_api_url,
+            source=TranscriptSource.THREE_PLAY_MEDIA,
+            url=self.get_3pm_transcript_url(transcript_id, format_id),
         )
 
+    @staticmethod
+    def _fetch_3pm_transcript_content(cache, key_parts, url, lang_id):
+        """
+        Fetch transcript's content from 3PlayMedia API through the cache.
+
+        Doesn't touch xblock's fields, so it's safe to be called from worker threads.
+
+        :return: (unicode) transcript's content or None on failure
+        """
+        def fetch():
+            """
+            Request transcript content from 3PlayMedia API, return None on failure.
+            """
+            try:
+                response = threeplaymedia_http.get(url)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(_("Transcript fetching failure: language [{}]").format(TPMApiLanguage(lang_id)))
+                return None
+            if not response.ok:
+                log.error(_("Transcript fetching failure: language [{}]").format(TPMApiLanguage(lang_id)))
+                return None
+            return response.text
+
+        return cache.get_or_fetch(key_parts, fetch)
+
+    def fetch_single_3pm_translation(self, transcript_data, format_id=TPMApiTranscriptFormatID.WEBVTT):
+        """
+        Fetch single transcript for given file ID in given format.
+
+        :param transcript_data:
+        :param format_id: defauts to VTT
+        :return: (namedtuple instance) transcript data
+        """
+        return self.fetch_3pm_translations([transcript_data], format_id)[0]
+
+    def fetch_3pm_translations(self, transcripts_data, format_id=TPMApiTranscriptFormatID.WEBVTT):
+        """
+        Fetch several transcripts for given file ID in given format concurrently.
+
+        Number of concurrent API requests is limited by `threeplaymedia_max_workers` setting.
+
+        :param transcripts_data: (list of dicts) items of 3PlayMedia transcripts list
+        :param format_id: defauts to VTT
+        :return: (list of namedtuple instances) transcripts data in the same order, None for failed ones
+        """
+        cache = self.threeplaymedia_cache
+        fetch_args = []
+        for transcript_data in transcripts_data:
+            transcript_id = transcript_data.get('id', '')
+            fetch_args.append((
+                cache,
+                (self.threeplaymedia_file_id, transcript_id, format_id, self.threeplaymedia_apikey),
+                self.get_3pm_transcript_url(transcript_id, format_id),
+                transcript_data.get('language_id'),
+            ))
+
+        if len(fetch_args) > 1:
+            max_workers = getattr(self, 'settings', {}).get(
+                'threeplaymedia_max_workers', self.THREE_PLAY_MEDIA_MAX_WORKERS
+            )
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(fetch_args))) as executor:
+                contents = list(executor.map(lambda args: self._fetch_3pm_transcript_content(*args), fetch_args))
+        else:
+            contents = [self._fetch_3pm_transcript_content(*args) for args in fetch_args]
+
+        return [
+            None if content is None else self.build_3pm_transcript(transcript_data, content, format_id)
+            for transcript_data, content in zip(transcripts_data, contents)
+        ]
+
+    def find_enabled_transcript_asset(self, path):
+        """
+        Find an asset of a transcript enabled in this block.
+
+        Handlers serving an asset by a path from the request must not expose any other assets: only
+        the ones which belong to the block's course, are enabled transcripts and aren't locked are found.
+
+        Arguments:
+            path (str): Path to the asset, e.g. '/asset-v1:Org+Course+Run+type@asset+block@en.vtt'.
+        Returns:
+            tuple: Asset's location and content (as a stream), or None if there is no such asset.
+        """
+        try:
+            asset_location = self.static_content.get_location_from_path(self.get_path_for(path))
+        except InvalidKeyError:
+            return None
+        if getattr(asset_location, 'course_key', None) != self.course_key:
+            return None
+
+        enabled_locations = []
+        for transcript in self.get_enabled_transcripts():
+            try:
+                enabled_locations.append(
+                    self.static_content.get_location_from_path(self.get_path_for(transcript.get('url')))
+                )
+            except InvalidKeyError:
+                continue
+        if asset_location not in enabled_locations:
+            return None
+
+        try:
+            content = self.contentstore().find(asset_location, as_stream=True)  # pylint: disable=not-callable
+        except NotFoundError:
+            return None
+        if getattr(content, 'locked', False):
+            return None
+        return asset_location, content
+
     @XBlock.handler
     def download_transcript(self, request, _suffix=''):
         """
         Download a transcript.
 
+        Path to a transcript asset is passed in as `request.query_string`; only enabled transcripts are served.
+        The asset is streamed right from contentstore, honouring conditional (`If-None-Match`, `If-Modified-Since`)
+        and `Range` requests. Directly streamed 3PlayMedia transcripts are fetched by their handler.
+
         Arguments:
             request (webob.Request): Request to handle.
             suffix (string): Slug used for routing.
@@ -378,27 +684,65 @@ class TranscriptsMixin(XBlock):
         """
         trans_path = self.get_path_for(request.query_string)
         filename = self.get_file_name_from_path(trans_path)
-        transcript = requests.get(request.host_url + request.query_string).text
-        response = Response(transcript)
-        headerlist = [
-            ('Content-Type', 'text/plain'),
-            ('Content-Disposition', 'attachment; filename={}'.format(filename))
-        ]
-        response.headerlist = headerlist
+
+        handler_path = urlsplit(request.query_string)
+        if handler_path.path.rstrip('/').endswith('/fetch_from_three_play_media'):
+            response = self.fetch_from_three_play_media(Request.blank('/', query_string=handler_path.query))
+            response.content_disposition = 'attachment; filename={}'.format(filename)
+            return response
+
+        asset = self.find_enabled_transcript_asset(trans_path)
+        if asset is None:
+            log.warning("Transcript asset to download not found: %s", request.query_string)
+            return Response(status=404)
+        _asset_location, content = asset
+
+        response = Response(content_type='text/plain', charset='utf-8', conditional_response=False)
+        response.content_disposition = 'attachment; filename={}'.format(filename)
+        response.cache_control = 'private, no-cache'
+        response.accept_ranges = 'bytes'
+        response.etag = getattr(content, 'content_digest', None)
+        response.last_modified = getattr(content, 'last_modified_at', None)
+
+        if response.etag and response.etag in request.if_none_match or (
+                not request.if_none_match and response.last_modified and request.if_modified_since
+                and response.last_modified <= request.if_modified_since
+        ):
+            response.status = 304
+            response.content_type = None
+            return response
+
+        length = content.length
+        if request.range and response in request.if_range:
+            byte_range = request.range.range_for_length(length)
+            if byte_range is None:
+                response.status = 416
+                response.content_range = 'bytes */{}'.format(length)
+                return response
+            start, stop = byte_range
+            response.status = 206
+            response.content_range = (start, stop, length)
+            response.app_iter = content.stream_data_in_range(start, stop - 1)
+            response.content_length = stop - start
+        else:
+            response.app_iter = content.stream_data()
+            response.content_length = length
         return response
 
     # TODO: This method should be removed in the future.
     # For new installations, this method is not needed, since the transcript
     # files are saved in VTT format.
-    # To support existing installations, we need to create a management command
-    # that can convert the current transcript files to the VTT format. 
-    # Once the command is implemented, we can remove the existing srt_to_vtt method.
+    # Existing installations should convert their transcript files to the VTT format with
+    # `video_xblock_transcripts migrate-to-vtt` management command; once they have,
+    # the srt_to_vtt method can be removed.
     @XBlock.handler
     def srt_to_vtt(self, request, _suffix=''):
         """
         Fetch raw transcripts, convert them into WebVTT format and return back.
 
         Path to raw transcripts is passed in as `request.query_string`.
+        Converted transcripts are cached by asset's location and version, and validated by `ETag`,
+        so an asset is read and converted only once after every change.
 
         Arguments:
             request (webob.Request): The request to handle
@@ -410,16 +754,108 @@ class TranscriptsMixin(XBlock):
         loc = StaticContent.get_location_from_path(caps_path)
         static_cont_serv = StaticContentServer()
         content_transcript = static_cont_serv.load_asset_from_location(loc)
-        caps_bytes = b''.join(content_transcript.stream_data())
-        caps = caps_bytes.decode('UTF-8')
+        captions_window = self.get_captions_window()
+
+        def convert():
+            """
+            Read the asset and convert it to WebVTT.
+            """
+            if captions_window:
+                return self.trim_captions(content_transcript.stream_data(), captions_window)
+            return self.convert_caps_to_vtt(content_transcript.stream_data())
+
+        asset_version = self.get_asset_version(content_transcript)
+        key_parts = asset_version and (str(loc), asset_version, captions_window)
+        return self._captions_response(request, key_parts, convert)
+
+    @XBlock.handler
+    def trimmed_transcript(self, request, _suffix=''):
+        """
+        Return WebVTT transcripts stored as an asset, trimmed to the part of the video shown to learners.
+
+        Path to transcripts is passed in as `request.query_string`; only enabled transcripts are served.
+        Trimmed transcripts are cached by asset's location and version and the window, and validated by `ETag`.
+
+        Arguments:
+            request (webob.Request): The request to handle
+            suffix (string): The remainder of the url, after the handler url prefix, if available.
+        Returns:
+            webob.Response: WebVTT transcripts wrapped in Response object.
+        """
+        asset = self.find_enabled_transcript_asset(request.query_string)
+        if asset is None:
+            log.warning("Transcript asset to trim not found: %s", request.query_string)
+            return Response(status=404)
+        asset_location, content = asset
+        captions_window = self.get_captions_window() or (0, None)
+
+        asset_version = self.get_asset_version(content)
+        key_parts = asset_version and (str(asset_location), asset_version, captions_window)
+        return self._captions_response(
+            request, key_parts, lambda: self.trim_captions(content.stream_data(), captions_window)
+        )
+
+    def _captions_response(self, request, key_parts, build):
+        """
+        Return WebVTT captions, cached and validated by `ETag` if they can be identified.
+
+        Arguments:
+            request (webob.Request): The request to handle.
+            key_parts (tuple): Values identifying the captions, e.g. asset's location and version, if known.
+            build (callable): Function with no arguments returning the captions; empty ones aren't cached.
+        Returns:
+            webob.Response: WebVTT captions or "304 Not Modified" response.
+        """
+        if not key_parts:
+            return Response(build(), content_type='text/vtt', charset='utf-8')
+
+        key_parts = tuple(key_parts) + (__version__,)
+        etag = hashlib.sha1(repr(key_parts).encode('utf8')).hexdigest()
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            vtt = self.converted_transcripts_cache.get_or_fetch(key_parts, lambda: build() or None)
+            response = Response(vtt or '', content_type='text/vtt', charset='utf-8')
+        response.etag = etag
+        response.cache_control = 'private, no-cache'
+        return response
+
+    @XBlock.json_handler
+    def get_transcript_cue(self, data, _suffix=''):
+        """
+        Return the cue of an enabled transcript shown at a given time.
 
-        return Response(self.convert_caps_to_vtt(caps))
+        Arguments:
+            data (dict): Transcript's language code (`lang`) and time in seconds (`time`).
+            _suffix (str): Slug used for routing. Imposed by `XBlock.json_handler`.
+        Returns:
+            dict: Cue's `start` and `end` (in seconds) and `text`, empty if there is no such cue.
+        """
+        try:
+            time = int(float(data.get('time')) * 1000)
+        except (TypeError, ValueError, OverflowError):
+            return {}
+        for transcript in self.get_enabled_transcripts():
+            if transcript.get('lang') == data.get('lang'):
+                try:
+                    cue_index = self.get_transcript_cue_index(transcript)
+                except (IOError, ValueError, NotFoundError):
+                    log.exception("Can't read transcript: %s", transcript)
+                    return {}
+                cue = cue_index and cue_index.cue_at(time)
+                if cue:
+                    return {'start': cue.start / 1000.0, 'end': cue.end / 1000.0, 'text': cue.text}
+                break
+        return {}
 
     @XBlock.handler
     def fetch_from_three_play_media(self, request, _suffix=''):
         """
         Proxy handler to hide real API url.
 
+        Transcripts of a clipped video are trimmed to the part of the video shown to learners;
+        trimmed transcripts are cached by transcript, language, window and content, and validated by `ETag`.
+
         Arguments:
             request (webob.Request): The request to handle
             suffix (string): not used
@@ -431,7 +867,15 @@ class TranscriptsMixin(XBlock):
         transcript = self.fetch_single_3pm_translation(transcript_data={'id': transcript_id, 'language_id': lang_id})
         if transcript is None:
             return Response()
-        return Response(transcript.content, content_type='text/vtt')
+        captions_window = self.get_captions_window()
+        if not captions_window:
+            return Response(transcript.content, content_type='text/vtt')
+        # Transcript's content is cached already, so it's identified by its digest to catch its updates.
+        content_digest = hashlib.sha1(transcript.content.encode('utf8')).hexdigest()
+        key_parts = ('3pm', transcript_id, lang_id, captions_window, content_digest)
+        return self._captions_response(
+            request, key_parts, lambda: self.trim_captions(transcript.content, captions_window)
+        )
 
     @XBlock.handler
     def validate_three_play_media_config(self, request, _suffix=''):
@@ -542,6 +986,39 @@ class PlaybackStateMixin(XBlock):
         'captions_enabled', 'captions_language', 'transcripts'
     )
 
+    PLAYBACK_PROGRESS_INTERVAL = 0  # seconds, progress isn't tracked by default
+    PLAYBACK_PROGRESS_FLUSH_INTERVAL = 60  # seconds
+    PLAYBACK_PROGRESS_BUFFER_TIMEOUT = 7 * 24 * 60 * 60  # seconds
+
+    @property
+    def playback_progress_interval(self):
+        """
+        Return interval of playback progress heartbeats, 0 if progress isn't tracked server-side.
+        """
+        return getattr(self, 'settings', {}).get('playback_progress_interval', self.PLAYBACK_PROGRESS_INTERVAL)
+
+    @property
+    def playback_progress_buffer(self):
+        """
+        Return Django cache backend buffering playback progress heartbeats, set by `cache_alias` setting.
+        """
+        return get_cache_backend(getattr(self, 'settings', {}).get('cache_alias', DEFAULT_CACHE_ALIAS))
+
+    def get_playback_progress_key(self):
+        """
+        Return cache key of learner's buffered playback progress.
+        """
+        return 'video_xblock:progress:{}:{}'.format(self.scope_ids.usage_id, self.scope_ids.user_id)
+
+    def get_buffered_playback_progress(self):
+        """
+        Return learner's playback progress not yet flushed to `current_time`, None if there is none.
+        """
+        if not self.playback_progress_interval:
+            return None
+        buffered = self.playback_progress_buffer.get(self.get_playback_progress_key())
+        return buffered and buffered['current_time']
+
     @property
     def course_default_language(self):
         """
@@ -570,6 +1047,9 @@ class PlaybackStateMixin(XBlock):
             'transcriptsObject': transcripts_object,
             'transcripts': transcripts
         }
+        buffered_current_time = self.get_buffered_playback_progress()
+        if buffered_current_time is not None:
+            state['currentTime'] = buffered_current_time
         for field_name in self.player_state_fields:
             mixedcase_field_name = underscore_to_mixedcase(field_name)
             state.setdefault(mixedcase_field_name, getattr(self, field_name))
@@ -591,27 +1071,72 @@ class PlaybackStateMixin(XBlock):
         """
         Xblock handler to save playback player state. Called by JavaScript of `student_view`.
 
+        Only fields present in the request are considered, and only those which differ from the stored
+        values are assigned, so that an unchanged state doesn't cause a write to the user state storage.
+
         Arguments:
             request (dict): Request data to handle.
             suffix (str): Slug used for routing.
         Returns:
             Data on success (dict).
         """
-        player_state = {
-            'transcripts': self.transcripts
-        }
-
+        player_state = {}
         for field_name in self.player_state_fields:
-            if field_name not in player_state:
-                player_state[field_name] = request[underscore_to_mixedcase(field_name)]
+            mixedcase_field_name = underscore_to_mixedcase(field_name)
+            if field_name != 'transcripts' and mixedcase_field_name in request:
+                player_state[field_name] = request[mixedcase_field_name]
 
         # make sure player's volume is down when muted:
-        if player_state['muted']:
+        if player_state.get('muted', self.muted):
             player_state['volume'] = 0.000
 
-        self.player_state = player_state
+        changed_state = {
+            field_name: value for field_name, value in player_state.items()
+            if getattr(self, field_name) != value
+        }
+        if changed_state:
+            self.player_state = changed_state
+        if 'current_time' in player_state and self.playback_progress_interval:
+            # the position is saved, there is nothing left to flush:
+            self.playback_progress_buffer.delete(self.get_playback_progress_key())
         return {'success': True}
 
+    @XBlock.json_handler
+    def save_playback_progress(self, request, _suffix=''):
+        """
+        Xblock handler to record playback progress heartbeat. Called by JavaScript of `student_view`.
+
+        Heartbeats are buffered in Django cache and flushed to `current_time` at most once
+        in `playback_progress_flush_interval`, so that most of them don't write to the user state storage.
+        The final heartbeat of a session (sent on pause or when the page is closed) is flushed right away.
+
+        Arguments:
+            request (dict): Request data to handle, i.e. `currentTime` and optional `final` flag.
+            suffix (str): Slug used for routing.
+        Returns:
+            Data on success (dict).
+        """
+        if not self.playback_progress_interval:
+            return {'success': False}
+        try:
+            current_time = float(request['currentTime'])
+        except (KeyError, TypeError, ValueError):
+            return {'success': False}
+        if not (math.isfinite(current_time) and current_time >= 0):
+            return {'success': False}
+
+        now = time.time()
+        key = self.get_playback_progress_key()
+        flush_interval = self.settings.get('playback_progress_flush_interval', self.PLAYBACK_PROGRESS_FLUSH_INTERVAL)
+        buffered = self.playback_progress_buffer.get(key) or {'flushed': now}
+        buffered['current_time'] = current_time
+        flushed = bool(request.get('final')) or now - buffered['flushed'] >= flush_interval
+        if flushed:
+            self.current_time = buffered['current_time']
+            buffered['flushed'] = now
+        self.playback_progress_buffer.set(key, buffered, self.PLAYBACK_PROGRESS_BUFFER_TIMEOUT)
+        return {'success': True, 'flushed': flushed}
+
 
 @XBlock.wants('settings')
 class SettingsMixin(XBlock):
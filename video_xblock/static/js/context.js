@@ -3,5 +3,9 @@
  */
 window.videoPlayerId = '{{ video_player_id }}';
 window.playerStateObj = JSON.parse('{{ player_state }}');
+window.saveStateUrl = '{{ save_state_url }}';
+window.publishEventsUrl = '{{ publish_events_url }}';
+window.playbackProgressUrl = '{{ playback_progress_url }}';
+window.playbackProgressInterval = Number('{{ playback_progress_interval }}');
 window.playerStartTime = JSON.parse('{{ start_time }}');
 window.playerEndTime = JSON.parse('{{ end_time }}');
@@ -9,6 +9,8 @@ function getHandlers(runtime, element) {
         downloadTranscript: runtime.handlerUrl(element, 'download_transcript'),
         authenticateVideoApi: runtime.handlerUrl(element, 'authenticate_video_api_handler'),
         uploadDefaultTranscript: runtime.handlerUrl(element, 'upload_default_transcript_handler'),
+        discoverDefaultTranscripts: runtime.handlerUrl(element, 'discover_default_transcripts'),
+        jobStatus: runtime.handlerUrl(element, 'job_status'),
         uploadManualTranscript: runtime.handlerUrl(element, 'upload_file_handler'),
         validateThreePlayMediaConfig: runtime.handlerUrl(element, 'validate_three_play_media_config'),
         saveState: runtime.handlerUrl(element, 'save_player_state'),
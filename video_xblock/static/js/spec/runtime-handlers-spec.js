@@ -10,6 +10,8 @@ describe('Runtime handlers', function() {
         downloadTranscript: 'download_transcript',
         authenticateVideoApi: 'authenticate_video_api_handler',
         uploadDefaultTranscript: 'upload_default_transcript_handler',
+        discoverDefaultTranscripts: 'discover_default_transcripts',
+        jobStatus: 'job_status',
         validateThreePlayMediaConfig: 'validate_three_play_media_config',
         saveState: 'save_player_state',
         publishEvent: 'publish_event'
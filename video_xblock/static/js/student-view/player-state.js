@@ -7,12 +7,30 @@
  * - Muted
  *
  * State is loaded after VideoJs player is fully initialized.
- * State is saved at certain events.
+ * State is saved at certain events: changes made in a quick succession (e.g. scrubbing or
+ * rate changes) are coalesced and saved once, when no more changes are made for a while,
+ * or when the page is hidden or unloaded.
  */
 
 var PlayerState = function(player, playerState) {
     'use strict';
+    var SAVE_STATE_DELAY = 2000; // milliseconds
     var xblockUsageId = getXblockUsageId();
+    var saveStateTimeout = null;
+    var pendingState = null;
+    var pendingTranscriptUrl;
+    var playbackProgressInterval = null;
+    var sentPlaybackProgress;
+    var flushedPlaybackProgress;
+    var savedState = {
+        volume: playerState.volume,
+        currentTime: playerState.currentTime,
+        playbackRate: playerState.playbackRate,
+        muted: playerState.muted,
+        transcriptsEnabled: playerState.transcriptsEnabled,
+        captionsEnabled: playerState.captionsEnabled,
+        captionsLanguage: playerState.captionsLanguage
+    };
 
     /** Create hashmap with all transcripts */
     var getTranscipts = function(transcriptsData) {
@@ -31,7 +49,8 @@ var PlayerState = function(player, playerState) {
     /** Restore default or previously saved player state */
     var setInitialState = function(state) {
         var stateCurrentTime = state.currentTime;
-        var playbackProgress = localStorage.getItem('playbackProgress');
+        // Playback progress tracked server-side is already in the state and is shared across devices:
+        var playbackProgress = !window.playbackProgressInterval && localStorage.getItem('playbackProgress');
         if (playbackProgress) {
             playbackProgress = JSON.parse(playbackProgress);
             if (playbackProgress[window.videoPlayerId]) {
@@ -55,14 +74,44 @@ var PlayerState = function(player, playerState) {
     };
 
     /**
-     * Save player state by posting it in a message to parent frame.
-     * Parent frame passes it to a server by calling VideoXBlock.save_state() handler.
+     * Send the latest player state, unless it's already saved.
+     *
+     * State is posted in a message to parent frame, which passes it to a server by calling
+     * VideoXBlock.save_player_state() handler. When the page is going away, the state is sent
+     * to the handler directly with `navigator.sendBeacon()`, which outlives the page.
+     */
+    var flushState = function(useBeacon) {
+        var state = pendingState;
+        clearTimeout(saveStateTimeout);
+        saveStateTimeout = null;
+        pendingState = null;
+        if (!state || JSON.stringify(state) === JSON.stringify(savedState)) {
+            return;
+        }
+        savedState = state;
+        if (useBeacon && navigator.sendBeacon && window.saveStateUrl) {
+            navigator.sendBeacon(window.saveStateUrl, JSON.stringify(state));
+            return;
+        }
+        console.log('Starting saving player state');  // eslint-disable-line no-console
+        parent.postMessage(
+            {
+                action: 'saveState',
+                info: state,
+                xblockUsageId: xblockUsageId,
+                downloadTranscriptUrl: pendingTranscriptUrl || '#'
+            },
+            document.location.protocol + '//' + document.location.host
+        );
+    };
+
+    /**
+     * Record player state to be saved once no more changes are made for `SAVE_STATE_DELAY`.
      */
     var saveState = function() {
         var playerObj = this;
-        var transcriptUrl = getDownloadTranscriptUrl(transcripts, playerObj);
-
-        var newState = {
+        pendingTranscriptUrl = getDownloadTranscriptUrl(transcripts, playerObj);
+        pendingState = {
             volume: playerObj.volume(),
             currentTime: playerObj.ended() ? 0 : playerObj.currentTime(),
             playbackRate: playerObj.playbackRate(),
@@ -71,19 +120,8 @@ var PlayerState = function(player, playerState) {
             captionsEnabled: playerObj.captionsEnabled,
             captionsLanguage: playerObj.captionsLanguage
         };
-        if (JSON.stringify(newState) !== JSON.stringify(playerState)) {
-            console.log('Starting saving player state');  // eslint-disable-line no-console
-            playerState = newState; // eslint-disable-line no-param-reassign
-            parent.postMessage(
-                {
-                    action: 'saveState',
-                    info: newState,
-                    xblockUsageId: xblockUsageId,
-                    downloadTranscriptUrl: transcriptUrl || '#'
-                },
-                document.location.protocol + '//' + document.location.host
-            );
-        }
+        clearTimeout(saveStateTimeout);
+        saveStateTimeout = setTimeout(function() { flushState(false); }, SAVE_STATE_DELAY);
     };
 
     /**
@@ -98,9 +136,61 @@ var PlayerState = function(player, playerState) {
         localStorage.setItem('playbackProgress', JSON.stringify(playbackProgress));
     };
 
+    /**
+     * Send sampled playback position to VideoXBlock.save_playback_progress() handler, if it has changed.
+     *
+     * Final position of a session (`final` is true) is flushed to learner's state right away.
+     */
+    var sendPlaybackProgress = function(final) {
+        var currentTime = player.ended() ? 0 : player.currentTime();
+        var data, xhr;
+        if (currentTime === (final ? flushedPlaybackProgress : sentPlaybackProgress)) {
+            return;
+        }
+        sentPlaybackProgress = currentTime;
+        if (final) {
+            flushedPlaybackProgress = currentTime;
+        }
+        data = JSON.stringify({currentTime: currentTime, final: final});
+        if (navigator.sendBeacon && navigator.sendBeacon(window.playbackProgressUrl, data)) {
+            return;
+        }
+        xhr = new XMLHttpRequest();
+        xhr.open('POST', window.playbackProgressUrl);
+        xhr.setRequestHeader('Content-Type', 'application/json');
+        xhr.send(data);
+    };
+
+    /**
+     * Send playback progress heartbeats every `window.playbackProgressInterval` seconds while playing.
+     */
+    var trackPlaybackProgress = function() {
+        player.on('play', function() {
+            clearInterval(playbackProgressInterval);
+            playbackProgressInterval = setInterval(function() {
+                sendPlaybackProgress(false);
+            }, window.playbackProgressInterval * 1000);
+        });
+        player.on(['pause', 'ended', 'seeked'], function() {
+            var paused = player.paused();
+            if (paused) {
+                clearInterval(playbackProgressInterval);
+            }
+            sendPlaybackProgress(paused);
+        });
+        window.addEventListener('pagehide', function() {
+            sendPlaybackProgress(true);
+        });
+    };
+
     setInitialState(playerState);
+    sentPlaybackProgress = flushedPlaybackProgress = player.currentTime();
 
-    player.on('timeupdate', saveProgressToLocalStore);
+    if (window.playbackProgressInterval) {
+        trackPlaybackProgress();
+    } else {
+        player.on('timeupdate', saveProgressToLocalStore);
+    }
     player.on('volumechange', saveState);
     player.on('ratechange', saveState);
     player.on('play', saveState);
@@ -109,6 +199,12 @@ var PlayerState = function(player, playerState) {
     player.on('transcriptstatechanged', saveState);
     player.on('captionstatechanged', saveState);
     player.on('languagechange', saveState);
+    window.addEventListener('pagehide', function() { flushState(true); });
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden') {
+            flushState(true);
+        }
+    });
 };
 
 domReady(function() {
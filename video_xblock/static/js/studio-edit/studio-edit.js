@@ -1,4 +1,4 @@
-/* global createAvailableTranscriptBlock disableOption removeStandardTranscriptBlock getInitialDefaultTranscriptsData
+/* global createAvailableTranscriptBlock showDiscoveredDefaultTranscripts disableOption removeStandardTranscriptBlock getInitialDefaultTranscriptsData
 removeEnabledTranscriptBlock bindUploadListenerAvailableTranscript pushTranscript pushTranscriptsValue
 createEnabledTranscriptBlock createTranscriptBlock parseRelativeTime removeAllEnabledTranscripts tinyMCE baseUrl
 validateTranscripts fillValues validateTranscriptFile removeTranscriptBlock clickUploader
@@ -25,6 +25,7 @@ function StudioEditableXBlock(runtime, element, context) {
     var advancedTabEnabled = context.advancedTabEnabled;
     var SUCCESS = 'success';
     var ERROR = 'error';
+    var JOB_STATUS_POLL_INTERVAL = 1000; // milliseconds
 
     var transcriptsValue = [];
     var disabledLanguages = [];
@@ -105,11 +106,45 @@ function StudioEditableXBlock(runtime, element, context) {
         return ajaxCallDispatch(method, suffix, 'dispatch');
     }
 
+    /**
+     * Wait for a background job to finish.
+     *
+     * Arguments:
+     *  jobState (Object): State of an enqueued job, returned by a handler.
+     * Returns:
+     *  jQuery.Deferred: Resolved with job's result, or rejected with job's state if the job has failed.
+     */
+    function waitForJob(jobState) {
+        var deferred = $.Deferred();
+
+        function checkJobStatus(state) {
+            if (state.status === 'success') {
+                deferred.resolve(state.result);
+            } else if (state.status === 'failure' || state.status === 'unknown') {
+                deferred.reject(state);
+            } else {
+                setTimeout(function() {
+                    $.ajax({
+                        type: 'POST',
+                        url: runtimeHandlers.jobStatus,
+                        data: JSON.stringify({job_id: jobState.job_id}),
+                        dataType: 'json'
+                    }).done(checkJobStatus).fail(deferred.reject);
+                }, JOB_STATUS_POLL_INTERVAL);
+            }
+        }
+
+        checkJobStatus(jobState);
+        return deferred.promise();
+    }
+
     /** Submit Brightcove re-ntranscode for video content protection.
      */
     function submitBCReTranscode(profile) {
         $.when(
             dispatch('POST', 'submit_retranscode_' + profile)
+        ).then(
+            waitForJob
         ).then(function(response) {
             var error = 'error_code' in response;
             var color = error ? 'red' : 'green';
@@ -217,6 +252,7 @@ function StudioEditableXBlock(runtime, element, context) {
             data: JSON.stringify(data),
             dataType: 'json'
         })
+        .then(waitForJob)
         .done(function(response) {
             var downloadUrl, defaultTranscript;
             var newLang = response.lang;
@@ -249,6 +285,8 @@ function StudioEditableXBlock(runtime, element, context) {
             message = tryRefreshPageMessage;
             if (jqXHR.responseText) { // Is there a more specific error message we can show?
                 message += extractErrorMessage(jqXHR.responseText);
+            } else if (jqXHR.error) { // Background job has failed
+                message += jqXHR.error;
             }
             status = ERROR;
         })
@@ -275,6 +313,7 @@ function StudioEditableXBlock(runtime, element, context) {
                 url: downloadUrlApi,
                 source: $fileUploader.data('source-default')
             };
+            currentLanguageCode = langCode;
             uploadDefaultTranscriptsToServer(defaultTranscript);
             // Affect standard transcripts
             createTranscriptBlock(langCode, langLabel, transcriptsValue, runtimeHandlers.downloadTranscript);
@@ -716,6 +755,32 @@ function StudioEditableXBlock(runtime, element, context) {
         event.preventDefault();
     });
 
+    /**
+     * Look up transcripts available on a video platform without holding up rendering of the editor.
+     */
+    function discoverDefaultTranscripts() {
+        $.ajax({
+            type: 'POST',
+            url: runtimeHandlers.discoverDefaultTranscripts,
+            data: JSON.stringify({}),
+            dataType: 'json'
+        })
+        .done(function(response) {
+            showDiscoveredDefaultTranscripts(response, initialDefaultTranscriptsData);
+            response.default_transcripts.forEach(function(transcript) {
+                bindUploadListenerAvailableTranscript(transcript.lang, transcript.label);
+            });
+        })
+        .fail(function() {
+            $('.default-transcripts-discovery').addClass('is-hidden');
+            $('.default-transcripts-empty').toggleClass(
+                'is-hidden', $('.available-default-transcripts-section:not(.is-hidden)').length > 0
+            );
+        });
+    }
+
+    discoverDefaultTranscripts();
+
     $defaultTranscriptsSwitcher.change(function() {
         $enabledLabel.toggleClass('is-hidden', $('.enabled-default-transcripts-section:visible').length);
         $availableLabel.toggleClass('is-hidden', $('.available-default-transcripts-section:visible').length);
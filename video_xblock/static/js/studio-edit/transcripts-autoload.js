@@ -45,6 +45,55 @@ function getInitialDefaultTranscriptsData() {
     return [initialDefaultTranscripts, langCodes];
 }
 
+/**
+ * Replace displayed available transcripts with ones discovered on a video platform.
+ *
+ * Arguments:
+ * response (Object): Default transcripts data returned by `discover_default_transcripts` handler.
+ * initialDefaultTranscriptsData (Array): Default transcripts and their languages' codes, updated in place.
+ *
+ */
+function showDiscoveredDefaultTranscripts(response, initialDefaultTranscriptsData) {
+    'use strict';
+    var initialDefaultTranscripts = initialDefaultTranscriptsData[0];
+    var langCodes = initialDefaultTranscriptsData[1];
+    var availableTranscripts = response.default_transcripts;
+    var $hiddenAvailableTranscriptBlock = $('.available-default-transcripts-section.is-hidden').first();
+
+    // Arrays are updated in place, since listeners refer to them
+    initialDefaultTranscripts.length = 0;
+    langCodes.length = 0;
+    response.initial_default_transcripts.forEach(function(transcript) {
+        initialDefaultTranscripts.push({lang: transcript.lang, label: transcript.label, url: transcript.url});
+        langCodes.push(transcript.lang);
+    });
+
+    $('.available-default-transcripts-section').not($hiddenAvailableTranscriptBlock).remove();
+    $('.api-response.upload-default-transcript').remove();
+    availableTranscripts.forEach(function(transcript) {
+        var $newAvailableTranscriptBlock = $hiddenAvailableTranscriptBlock
+            .clone()
+            .removeClass('is-hidden')
+            .insertBefore($hiddenAvailableTranscriptBlock);
+        $newAvailableTranscriptBlock.find('.default-transcripts-label')
+            .attr('value', transcript.lang)
+            .text(transcript.label);
+        $newAvailableTranscriptBlock.find('.default-transcripts-action-link.upload-default-transcript')
+            .attr({
+                'data-lang-code': transcript.lang,
+                'data-lang-label': transcript.label,
+                'data-source': transcript.source,
+                'data-download-url': transcript.url
+            });
+        $('<div>', {class: 'api-response upload-default-transcript ' + transcript.lang + ' status'})
+            .insertBefore($hiddenAvailableTranscriptBlock);
+    });
+
+    $('.default-transcripts-autoupload-message').text(response.transcripts_autoupload_message);
+    $('.default-transcripts-empty').toggleClass('is-hidden', availableTranscripts.length > 0);
+    $('.default-transcripts-discovery').addClass('is-hidden');
+}
+
 /** Wrapper for getting of a default transcripts array. */
 function getDefaultTranscriptsArray(defaultTranscriptType) {
     'use strict';
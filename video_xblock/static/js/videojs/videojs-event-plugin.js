@@ -13,13 +13,19 @@
     'use strict';
     /**
      * Videojs plugin.
-     * Listens for events and send them to parent frame to be logged in Open edX tracking log
+     * Listens for events and send them to parent frame to be logged in Open edX tracking log.
+     * Events are buffered and sent in batches: when the buffer is full, a while after the first buffered
+     * event, or when the page is hidden or unloaded.
      * @param {Object} options - Plugin options passed in at initialization time.
      */
     function XBlockEventPlugin() {
         var player = this;
         var previousTime = 0;
         var currentTime = 0;
+        var EVENTS_BATCH_SIZE = 10;
+        var EVENTS_FLUSH_DELAY = 5000; // milliseconds
+        var eventsBuffer = [];
+        var flushTimeout = null;
 
         this.events = [
             'onReady',
@@ -129,17 +135,50 @@
          onShowLanguageMenu, onHideLanguageMenu, onShowTranscript, onHideTranscript, onShowCaptions, onHideCaptions
          */
         this.log = function(eventName, data) {
-            var xblockUsageId = getXblockUsageId();
-            var xblockFullUsageId = getXblockFullUsageId();
             data = data || {};  //  eslint-disable-line no-param-reassign
             data.eventType = 'xblock-video.' + eventName;  //  eslint-disable-line no-param-reassign
+            data.timestamp = new Date().toISOString();  //  eslint-disable-line no-param-reassign
+            eventsBuffer.push(data);
+            if (eventsBuffer.length >= EVENTS_BATCH_SIZE) {
+                this.flushEvents();
+            } else if (!flushTimeout) {
+                flushTimeout = setTimeout(this.flushEvents.bind(this), EVENTS_FLUSH_DELAY);
+            }
+        };
+
+        /**
+         * Send buffered events to VideoXBlock.publish_events() handler.
+         * Events are passed to parent frame, or sent directly with `navigator.sendBeacon()`
+         * when the page is going away.
+         * @param {Boolean} useBeacon - Whether the page is being hidden or unloaded.
+         */
+        this.flushEvents = function(useBeacon) {
+            var events = eventsBuffer;
+            clearTimeout(flushTimeout);
+            flushTimeout = null;
+            eventsBuffer = [];
+            if (!events.length) {
+                return;
+            }
+            if (useBeacon === true && navigator.sendBeacon && window.publishEventsUrl &&
+                navigator.sendBeacon(window.publishEventsUrl, JSON.stringify({events: events}))) {
+                return;
+            }
             parent.postMessage({
-                action: 'analytics',
-                info: data,
-                xblockUsageId: xblockUsageId,
-                xblockFullUsageId: xblockFullUsageId,
+                action: 'analyticsBatch',
+                info: {events: events},
+                xblockUsageId: getXblockUsageId(),
+                xblockFullUsageId: getXblockFullUsageId()
             }, document.location.protocol + '//' + document.location.host);
         };
+        window.addEventListener('pagehide', function() {
+            player.flushEvents(true);
+        });
+        document.addEventListener('visibilitychange', function() {
+            if (document.visibilityState === 'hidden') {
+                player.flushEvents(true);
+            }
+        });
         return this;
     }
     window.xblockEventPlugin = XBlockEventPlugin;
@@ -8,6 +8,7 @@ import mock
 from xblock.field_data import DictFieldData
 from xblock.test.tools import TestRuntime
 
+from video_xblock.cache import get_cache_backend
 from video_xblock.video_xblock import VideoXBlock
 
 
@@ -51,13 +52,15 @@ class VideoXBlockTestBase(unittest.TestCase):
         #    'value': [copy.copy(requests.get), ]  # save here original values
         # })
         self.mocked_objects = []
+        # Cached responses of external APIs must not leak between tests.
+        get_cache_backend().clear()
 
     def restore_mocked(self):
         """
         Restore state of mocked entities.
         """
         if self.mocked_objects:
-            for original in self.mocked_objects:
+            for original in reversed(self.mocked_objects):
                 for index, attr in enumerate(original['attrs']):
                     setattr(original['obj'], attr, original['value'][index])
             self.mocked_objects = []
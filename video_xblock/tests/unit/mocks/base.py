@@ -2,13 +2,12 @@
 Base Video Xblock mocks.
 """
 import json
-from copy import deepcopy
 from collections import OrderedDict
 from mock import Mock
-import requests
 
 
 from video_xblock.exceptions import VideoXBlockMockException
+from video_xblock.http_client import HttpClient
 
 
 class ResponseStub:
@@ -131,9 +130,9 @@ class BaseMock(Mock):
         Save state of object before mocks are applied.
         """
         mocked_objects.append({
-            'obj': requests,
+            'obj': HttpClient,
             'attrs': ['get', ],
-            'value': [deepcopy(requests.get), ]
+            'value': [HttpClient.get, ]
         })
         return mocked_objects
 
@@ -153,12 +152,12 @@ class MockCourse(object):
 
 class RequestsMock(BaseMock):
     """
-    Base class for mocking `requests.get`.
+    Base class for mocking `HttpClient.get`.
     """
 
     def get(self):
         """
-        Mock method that substitutes `requests.get` one.
+        Mock method that substitutes `HttpClient.get` one.
         """
         raise NotImplementedError
 
@@ -167,5 +166,5 @@ class RequestsMock(BaseMock):
         Save state of auth related entities before mocks are applied.
         """
         super(RequestsMock, self).apply_mock(mocked_objects)
-        requests.get = self.get()
+        HttpClient.get = staticmethod(self.get())
         return mocked_objects
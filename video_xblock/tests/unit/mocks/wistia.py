@@ -27,7 +27,7 @@ class WistiaAuthMock(RequestsMock):
 
     def get(self):
         """
-        Substitute requests.get method.
+        Substitute HttpClient.get method.
         """
         if self.event == 'not_authorized':
             self.return_value = ResponseStub(status_code=401)
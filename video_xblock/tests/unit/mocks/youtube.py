@@ -136,7 +136,7 @@ Forse me la canto e me la suono da sola un po',
 
     def get(self):
         """
-        Substitute requests.get method.
+        Substitute HttpClient.get method.
         """
         if self.event == 'no_xml_data':
             self.return_value = ResponseStub(status_code=200, body='{}')
@@ -0,0 +1,70 @@
+"""
+Test static assets registry.
+"""
+import unittest
+
+from mock import patch
+
+from video_xblock.assets import StaticAssetRegistry
+from video_xblock.utils import resource_string
+
+
+class StaticAssetRegistryTest(unittest.TestCase):
+    """
+    Test StaticAssetRegistry.
+    """
+
+    def setUp(self):
+        self.registry = StaticAssetRegistry()
+
+    @patch('video_xblock.assets.pkg_resources.resource_string', return_value=b'var a = "\xc3\xa9";')
+    def test_asset_loaded_once(self, resource_string_mock):
+        """
+        Test resource is read from the package on the first access only.
+        """
+        self.assertEqual(self.registry.get_text('static/js/base.js'), u'var a = "\xe9";')
+        self.assertEqual(self.registry.get_text('static/js/base.js'), u'var a = "\xe9";')
+        self.assertEqual(self.registry.get_bytes('static/js/base.js'), b'var a = "\xc3\xa9";')
+
+        resource_string_mock.assert_called_once_with('video_xblock.assets', 'static/js/base.js')
+        self.assertIn('static/js/base.js', self.registry)
+        self.assertDictEqual(
+            self.registry.stats,
+            {'assets': 1, 'hits': 2, 'misses': 1, 'bytes_loaded': 13}
+        )
+
+    @patch('video_xblock.assets.pkg_resources.resource_string', return_value=b'body {}')
+    def test_clear(self, resource_string_mock):
+        """
+        Test registry can be cleared.
+        """
+        self.registry.get_text('static/css/videojs.css')
+        self.registry.clear()
+        self.registry.get_text('static/css/videojs.css')
+
+        self.assertEqual(resource_string_mock.call_count, 2)
+        self.assertDictEqual(
+            self.registry.stats,
+            {'assets': 1, 'hits': 0, 'misses': 1, 'bytes_loaded': 7}
+        )
+
+    @patch('video_xblock.assets.pkg_resources.resource_string', side_effect=[b'var a;', b'var b;'])
+    def test_get_bundle(self, _resource_string_mock):
+        """
+        Test resources are concatenated into a content-hashed bundle.
+        """
+        bundle = self.registry.get_bundle(['static/js/a.js', 'static/js/b.js'], 'js')
+
+        self.assertEqual(bundle.content, b'var a;\n;\nvar b;')
+        self.assertEqual(bundle.content_type, 'application/javascript')
+        self.assertEqual(bundle.extension, 'js')
+        self.assertEqual(len(bundle.digest), 16)
+        self.assertIs(self.registry.get_bundle(['static/js/a.js', 'static/js/b.js'], 'js'), bundle)
+
+    def test_resource_string_uses_registry(self):
+        """
+        Test `resource_string` helper serves real package resources from memory.
+        """
+        content = resource_string('static/html/transcripts.html')
+        self.assertIn('<track', content)
+        self.assertIs(resource_string('static/html/transcripts.html'), content)
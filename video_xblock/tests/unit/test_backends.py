@@ -1,6 +1,7 @@
 """
 Test cases for video_xblock backends.
 """
+import re
 import unittest
 from urllib import parse
 
@@ -16,13 +17,15 @@ from video_xblock.backends import (
     base,
     brightcove,
     html5,
+    registry,
     wistia,
     youtube,
     vimeo,
     tencent,
 )
 from video_xblock import VideoXBlock
-from video_xblock.constants import TranscriptSource
+from video_xblock.cache import LRUCache
+from video_xblock.constants import PlayerName, TranscriptSource
 from video_xblock.exceptions import VideoXBlockException
 from video_xblock.settings import ALL_LANGUAGES
 from video_xblock.tests.unit.base import VideoXBlockTestBase
@@ -114,6 +117,60 @@ class TestCustomBackends(VideoXBlockTestBase):
             res = player(self.xblock).get_player_html(**context)
             self.assertIn('</video>', res.body.decode())
 
+    def test_fragment_skeleton_built_once(self):
+        """
+        Check that static part of player's fragment is built once and reused.
+        """
+        base.BaseVideoPlayer.clear_fragment_skeletons()
+        context = {
+            'player_state': {'transcripts': [], 'currentTime': ''},
+            'url': 'https://example.com/video.mp4',
+            'start_time': '',
+            'end_time': ''
+        }
+        for backend in self.backends:
+            player = self.player[backend](self.xblock)
+            with patch.object(player, 'build_fragment_skeleton', wraps=player.build_fragment_skeleton) as build_mock:
+                first_frag = player.get_frag(**dict(context))
+                second_frag = player.get_frag(**dict(context))
+
+            build_mock.assert_called_once_with(False)
+            self.assertEqual(first_frag.resources, second_frag.resources)
+            self.assertIsNot(first_frag.resources, second_frag.resources)
+            skeleton = player.get_fragment_skeleton(False)
+            self.assertTrue(set(skeleton.fragment.resources).issubset(first_frag.resources))
+        base.BaseVideoPlayer.clear_fragment_skeletons()
+
+    @patch.object(VideoXBlock, 'settings', new_callable=PropertyMock)
+    def test_get_player_html_bundled_assets(self, settings_mock):
+        """
+        Check that player refers to bundles of static files instead of inlining them, if configured so.
+        """
+        settings_mock.return_value = {'bundle_player_assets': True}
+        self.xblock.runtime.handler_url = handler_url_mock = Mock(
+            side_effect=lambda block, handler, suffix: '/handler/{}/{}'.format(handler, suffix)
+        )
+        context = {
+            'player_state': {
+                'transcripts': [],
+                'currentTime': ''
+            },
+            'url': 'https://example.com/video.mp4',
+            'start_time': '',
+            'end_time': ''
+        }
+        for backend in self.backends:
+            player = self.player[backend](self.xblock)
+            html = player.get_player_html(**context).body.decode()
+            bundle_digests = [bundle.digest for bundle in player.get_asset_bundles()]
+            for _block, handler, suffix in (call[0] for call in handler_url_mock.call_args_list):
+                self.assertEqual(handler, 'player_bundle')
+                self.assertIn(suffix.split('.')[0], bundle_digests)
+                self.assertIn('/handler/player_bundle/{}'.format(suffix), html)
+            self.assertNotIn('videojs-transcript', html)
+            self.assertNotIn('Video.js 5.10.8', html)  # vendored video.js isn't inlined
+            handler_url_mock.reset_mock()
+
     expected_basic_fields = [
         ['display_name', 'href'],
         ['display_name', 'href', 'account_id'],
@@ -484,7 +541,7 @@ class VimeoApiClientTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-
         self.vimeo_api_client = vimeo.VimeoApiClient(token='test_token')
         self.vimeo_player = vimeo.VimeoPlayer(self.xblock)
 
-    @patch('video_xblock.backends.vimeo.requests.get')
+    @patch('video_xblock.backends.vimeo.vimeo_http.get')
     def test_api_client_get_200(self, requests_get_mock):
         """
         Test Vimeo's API client GET method if status Ok returned.
@@ -503,7 +560,7 @@ class VimeoApiClientTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-
         })
         self.assertEqual(response, test_body)
 
-    @patch('video_xblock.backends.vimeo.requests.get')
+    @patch('video_xblock.backends.vimeo.vimeo_http.get')
     def test_api_client_get_400(self, requests_get_mock):
         """
         Test Vimeo's API client GET method if status 400 returned.
@@ -661,7 +718,7 @@ class VimeoApiClientTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-
             self.assertEqual(message, failure_message)
 
     @patch('video_xblock.backends.vimeo.remove_escaping')
-    @patch('video_xblock.backends.vimeo.requests.get')
+    @patch('video_xblock.backends.vimeo.vimeo_http.get')
     def test_vimeo_download_default_transcript(self, requests_get_mock, unescape_mock):
         """
         Test Vimeo's default transcripts downloading.
@@ -688,7 +745,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.wistia_player = wistia.WistiaPlayer(self.xblock)
 
     @patch('video_xblock.backends.wistia.babelfish.Language')
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_success(self, requests_get_mock, babel_mock):
         """
         Test Wistia's default transcripts fetching (positive scenario).
@@ -724,7 +781,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             self.assertEqual(transcripts, test_transcripts)
             self.assertEqual(message, test_message)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_api_failure(self, requests_get_mock):
         """
         Test Wistia's default transcripts fetching (request failure).
@@ -746,7 +803,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(transcripts, [])
         self.assertEqual(message, test_message)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_wrong_video(self, requests_get_mock):
         """
         Test Wistia's default transcripts fetching (not found case).
@@ -768,7 +825,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(transcripts, [])
         self.assertEqual(message, test_message)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_bad_request_or_else(self, requests_get_mock):
         """
         Test Wistia's default transcripts fetching (request.ok == False).
@@ -790,7 +847,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(transcripts, [])
         self.assertEqual(message, test_message)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_bad_json(self, requests_get_mock):
         """
         Test Wistia's default transcripts fetching (can't parse response JSON).
@@ -814,7 +871,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(message, test_message)
 
     @patch('video_xblock.backends.wistia.babelfish.Language')
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_get_default_transcripts_baberlfish(self, requests_get_mock, babel_mock):
         """
         Test Wistia's default transcripts fetching (babelfish fallback).
@@ -851,7 +908,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             self.assertEqual(transcripts, test_transcripts)
             self.assertEqual(message, test_message)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_download_default_transcript_success(self, requests_get_mock):
         """
         Test Wistia's default transcripts downloading (positive scenario).
@@ -870,7 +927,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(content, 'test_content')
         requests_get_mock.assert_called_once_with(test_url)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_download_default_transcript_api_failure(self, requests_get_mock):
         """
         Test Wistia's default transcripts downloading (request failure).
@@ -888,7 +945,7 @@ class WistiaPlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(content, u'')
         requests_get_mock.assert_called_once_with(test_url)
 
-    @patch('video_xblock.backends.wistia.requests.get')
+    @patch('video_xblock.backends.wistia.wistia_http.get')
     def test_wistia_download_default_transcript_parsing_failure(self, requests_get_mock):
         """
         Test Wistia's default transcripts downloading (request parsing failure).
@@ -916,8 +973,9 @@ class BrightcovePlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherit
         super(BrightcovePlayerTest, self).setUp()
         self.bc_player = brightcove.BrightcovePlayer(self.xblock)
 
-    @patch('video_xblock.backends.brightcove.requests.get')
-    def test_brightcove_get_default_transcripts_no_text(self, requests_get_mock):
+    @patch('video_xblock.backends.brightcove.brightcove_http.get')
+    @patch.object(brightcove.BrightcoveApiClient, '_refresh_access_token', return_value=('test_token', 300))
+    def test_brightcove_get_default_transcripts_no_text(self, _refresh_token_mock, requests_get_mock):
         """
         Test Brightcove's default transcripts fetching (empty text fetched).
         """
@@ -930,7 +988,7 @@ class BrightcovePlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherit
         }
         test_message = "No timed transcript may be fetched from a video platform."
         test_url = 'https://cms.api.brightcove.com/v1/accounts/test_account_id/videos/test_video_id'
-        test_headers = {'Authorization': 'Bearer None'}
+        test_headers = {'Authorization': 'Bearer test_token'}
         requests_get_mock.return_value = ResponseStub(status_code=200, body='')
 
         # Act
@@ -974,3 +1032,130 @@ class BrightcovePlayerTest(VideoXBlockTestBase):  # pylint: disable=test-inherit
                 player_id=player_id
             )
         )
+
+
+class BrightcoveApiClientTest(unittest.TestCase):
+    """
+    Test Brightcove API client's access tokens handling.
+    """
+
+    def setUp(self):
+        self.cache = LRUCache()
+
+    @patch('video_xblock.backends.brightcove.brightcove_http.post')
+    def test_no_token_requested_on_init(self, post_mock):
+        """
+        Test access token isn't requested until an authorised API call is made.
+        """
+        brightcove.BrightcoveApiClient('client_id', 'client_secret', cache=self.cache)
+
+        post_mock.assert_not_called()
+
+    @patch('video_xblock.backends.brightcove.time.time')
+    @patch.object(brightcove.BrightcoveApiClient, '_refresh_access_token')
+    def test_access_token_shared(self, refresh_token_mock, time_mock):
+        """
+        Test access token is shared between clients via the cache and refreshed ahead of expiry.
+        """
+        refresh_token_mock.return_value = ('test_token', 300)
+        time_mock.return_value = 1000
+
+        first_client = brightcove.BrightcoveApiClient('client_id', 'client_secret', cache=self.cache)
+        second_client = brightcove.BrightcoveApiClient('client_id', 'client_secret', cache=self.cache)
+        self.assertEqual(first_client.access_token, 'test_token')
+        self.assertEqual(second_client.access_token, 'test_token')
+        refresh_token_mock.assert_called_once_with()
+
+        time_mock.return_value = 1000 + 300 - brightcove.BrightcoveApiClient.ACCESS_TOKEN_REFRESH_MARGIN
+        refresh_token_mock.return_value = ('new_token', 300)
+        self.assertEqual(second_client.access_token, 'new_token')
+        self.assertEqual(refresh_token_mock.call_count, 2)
+
+    @patch('video_xblock.backends.brightcove.brightcove_http.get')
+    @patch.object(brightcove.BrightcoveApiClient, '_refresh_access_token')
+    def test_token_refreshed_on_unauthorized(self, refresh_token_mock, get_mock):
+        """
+        Test access token is refreshed and the call is retried if API rejects cached token.
+        """
+        refresh_token_mock.side_effect = [('stale_token', 300), ('new_token', 300)]
+        get_mock.side_effect = [ResponseStub(status_code=401), ResponseStub(status_code=200, body={'id': 1})]
+        client = brightcove.BrightcoveApiClient('client_id', 'client_secret', cache=self.cache)
+
+        self.assertEqual(client.get('https://cms.api.brightcove.com/v1/accounts/1/videos/1'), {'id': 1})
+        self.assertEqual(get_mock.call_args[1]['headers']['Authorization'], 'Bearer new_token')
+        self.assertEqual(self.cache.get(client.token_cache_key)['token'], 'new_token')
+
+    @patch('video_xblock.backends.brightcove.brightcove_http.get')
+    @patch.object(brightcove.BrightcoveApiClient, '_refresh_access_token')
+    def test_no_token_raises(self, refresh_token_mock, get_mock):
+        """
+        Test API isn't called with an empty bearer token if the access token couldn't be refreshed.
+        """
+        refresh_token_mock.return_value = (None, 0)
+        client = brightcove.BrightcoveApiClient('client_id', 'client_secret', cache=self.cache)
+
+        with self.assertRaises(brightcove.BrightcoveApiClientError):
+            client.get('https://cms.api.brightcove.com/v1/accounts/1/videos/1')
+        with self.assertRaises(brightcove.BrightcoveApiClientError):
+            client.post('https://cms.api.brightcove.com/v1/accounts/1/videos/1', {})
+        get_mock.assert_not_called()
+
+
+@ddt
+class PlayerUrlRegistryTest(unittest.TestCase):
+    """
+    Test combined URL dispatch table of video players.
+    """
+
+    @data(
+        ('https://www.youtube.com/watch?v=44zaxzFsthY', 'youtube-player', '44zaxzFsthY'),
+        ('https://youtu.be/44zaxzFsthY', 'youtube-player', '44zaxzFsthY'),
+        ('https://studio.brightcove.com/products/videocloud/media/videos/45263567468485', 'brightcove-player',
+         '45263567468485'),
+        ('https://wi.st/medias/HRrr784kH8932Z', 'wistia-player', 'HRrr784kH8932Z'),
+        ('https://vimeo.com/202889234', 'vimeo-player', '202889234'),
+        ('https://example.com/sample.mp4', 'html5-player', None),
+        ('1234567890', 'tencent-player', None),
+        ('http://wrong.url', 'dummy-player', None),
+    )
+    @unpack
+    def test_match(self, href, expected_player_name, expected_media_id):
+        """
+        Test video player is detected and media ID is extracted in one pass, the same way players do it.
+        """
+        players = base.BaseVideoPlayer.load_classes()
+        expected_player_class = dict(players)[expected_player_name]
+
+        player_match = registry.get_player_url_registry().match(href)
+
+        self.assertEqual(player_match.player_name, expected_player_name)
+        self.assertIs(player_match.player_class, expected_player_class)
+        self.assertEqual(player_match.groups.get('media_id'), expected_media_id)
+        self.assertTrue(expected_player_class.match(href))
+
+    def test_players_order(self):
+        """
+        Test players are tried in the given order, while the dummy player is tried last.
+        """
+        first_player = Mock(url_re=re.compile(r'example\.com/(?P<media_id>\w+)'))
+        second_player = Mock(url_re=[re.compile(r'^https://'), re.compile(r'(?P<media_id>\d+)')])
+        string_player = Mock(url_re=r'EXAMPLE\.org')
+        url_registry = registry.PlayerUrlRegistry([
+            (PlayerName.DUMMY, Mock(url_re=re.compile(''))),
+            ('first', first_player),
+            ('second', second_player),
+            ('string', string_player),
+        ])
+
+        self.assertEqual(url_registry.match('https://example.com/123').player_name, 'first')
+        self.assertEqual(url_registry.match('https://example.com/123').groups, {'media_id': '123'})
+        self.assertEqual(url_registry.match('http://example.net/123').player_name, 'second')
+        self.assertEqual(url_registry.match('http://example.net/123').groups, {'media_id': '123'})
+        self.assertEqual(url_registry.match('http://example.org').player_name, 'string')
+        self.assertEqual(url_registry.match('http://example.net').player_name, PlayerName.DUMMY)
+
+    def test_registry_compiled_once(self):
+        """
+        Test registry is compiled once per process.
+        """
+        self.assertIs(registry.get_player_url_registry(), registry.get_player_url_registry())
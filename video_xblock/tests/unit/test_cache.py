@@ -0,0 +1,166 @@
+"""
+Test caching of external API responses.
+"""
+import unittest
+
+from django.core.exceptions import ImproperlyConfigured
+from mock import Mock, patch
+
+from video_xblock.cache import LRUCache, TTLCache, get_cache_backend, local_cache
+
+
+class LRUCacheTest(unittest.TestCase):
+    """
+    Test in-process LRU cache.
+    """
+
+    def setUp(self):
+        self.cache = LRUCache(max_size=2)
+
+    def test_least_recently_used_evicted(self):
+        """
+        Test least recently used entry is evicted when cache is full.
+        """
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+    @patch('video_xblock.cache.time.time')
+    def test_expiration(self, time_mock):
+        """
+        Test entries expire after timeout.
+        """
+        time_mock.return_value = 100
+        self.cache.set('a', 1, 10)
+        self.assertFalse(self.cache.add('a', 2, 10))
+        self.assertEqual(self.cache.get('a'), 1)
+
+        time_mock.return_value = 110
+        self.assertEqual(self.cache.get('a', 'default'), 'default')
+        self.assertTrue(self.cache.add('a', 2, 10))
+        self.assertEqual(self.cache.get('a'), 2)
+
+    @patch('video_xblock.cache.caches')
+    def test_local_cache_fallback(self, caches_mock):
+        """
+        Test in-process cache is used if Django cache is not configured.
+        """
+        caches_mock.__getitem__.side_effect = ImproperlyConfigured
+        self.assertIs(get_cache_backend('missing'), local_cache)
+
+
+class TTLCacheTest(unittest.TestCase):
+    """
+    Test TTLCache.
+    """
+
+    def setUp(self):
+        self.cache = TTLCache('test', timeout=10, stale_timeout=100, failure_timeout=5, backend=LRUCache())
+        self.fetch = Mock(return_value='value')
+
+    @patch('video_xblock.cache.time.time', return_value=100)
+    def test_fresh_value_cached(self, _time_mock):
+        """
+        Test value is fetched once while it's fresh.
+        """
+        self.assertEqual(self.cache.get_or_fetch(('file', 'transcript', 51), self.fetch), 'value')
+        self.assertEqual(self.cache.get_or_fetch(('file', 'transcript', 51), self.fetch), 'value')
+        self.assertEqual(self.cache.get_or_fetch(('file', 'other', 51), self.fetch), 'value')
+
+        self.assertEqual(self.fetch.call_count, 2)
+
+    @patch('video_xblock.cache.threading.Thread')
+    @patch('video_xblock.cache.time.time')
+    def test_stale_value_revalidated(self, time_mock, thread_mock):
+        """
+        Test stale value is served while it's being refreshed in background.
+        """
+        time_mock.return_value = 100
+        self.cache.get_or_fetch(('file',), self.fetch)
+
+        time_mock.return_value = 115
+        self.fetch.return_value = 'new value'
+        self.assertEqual(self.cache.get_or_fetch(('file',), self.fetch), 'value')
+        self.assertEqual(self.cache.get_or_fetch(('file',), self.fetch), 'value')
+
+        thread_mock.assert_called_once()
+        target, args = thread_mock.call_args[1]['target'], thread_mock.call_args[1]['args']
+        target(*args)
+        self.assertEqual(self.cache.get_or_fetch(('file',), self.fetch), 'new value')
+        self.assertEqual(self.fetch.call_count, 2)
+
+    @patch('video_xblock.cache.threading.Thread')
+    @patch('video_xblock.cache.time.time')
+    def test_stale_value_kept_on_failure(self, time_mock, thread_mock):
+        """
+        Test stale value isn't replaced if revalidation has failed.
+        """
+        time_mock.return_value = 100
+        self.cache.get_or_fetch(('file',), self.fetch)
+
+        time_mock.return_value = 115
+        self.fetch.return_value = None
+        self.cache.get_or_fetch(('file',), self.fetch)
+        thread_mock.call_args[1]['target'](*thread_mock.call_args[1]['args'])
+
+        self.assertEqual(self.cache.get_or_fetch(('file',), self.fetch), 'value')
+
+    @patch('video_xblock.cache.time.time')
+    def test_failure_cached(self, time_mock):
+        """
+        Test failures are cached for `failure_timeout` seconds.
+        """
+        time_mock.return_value = 100
+        self.fetch.return_value = None
+        self.assertIsNone(self.cache.get_or_fetch(('file',), self.fetch))
+        self.assertIsNone(self.cache.get_or_fetch(('file',), self.fetch))
+        self.assertEqual(self.fetch.call_count, 1)
+
+        time_mock.return_value = 105
+        self.fetch.return_value = 'value'
+        self.assertEqual(self.cache.get_or_fetch(('file',), self.fetch), 'value')
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_make_key(self):
+        """
+        Test cache key doesn't expose key parts.
+        """
+        key = self.cache.make_key('file id', 'secret api key')
+
+        self.assertTrue(key.startswith('video_xblock:test:'))
+        self.assertNotIn('secret', key)
+        self.assertNotIn(' ', key)
+
+    def test_fetch_locks_released(self):
+        """
+        Test fetch locks are created per key and dropped once fetches are done.
+        """
+        for index in range(10):
+            self.cache.get_or_fetch(('file', index), self.fetch)
+
+        self.assertEqual(TTLCache._fetch_locks, {})  # pylint: disable=protected-access
+
+    @patch('video_xblock.cache.FETCH_LOCK_TIMEOUT', 0.01)
+    def test_fetch_lock_timeout(self):
+        """
+        Test a fetch doesn't wait for a slow fetch of the same key forever, e.g. when it's nested.
+        """
+        nested_values = []
+
+        def fetch():
+            """
+            Fetch the same key again while the fetch lock is held.
+            """
+            nested_values.append(self.cache.get_or_fetch(('file', 'nested'), lambda: 'nested value'))
+            return 'value'
+
+        value = self.cache.get_or_fetch(('file', 'nested'), fetch)
+
+        self.assertEqual(value, 'value')
+        self.assertEqual(nested_values, ['nested value'])
+        self.assertEqual(TTLCache._fetch_locks, {})  # pylint: disable=protected-access
@@ -0,0 +1,300 @@
+"""
+Test streaming captions parsing and conversion.
+"""
+import io
+import unittest
+
+from ddt import data, ddt, unpack
+from pycaption import SRTReader, WebVTTReader
+
+from video_xblock.captions import (
+    CaptionsFormat,
+    Cue,
+    CueIndex,
+    CueList,
+    format_timestamp,
+    iter_cues,
+    iter_lines,
+    iter_vtt,
+    parse_cues,
+    parse_timestamp,
+    sniff_format,
+    vtt_text_to_plain,
+)
+from video_xblock.exceptions import CaptionsFormatError
+from video_xblock.mixins import TranscriptsMixin
+
+SRT_CAPTIONS = (
+    '1\r\n'
+    '00:00:01,000 --> 00:00:02,500\r\n'
+    'Hello,\r\n'
+    'world!\r\n'
+    '\r\n'
+    '2\r\n'
+    '01:02:03,004 --> 01:02:05,000\r\n'
+    'Привіт\r\n'
+)
+
+VTT_CAPTIONS = (
+    'WEBVTT - lecture\n'
+    '\n'
+    'NOTE a comment\n'
+    'spanning lines\n'
+    '\n'
+    'intro\n'
+    '00:01.000 --> 00:02.500 align:start\n'
+    'Hello,\n'
+    'world!\n'
+)
+
+# SRT captions and expected WebVTT text of their cues.
+CONFORMANCE_SRT_CAPTIONS = [
+    (SRT_CAPTIONS, ['Hello,\nworld!', 'Привіт']),
+    # No trailing newline, styling tags, extra blank lines between cues
+    (
+        '1\n00:00:00,000 --> 00:00:01,001\n<i>Italic</i> and <b>bold</b>\n\n\n'
+        '2\n00:00:01,001 --> 00:00:05,000\n- Who?\n- Me.',
+        ['<i>Italic</i> and <b>bold</b>', '- Who?\n- Me.'],
+    ),
+    # Byte order mark, hours above 9
+    ('\ufeff1\n10:00:00,100 --> 10:00:00,900\nLate\n', ['Late']),
+    # Characters to be escaped
+    (
+        '1\n00:00:00,000 --> 00:00:01,000\nTom & Jerry: if x < y then y > x\n',
+        ['Tom &amp; Jerry: if x &lt; y then y &gt; x'],
+    ),
+    # Tags WebVTT doesn't have, SRT has no character references
+    (
+        '1\n00:00:00,000 --> 00:00:01,000\n<font color="#ff0000">Red</font> &amp; <U>blue</U>\n',
+        ['Red &amp;amp; <u>blue</u>'],
+    ),
+]
+CONFORMANCE_VTT_CAPTIONS = [
+    VTT_CAPTIONS,
+    'WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nA &amp; B\n\n1\n00:00:01.000 --> 00:00:02.000 line:0\nC\n',
+    'WEBVTT\n\n01:00:00.000 --> 01:00:01.500\n<b>Hi</b>\n',
+]
+
+
+class CaptionsParsingTest(unittest.TestCase):
+    """
+    Test captions are parsed one cue at a time.
+    """
+
+    def test_iter_lines_from_chunks(self):
+        """
+        Test lines are decoded from chunks split in the middle of lines and multibyte characters.
+        """
+        data = '﻿перший\r\nдругий\nthird'.encode('utf-8')
+        chunks = [data[index:index + 3] for index in range(0, len(data), 3)]
+
+        self.assertEqual(list(iter_lines(chunks)), ['перший', 'другий', 'third'])
+        self.assertEqual(list(iter_lines(io.BytesIO(data))), ['перший', 'другий', 'third'])
+        self.assertEqual(list(iter_lines(data.decode('utf-8'))), ['перший', 'другий', 'third'])
+
+    def test_timestamps(self):
+        self.assertEqual(parse_timestamp('01:02:03,004'), 3723004)
+        self.assertEqual(parse_timestamp('02:03.4'), 123400)
+        self.assertEqual(format_timestamp(3723004), '01:02:03.004')
+        with self.assertRaises(CaptionsFormatError):
+            parse_timestamp('1:02')
+
+    def test_sniff_format(self):
+        """
+        Test SRT and WebVTT captions are detected by their first lines, and lines are kept intact.
+        """
+        for caps, expected_format in (
+                (SRT_CAPTIONS, CaptionsFormat.SRT),
+                (VTT_CAPTIONS, CaptionsFormat.WEBVTT),
+                ('<tt xmlns="http://www.w3.org/ns/ttml"></tt>', None),
+                ('', None),
+        ):
+            captions_format, lines = sniff_format(iter_lines(caps))
+            self.assertEqual(captions_format, expected_format)
+            self.assertEqual(list(lines), list(iter_lines(caps)))
+
+    def test_iter_cues(self):
+        self.assertEqual(list(iter_cues(iter_lines(SRT_CAPTIONS))), [
+            Cue(1000, 2500, 'Hello,\nworld!'),
+            Cue(3723004, 3725000, 'Привіт'),
+        ])
+        self.assertEqual(list(iter_cues(iter_lines(VTT_CAPTIONS))), [Cue(1000, 2500, 'Hello,\nworld!')])
+
+    def test_iter_cues_malformed(self):
+        with self.assertRaises(CaptionsFormatError):
+            list(iter_cues(iter_lines('1\n00:00:01 --> 00:00:02,000\nHello\n')))
+
+    def test_iter_vtt(self):
+        self.assertEqual(
+            ''.join(iter_vtt([Cue(1000, 2500, 'Hello')])),
+            'WEBVTT\n\n00:00:01.000 --> 00:00:02.500\nHello\n\n'
+        )
+
+
+class CaptionsConversionTest(unittest.TestCase):
+    """
+    Test captions conversion of `TranscriptsMixin`.
+    """
+
+    def test_srt_to_vtt_streamed(self):
+        """
+        Test SRT captions are converted from a file object piece by piece.
+        """
+        chunks = list(TranscriptsMixin.iter_caps_to_vtt(io.BytesIO(SRT_CAPTIONS.encode('utf-8'))))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(''.join(chunks), (
+            'WEBVTT\n\n'
+            '00:00:01.000 --> 00:00:02.500\nHello,\nworld!\n\n'
+            '01:02:03.004 --> 01:02:05.000\nПривіт\n\n'
+        ))
+
+    def test_srt_text_escaped(self):
+        """
+        Test special characters of SRT cues are escaped, and only tags allowed by WebVTT are kept.
+        """
+        srt = (
+            '1\n00:00:00,000 --> 00:00:01,000\nTom & Jerry: if x < y then y > x\n\n'
+            '2\n00:00:01,000 --> 00:00:02,000\n<font color="#ff0000">Red</font> and <I>italic</I>\n'
+        )
+
+        self.assertEqual(TranscriptsMixin.convert_caps_to_vtt(srt), (
+            'WEBVTT\n\n'
+            '00:00:00.000 --> 00:00:01.000\nTom &amp; Jerry: if x &lt; y then y &gt; x\n\n'
+            '00:00:01.000 --> 00:00:02.000\nRed and <i>italic</i>\n\n'
+        ))
+        self.assertEqual(
+            TranscriptsMixin.build_cue_index(srt).get_plain_text(), 'Tom & Jerry: if x < y then y > x Red and italic'
+        )
+
+    def test_other_formats_converted_by_pycaption(self):
+        dfxp = (
+            '<tt xmlns="http://www.w3.org/ns/ttml" xml:lang="en"><body><div>'
+            '<p begin="00:00:01.000" end="00:00:02.000">Hello</p>'
+            '</div></body></tt>'
+        )
+
+        vtt = TranscriptsMixin.convert_caps_to_vtt(dfxp)
+
+        self.assertTrue(vtt.startswith('WEBVTT'))
+        self.assertIn('Hello', vtt)
+
+    def test_vtt_to_text(self):
+        """
+        Test text is extracted from WebVTT captions read in chunks.
+        """
+        vtt = '00:01.000 --> 00:02.500\nHello,\nworld!\n\n00:03.000 --> 00:04.000\nBye!\n'.encode('utf-8')
+
+        self.assertEqual(TranscriptsMixin.vtt_to_text([vtt[:30], vtt[30:]]), 'Hello, world! Bye!')
+
+
+@ddt
+class CaptionsConformanceTest(unittest.TestCase):
+    """
+    Test native SRT/WebVTT parsing matches pycaption.
+    """
+
+    @staticmethod
+    def read_timings_with_pycaption(reader, caps):
+        """
+        Return (start, end) of cues read by pycaption, in milliseconds.
+        """
+        caption_set = reader().read(caps)
+        captions = caption_set.get_captions(caption_set.get_languages()[0])
+        return [(caption.start // 1000, caption.end // 1000) for caption in captions]
+
+    @data(*CONFORMANCE_SRT_CAPTIONS)
+    @unpack
+    def test_srt(self, caps, expected_texts):
+        """
+        Test SRT cues are timed as pycaption reads them, and their text is converted to valid WebVTT cue text.
+        """
+        # pycaption doesn't skip byte order mark.
+        expected_timings = self.read_timings_with_pycaption(SRTReader, caps.lstrip('\ufeff'))
+        vtt = TranscriptsMixin.convert_caps_to_vtt(caps)
+
+        self.assertEqual([(cue.start, cue.end) for cue in parse_cues(caps)], expected_timings)
+        self.assertEqual([cue.text for cue in parse_cues(caps)], expected_texts)
+        self.assertEqual([cue.text for cue in parse_cues(vtt)], expected_texts)
+        # Converted captions are read back the same way.
+        self.assertEqual(self.read_timings_with_pycaption(WebVTTReader, vtt), expected_timings)
+
+    @data(*CONFORMANCE_VTT_CAPTIONS)
+    def test_vtt(self, caps):
+        """
+        Test WebVTT cues are read as pycaption reads them.
+        """
+        caption_set = WebVTTReader().read(caps)
+        captions = caption_set.get_captions(caption_set.get_languages()[0])
+
+        self.assertEqual(
+            [(cue.start, cue.end, vtt_text_to_plain(cue.text)) for cue in parse_cues(caps)],
+            [(caption.start // 1000, caption.end // 1000, caption.get_text()) for caption in captions]
+        )
+
+    @data(*CONFORMANCE_VTT_CAPTIONS)
+    def test_vtt_passed_through(self, caps):
+        self.assertEqual(TranscriptsMixin.convert_caps_to_vtt(caps), caps if caps.endswith('\n') else caps + '\n')
+
+    def test_vtt_malformed(self):
+        with self.assertRaises(CaptionsFormatError):
+            TranscriptsMixin.convert_caps_to_vtt('WEBVTT\n\n00:00.000 --> later\nText\n')
+
+
+class CueListTest(unittest.TestCase):
+    """
+    Test compact list of cues.
+    """
+
+    def test_cue_list(self):
+        cues = [Cue(0, 1000, 'First'), Cue(1000, 2500, ''), Cue(2500, 3000, 'Third\nline')]
+
+        cue_list = CueList(cues)
+
+        self.assertEqual(len(cue_list), 3)
+        self.assertEqual(list(cue_list), cues)
+        self.assertEqual(cue_list[-1], cues[-1])
+        self.assertEqual(list(cue_list.starts), [0, 1000, 2500])
+        with self.assertRaises(IndexError):
+            cue_list[3]  # pylint: disable=pointless-statement
+
+    def test_parse_cues_unsupported_format(self):
+        self.assertIsNone(parse_cues('<tt xmlns="http://www.w3.org/ns/ttml"></tt>'))
+
+
+class CueIndexTest(unittest.TestCase):
+    """
+    Test cue index.
+    """
+
+    def setUp(self):
+        self.cue_index = CueIndex([
+            Cue(5000, 8000, 'Third'),
+            Cue(0, 2000, 'First\nline'),
+            Cue(2000, 6000, 'Second'),
+            Cue(10000, 12000, 'Fourth'),
+        ])
+
+    def test_cues_ordered(self):
+        self.assertEqual(list(self.cue_index.starts), [0, 2000, 5000, 10000])
+        self.assertEqual(self.cue_index.get_plain_text(), 'First line Second Third Fourth')
+
+    def test_cue_at(self):
+        self.assertEqual(self.cue_index.cue_at(0), Cue(0, 2000, 'First\nline'))
+        self.assertEqual(self.cue_index.cue_at(2000), Cue(2000, 6000, 'Second'))
+        self.assertEqual(self.cue_index.cue_at(5500), Cue(5000, 8000, 'Third'))
+        self.assertIsNone(self.cue_index.cue_at(9000))
+        self.assertIsNone(self.cue_index.cue_at(20000))
+
+    def test_slice(self):
+        self.assertEqual([cue.text for cue in self.cue_index.slice(5500, 10000)], ['Second', 'Third'])
+        self.assertEqual([cue.text for cue in self.cue_index.slice(9000)], ['Fourth'])
+        self.assertEqual(len(self.cue_index.slice(13000)), 0)
+        self.assertEqual(list(self.cue_index.slice()), list(self.cue_index))
+
+    def test_serialization(self):
+        for cue_index in (self.cue_index, CueIndex(), self.cue_index.slice(1000, 5000)):
+            restored = CueIndex.from_bytes(cue_index.to_bytes())
+            self.assertEqual(list(restored), list(cue_index))
+        with self.assertRaises(ValueError):
+            CueIndex.from_bytes(b'not an index')
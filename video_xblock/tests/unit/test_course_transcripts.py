@@ -0,0 +1,364 @@
+"""
+Test course-wide transcripts import/export.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+from mock import Mock
+
+from video_xblock.constants import PlayerName, TranscriptSource
+from video_xblock.course_transcripts import (
+    BulkReport,
+    ProgressCheckpoint,
+    export_course_transcripts,
+    import_course_default_transcripts,
+    iter_batches,
+    migrate_course_transcripts_to_vtt,
+)
+from video_xblock.exceptions import ApiClientError
+
+
+def make_block(block_id, player_name=PlayerName.WISTIA, transcripts=None, default_transcripts=None):
+    """
+    Create mocked video xblock with a mocked player.
+    """
+    player = Mock()
+    player.media_id.return_value = 'video-' + block_id
+    player.get_default_transcripts.return_value = (default_transcripts or [], '')
+    player.clean_default_transcripts.side_effect = lambda transcripts: transcripts
+    player.filter_default_transcripts.side_effect = lambda default, enabled: [
+        transcript for transcript in default
+        if transcript['lang'] not in [enabled_transcript['lang'] for enabled_transcript in enabled]
+    ]
+
+    block = Mock(
+        player_name=player_name,
+        href='https://example.com/' + block_id,
+        metadata={},
+        account_id='account_id',
+        fields={'account_id': Mock(default='account_id')},
+        display_name='Video ' + block_id,
+        transcripts=json.dumps(transcripts or []),
+    )
+    block.location.__str__ = Mock(return_value='block-v1:Org+Course+Run+type@video_xblock+block@' + block_id)
+    block.location.block_id = block_id
+    block.get_player.return_value = player
+    block.get_enabled_managed_transcripts.side_effect = lambda: json.loads(block.transcripts)
+    block.fetch_default_transcript.side_effect = lambda player, video_id, data: (
+        'reference-' + data['lang'], 'WEBVTT\n\n'
+    )
+    block.create_transcript_file.side_effect = lambda trans_str, reference_name: (
+        reference_name + '.vtt', '/asset/' + reference_name + '.vtt'
+    )
+    return block
+
+
+class CourseTranscriptsTestBase(unittest.TestCase):
+    """
+    Base class for course-wide transcripts tests.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+class ImportCourseDefaultTranscriptsTest(CourseTranscriptsTestBase):
+    """
+    Test import of default transcripts of a course.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.en_transcript = {'lang': 'en', 'label': 'English', 'url': 'http://example.com/en'}
+        self.uk_transcript = {'lang': 'uk', 'label': 'Ukrainian', 'url': 'http://example.com/uk'}
+        self.blocks = [
+            make_block('one', default_transcripts=[self.en_transcript, self.uk_transcript]),
+            make_block(
+                'two', default_transcripts=[self.en_transcript],
+                transcripts=[{'lang': 'en', 'label': 'English', 'url': '/asset/en.vtt', 'source': 'manual'}],
+            ),
+            make_block('three', player_name=PlayerName.DUMMY),
+        ]
+        self.store.get_items.return_value = self.blocks
+
+    def test_import(self):
+        """
+        Test missing default transcripts are saved and enabled.
+        """
+        report = import_course_default_transcripts('course-key', 3, store=self.store, batch_size=1)
+
+        self.store.get_items.assert_called_once_with('course-key', qualifiers={'category': 'video_xblock'})
+        self.assertEqual(report.as_dict(), {
+            'blocks_total': 3,
+            'blocks_processed': 2,
+            'blocks_skipped': 0,
+            'transcripts_processed': 2,
+            'failures': [],
+        })
+        self.assertEqual(json.loads(self.blocks[0].transcripts), [
+            {'lang': 'en', 'label': 'English', 'url': '/asset/reference-en.vtt', 'source': TranscriptSource.DEFAULT},
+            {'lang': 'uk', 'label': 'Ukrainian', 'url': '/asset/reference-uk.vtt', 'source': TranscriptSource.DEFAULT},
+        ])
+        self.store.update_item.assert_called_once_with(self.blocks[0], 3)
+        self.blocks[1].fetch_default_transcript.assert_not_called()
+        self.blocks[2].get_player.assert_not_called()
+
+    def test_import_failures_reported(self):
+        """
+        Test failed listings and downloads don't stop the import.
+        """
+        self.blocks[0].get_player.return_value.get_default_transcripts.side_effect = ApiClientError('Boom')
+        self.blocks[1].transcripts = '[]'
+        self.blocks[1].fetch_default_transcript.side_effect = lambda player, video_id, data: ('reference', '')
+
+        report = import_course_default_transcripts('course-key', 3, store=self.store)
+
+        self.assertEqual(report.transcripts_processed, 0)
+        self.assertEqual(len(report.failures), 2)
+        self.store.update_item.assert_not_called()
+
+    def test_import_download_errors_reported(self):
+        """
+        Test exceptions raised by downloads are reported, and blocks with failures aren't checkpointed.
+        """
+        def fetch_default_transcript(_player, _video_id, data):
+            """
+            Fail to download Ukrainian transcript.
+            """
+            if data['lang'] == 'uk':
+                raise requests.ConnectionError('Connection reset')
+            return 'reference-' + data['lang'], 'WEBVTT\n\n'
+
+        self.blocks[0].fetch_default_transcript.side_effect = fetch_default_transcript
+        self.blocks[1].transcripts = '[]'
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = import_course_default_transcripts('course-key', 3, store=self.store, checkpoint=checkpoint)
+
+        self.assertEqual(report.transcripts_processed, 2)
+        self.assertEqual(
+            report.failures, [(str(self.blocks[0].location), "Couldn't download uk transcript: Connection reset")]
+        )
+        self.assertEqual(
+            ProgressCheckpoint(checkpoint.path).done, {str(self.blocks[1].location), str(self.blocks[2].location)}
+        )
+
+    def test_import_save_errors_reported(self):
+        """
+        Test failed modulestore writes are reported, and blocks which weren't saved aren't checkpointed.
+        """
+        def update_item(block, _user_id):
+            """
+            Fail to save the first block.
+            """
+            if block is self.blocks[0]:
+                raise IOError('Write failed')
+
+        self.blocks[1].transcripts = '[]'
+        self.store.update_item.side_effect = update_item
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = import_course_default_transcripts('course-key', 3, store=self.store, checkpoint=checkpoint)
+
+        self.assertEqual(
+            report.failures,
+            [(str(self.blocks[0].location), "Couldn't save imported transcripts: Write failed")]
+        )
+        self.assertEqual(self.store.update_item.call_count, 2)
+        self.assertEqual(
+            ProgressCheckpoint(checkpoint.path).done, {str(self.blocks[1].location), str(self.blocks[2].location)}
+        )
+
+    def test_import_resumed_from_checkpoint(self):
+        """
+        Test blocks processed by a previous run are skipped, and progress is saved.
+        """
+        checkpoint_path = os.path.join(self.tmp_dir, 'checkpoint.json')
+        checkpoint = ProgressCheckpoint(checkpoint_path)
+        checkpoint.add([str(self.blocks[0].location)])
+
+        report = import_course_default_transcripts('course-key', 3, store=self.store, checkpoint=checkpoint)
+
+        self.assertEqual(report.blocks_skipped, 1)
+        self.blocks[0].get_player.assert_not_called()
+        self.assertEqual(ProgressCheckpoint(checkpoint_path).done, {str(block.location) for block in self.blocks})
+
+    def test_import_dry_run(self):
+        """
+        Test dry run doesn't download or save anything.
+        """
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = import_course_default_transcripts(
+            'course-key', 3, store=self.store, checkpoint=checkpoint, dry_run=True
+        )
+
+        self.assertEqual(report.transcripts_processed, 2)
+        self.blocks[0].fetch_default_transcript.assert_not_called()
+        self.store.update_item.assert_not_called()
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+
+class ExportCourseTranscriptsTest(CourseTranscriptsTestBase):
+    """
+    Test export of transcripts of a course.
+    """
+
+    def test_export(self):
+        """
+        Test transcripts are written to files, and described in manifest.
+        """
+        transcript = {'lang': 'en', 'label': 'English', 'url': '/asset/en.vtt', 'source': 'manual'}
+        block = make_block('one', transcripts=[transcript])
+        block.get_file_name_from_path.return_value = 'en.vtt'
+        block.contentstore.return_value.find.return_value = Mock(data='WEBVTT\n\n')
+        self.store.get_items.return_value = [block]
+
+        report = export_course_transcripts('course-key', self.tmp_dir, store=self.store)
+
+        self.assertEqual(report.transcripts_processed, 1)
+        with open(os.path.join(self.tmp_dir, 'one', 'en.vtt')) as transcript_file:
+            self.assertEqual(transcript_file.read(), 'WEBVTT\n\n')
+        with open(os.path.join(self.tmp_dir, 'manifest.json')) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest[str(block.location)]['transcripts'], [dict(transcript, file='one/en.vtt')])
+
+
+class HelpersTest(unittest.TestCase):
+    """
+    Test helpers of course-wide operations.
+    """
+
+    def test_iter_batches(self):
+        self.assertEqual(list(iter_batches([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+
+    def test_report_summary(self):
+        report = BulkReport()
+        report.blocks_total = 1
+        report.add_failure('block', 'Boom')
+        self.assertIn('block: Boom', report.summary())
+
+
+class MigrateCourseTranscriptsToVttTest(CourseTranscriptsTestBase):
+    """
+    Test migration of transcripts of a course to WebVTT.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.srt_transcript = {
+            'lang': 'en', 'label': 'English', 'url': '/asset-v1:Org+Course+Run+type@asset+block@en.srt',
+            'source': 'manual',
+        }
+        self.vtt_transcript = {
+            'lang': 'uk', 'label': 'Ukrainian', 'url': '/asset-v1:Org+Course+Run+type@asset+block@uk.vtt',
+            'source': 'manual',
+        }
+        self.blocks = [
+            make_block('one', transcripts=[self.srt_transcript, self.vtt_transcript]),
+            make_block('two', transcripts=[self.vtt_transcript]),
+        ]
+        for block in self.blocks:
+            block.get_file_name_from_path.side_effect = lambda url: url.split('@')[-1]
+            block.contentstore.return_value.find.side_effect = self.find_asset
+        self.store.get_items.return_value = self.blocks
+        self.existing_vtt_asset = None
+
+    def find_asset(self, _location, throw_on_not_found=True):
+        """
+        Return original transcript asset; converted asset is looked up with `throw_on_not_found=False`.
+        """
+        if not throw_on_not_found:
+            return self.existing_vtt_asset
+        return Mock(data=b'1\n00:00:01,000 --> 00:00:02,000\nHello\n')
+
+    def test_migrate(self):
+        """
+        Test non-WebVTT transcripts are converted, saved, and blocks point to converted assets.
+        """
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = migrate_course_transcripts_to_vtt(
+            'course-key', 3, store=self.store, max_workers=1, checkpoint=checkpoint
+        )
+
+        self.assertEqual(report.transcripts_processed, 1)
+        self.assertEqual(report.failures, [])
+        trans_str = self.blocks[0].create_transcript_file.call_args[1]['trans_str']
+        self.assertTrue(trans_str.startswith('WEBVTT'))
+        self.assertIn('00:00:01.000 --> 00:00:02.000', trans_str)
+        self.assertEqual(
+            [transcript['url'] for transcript in json.loads(self.blocks[0].transcripts)],
+            ['/asset/en.vtt', self.vtt_transcript['url']]
+        )
+        self.store.update_item.assert_called_once_with(self.blocks[0], 3)
+        self.assertEqual(ProgressCheckpoint(checkpoint.path).done, {str(block.location) for block in self.blocks})
+
+    def test_migrate_unknown_format_reported(self):
+        """
+        Test transcripts of unsupported format are reported and left as they are.
+        """
+        self.blocks[0].contentstore.return_value.find.side_effect = None
+        self.blocks[0].contentstore.return_value.find.return_value = Mock(data=b'Not a transcript')
+
+        report = migrate_course_transcripts_to_vtt('course-key', 3, store=self.store, max_workers=1)
+
+        self.assertEqual(len(report.failures), 1)
+        self.store.update_item.assert_not_called()
+
+    def test_migrate_name_collision_reported(self):
+        """
+        Test a different asset having the name of a converted transcript isn't overwritten.
+        """
+        self.existing_vtt_asset = Mock(data=b'WEBVTT\n\n00:00:05.000 --> 00:00:06.000\nOther\n')
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = migrate_course_transcripts_to_vtt(
+            'course-key', 3, store=self.store, max_workers=1, checkpoint=checkpoint
+        )
+
+        self.assertEqual(len(report.failures), 1)
+        self.assertIn('en.vtt asset already exists', report.failures[0][1])
+        self.blocks[0].create_transcript_file.assert_not_called()
+        self.store.update_item.assert_not_called()
+        self.assertEqual(ProgressCheckpoint(checkpoint.path).done, {str(self.blocks[1].location)})
+
+    def test_migrate_save_errors_reported(self):
+        """
+        Test failed contentstore and modulestore writes are reported, and such blocks aren't checkpointed.
+        """
+        self.blocks[1].transcripts = json.dumps([dict(self.srt_transcript, lang='uk')])
+        self.blocks[0].create_transcript_file.side_effect = IOError('Asset write failed')
+        self.store.update_item.side_effect = IOError('Block write failed')
+        checkpoint = ProgressCheckpoint(os.path.join(self.tmp_dir, 'checkpoint.json'))
+
+        report = migrate_course_transcripts_to_vtt(
+            'course-key', 3, store=self.store, max_workers=1, checkpoint=checkpoint
+        )
+
+        self.assertEqual(report.failures, [
+            (str(self.blocks[0].location), "Couldn't save {} transcript: Asset write failed".format(
+                self.srt_transcript['url']
+            )),
+            (str(self.blocks[1].location), "Couldn't save converted transcripts: Block write failed"),
+        ])
+        self.store.update_item.assert_called_once_with(self.blocks[1], 3)
+        self.assertEqual(ProgressCheckpoint(checkpoint.path).done, set())
+
+    def test_migrate_dry_run(self):
+        """
+        Test dry run doesn't read or save anything.
+        """
+        report = migrate_course_transcripts_to_vtt('course-key', 3, store=self.store, max_workers=1, dry_run=True)
+
+        self.assertEqual(report.transcripts_processed, 1)
+        self.blocks[0].contentstore.assert_not_called()
+        self.store.update_item.assert_not_called()
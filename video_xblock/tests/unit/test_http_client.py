@@ -0,0 +1,68 @@
+"""
+Test shared HTTP client.
+"""
+import unittest
+
+from mock import patch
+
+from video_xblock.http_client import DEFAULT_HTTP_CONFIG, HttpClient, get_http_client
+
+
+class HttpClientTest(unittest.TestCase):
+    """
+    Test HttpClient.
+    """
+
+    def setUp(self):
+        self.client = HttpClient('test')
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_session_per_host(self):
+        """
+        Test pooled session is created once per remote host.
+        """
+        session = self.client.get_session('https://api.brightcove.com/v1/accounts')
+
+        self.assertIs(self.client.get_session('https://api.brightcove.com/v2/videos?q=1'), session)
+        self.assertIsNot(self.client.get_session('https://cms.api.brightcove.com/v1/'), session)
+        self.assertIsNot(self.client.get_session('http://api.brightcove.com/v1/accounts'), session)
+
+    @patch('video_xblock.http_client.requests.Session.request')
+    def test_default_timeout(self, request_mock):
+        """
+        Test default timeout is applied unless given explicitly.
+        """
+        self.client.get('https://api.vimeo.com/videos/1', headers={'Accept': 'json'})
+        self.client.post('https://api.vimeo.com/videos/1', data={'a': 1}, timeout=5)
+
+        request_mock.assert_any_call(
+            'GET', 'https://api.vimeo.com/videos/1', params=None, headers={'Accept': 'json'},
+            timeout=DEFAULT_HTTP_CONFIG['timeout']
+        )
+        request_mock.assert_any_call('POST', 'https://api.vimeo.com/videos/1', data={'a': 1}, json=None, timeout=5)
+
+    @patch('video_xblock.http_client.import_from')
+    def test_config(self, import_from_mock):
+        """
+        Test client's configuration is overridden by global and client specific settings.
+        """
+        import_from_mock.return_value.XBLOCK_SETTINGS = {
+            'video_xblock': {'http': {'retries': 5, 'test': {'timeout': [1, 2]}, 'other': {'retries': 0}}}
+        }
+
+        config = self.client.config
+
+        self.assertEqual(config['retries'], 5)
+        self.assertEqual(config['timeout'], (1, 2))
+        self.assertEqual(config['max_connections'], DEFAULT_HTTP_CONFIG['max_connections'])
+        adapter = self.client.get_session('https://example.com').get_adapter('https://example.com')
+        self.assertEqual(adapter.max_retries.total, 5)
+
+    def test_get_http_client(self):
+        """
+        Test named clients are shared process-wide.
+        """
+        self.assertIs(get_http_client('wistia'), get_http_client('wistia'))
+        self.assertIsNot(get_http_client('wistia'), get_http_client())
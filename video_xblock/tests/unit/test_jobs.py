@@ -0,0 +1,167 @@
+"""
+Test background jobs.
+"""
+import json
+
+from mock import Mock, PropertyMock, patch
+
+from video_xblock import VideoXBlock
+from video_xblock.backends.brightcove import BrightcovePlayer
+from video_xblock.jobs import (
+    JobStatus,
+    MAX_PERSISTED_JOBS,
+    ThreadJobRunner,
+    execute_job,
+    get_job_runner,
+    get_job_state,
+    persist_job_state,
+    set_job_state,
+)
+from video_xblock.tests.unit.base import VideoXBlockTestBase, arrange_request_mock
+
+
+class JobsTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
+    """
+    Test running of jobs and reporting their state.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.xblock.scope_ids = Mock(usage_id='usage-id', user_id=3)
+
+    @patch('video_xblock.jobs.save_block')
+    @patch.object(VideoXBlock, 'get_player')
+    def test_execute_job(self, player_mock, save_block_mock):
+        """
+        Test job's result is recorded in the cache and in block's metadata, and the block is saved.
+        """
+        player_mock.return_value.dispatch.return_value = {'id': 'retranscode-job'}
+
+        state = execute_job(
+            'job-id', 'dispatch_job', 'usage-id', 3, {'suffix': 'ensure_ingest_profiles'}, self.xblock
+        )
+
+        self.assertEqual(state['status'], JobStatus.SUCCESS)
+        self.assertEqual(state['usage_id'], 'usage-id')
+        self.assertEqual(state['result'], {'id': 'retranscode-job'})
+        self.assertEqual(get_job_state('job-id'), state)
+        self.assertEqual(self.xblock.metadata['jobs']['job-id'], state)
+        player_mock.return_value.dispatch.assert_called_once_with(None, 'ensure_ingest_profiles', background=False)
+        save_block_mock.assert_called_once_with(self.xblock, 3)
+
+    @patch('video_xblock.jobs.save_block')
+    @patch('video_xblock.jobs.load_block')
+    def test_execute_job_persists_to_reloaded_block(self, load_block_mock, save_block_mock):
+        """
+        Test persistent job's state and metadata changes are merged into the block reloaded after the job.
+        """
+        job_block = Mock(metadata={'retranscode-status': 'old', 'token': 'token'})
+        saved_block = Mock(metadata={'retranscode-status': 'old', 'token': 'edited token', 'jobs': {}})
+        load_block_mock.side_effect = [job_block, saved_block]
+        job_block.persistent_job.job_options = {'persist': True}
+        job_block.persistent_job.side_effect = lambda: job_block.metadata.update({'retranscode-status': 'new'})
+
+        state = execute_job('job-id', 'persistent_job', 'usage-id', 3, {})
+
+        self.assertEqual(saved_block.metadata, {
+            'retranscode-status': 'new', 'token': 'edited token', 'jobs': {'job-id': state}
+        })
+        save_block_mock.assert_called_once_with(saved_block, 3)
+
+    @patch('video_xblock.jobs.save_block')
+    def test_execute_job_failure(self, save_block_mock):
+        """
+        Test failed job is reported, and methods not marked as jobs can't be run.
+        """
+        state = execute_job('job-id', 'studio_view', 'usage-id', 3, {}, self.xblock)
+
+        self.assertEqual(state['status'], JobStatus.FAILURE)
+        self.assertIn("isn't a job", state['error'])
+        save_block_mock.assert_not_called()
+
+    @patch('video_xblock.jobs.load_block')
+    def test_execute_job_loads_block(self, load_block_mock):
+        """
+        Test job is run against the block loaded from the modulestore, if it isn't given.
+        """
+        load_block_mock.return_value.upload_default_transcript_job.job_options = {'persist': False}
+        load_block_mock.return_value.upload_default_transcript_job.return_value = {'url': 'url'}
+
+        state = execute_job('job-id', 'upload_default_transcript_job', 'usage-id', 3, {'data': {}})
+
+        self.assertEqual(state['result'], {'url': 'url'})
+        load_block_mock.assert_called_once_with('usage-id')
+        load_block_mock.return_value.upload_default_transcript_job.assert_called_once_with(data={})
+
+    def test_persist_job_state_keeps_recent_jobs(self):
+        """
+        Test only the most recent jobs are kept in block's metadata.
+        """
+        for index in range(MAX_PERSISTED_JOBS + 2):
+            persist_job_state(self.xblock, {'job_id': str(index), 'updated': '2024-05-14T00:00:{:02d}'.format(index)})
+
+        self.assertEqual(len(self.xblock.metadata['jobs']), MAX_PERSISTED_JOBS)
+        self.assertNotIn('0', self.xblock.metadata['jobs'])
+
+    @patch('video_xblock.jobs.save_block')
+    @patch.object(VideoXBlock, 'get_player')
+    def test_thread_runner(self, player_mock, _save_block_mock):
+        """
+        Test thread runner runs the job in background, and job's state is reported by `job_status` handler.
+        """
+        player_mock.return_value.dispatch.return_value = {'id': 'retranscode-job'}
+        runner = get_job_runner({'job_runner': 'thread'})
+
+        runner.submit('job-id', 'dispatch_job', self.xblock, 3, {'suffix': 'ensure_ingest_profiles'}).result()
+        response = self.xblock.job_status(arrange_request_mock(json.dumps({'job_id': 'job-id'})))
+
+        self.assertIsInstance(runner, ThreadJobRunner)
+        self.assertEqual(json.loads(response.body.decode())['result'], {'id': 'retranscode-job'})
+
+    @patch.object(VideoXBlock, 'settings', new_callable=PropertyMock)
+    @patch('video_xblock.jobs.get_job_runner')
+    def test_submit_job(self, job_runner_mock, settings_mock):
+        """
+        Test job is recorded as pending and handed over to the configured runner.
+        """
+        settings_mock.return_value = {'job_runner': 'thread'}
+
+        state = self.xblock.enqueue_job('dispatch_job', suffix='ensure_ingest_profiles')
+
+        self.assertEqual(state['status'], JobStatus.PENDING)
+        self.assertEqual(get_job_state(state['job_id']), state)
+        job_runner_mock.assert_called_once_with({'job_runner': 'thread'})
+        job_runner_mock.return_value.submit.assert_called_once_with(
+            state['job_id'], 'dispatch_job', self.xblock, 3, {'suffix': 'ensure_ingest_profiles'}
+        )
+
+    def test_job_status_unknown(self):
+        """
+        Test state of unknown job is reported.
+        """
+        response = self.xblock.job_status(arrange_request_mock(json.dumps({'job_id': 'missing'})))
+
+        self.assertEqual(json.loads(response.body.decode())['status'], 'unknown')
+
+    def test_job_status_of_other_block(self):
+        """
+        Test state of a job run against another block isn't reported.
+        """
+        set_job_state('job-id', 'dispatch_job', JobStatus.SUCCESS, 'other-usage-id', result={'secret': 'data'})
+
+        response = self.xblock.job_status(arrange_request_mock(json.dumps({'job_id': 'job-id'})))
+
+        self.assertEqual(json.loads(response.body.decode()), {'job_id': 'job-id', 'status': 'unknown'})
+
+    @patch.object(VideoXBlock, 'enqueue_job')
+    def test_brightcove_retranscode_enqueued(self, enqueue_job_mock):
+        """
+        Test Brightcove re-transcoding is run as a background job, while other entry points aren't.
+        """
+        player = BrightcovePlayer(self.xblock)
+
+        player.dispatch(None, 'submit_retranscode_default')
+        status = player.dispatch(None, 'retranscode-status')
+
+        enqueue_job_mock.assert_called_once_with('dispatch_job', suffix='submit_retranscode_default')
+        self.assertIsNone(status)
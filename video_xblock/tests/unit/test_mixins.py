@@ -2,24 +2,29 @@
 VideoXBlock mixins test cases.
 """
 
+import datetime
 import json
-from collections import Iterable
+from collections import Iterable, namedtuple
 
 import requests
 from django.test import RequestFactory
 from django.test.utils import override_settings
-from mock import patch, Mock, MagicMock, PropertyMock
-from webob import Response
+from mock import patch, Mock, PropertyMock
+from webob import Request, Response
 from xblock.exceptions import NoSuchServiceError
+from xmodule.exceptions import NotFoundError
 from unittest import skip
 
-from video_xblock.constants import DEFAULT_LANG, TPMApiLanguage, Status
+from video_xblock.captions import Cue, CueIndex
+from video_xblock.constants import DEFAULT_LANG, TPMApiLanguage, TPMApiTranscriptFormatID, Status
 from video_xblock.tests.unit.base import VideoXBlockTestBase
 from video_xblock.tests.unit.mocks.base import ResponseStub
 from video_xblock.tests.unit.test_video_xblock_handlers import arrange_request_mock
 from video_xblock.utils import loader, Transcript, ugettext as _
 from video_xblock.video_xblock import VideoXBlock
 
+AssetLocation = namedtuple('AssetLocation', ['course_key', 'path'])
+
 
 class ContentStoreMixinTest(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
     """Test ContentStoreMixin"""
@@ -227,6 +232,97 @@ class PlaybackStateMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inhe
             'transcriptsObject': {}
         })
 
+    def test_save_player_state_unchanged(self):
+        """
+        Test unchanged player state isn't written, and only changed fields are written otherwise.
+        """
+        self.xblock.save()
+        data = {
+            'currentTime': self.xblock.current_time,
+            'muted': self.xblock.muted,
+            'playbackRate': self.xblock.playback_rate,
+            'volume': self.xblock.volume,
+        }
+
+        self.xblock.save_player_state(arrange_request_mock(json.dumps(data)))
+
+        self.assertEqual(self.xblock._get_fields_to_save(), [])  # pylint: disable=protected-access
+
+        data['currentTime'] = 42
+        self.xblock.save_player_state(arrange_request_mock(json.dumps(data)))
+
+        self.assertEqual(self.xblock._get_fields_to_save(), ['current_time'])  # pylint: disable=protected-access
+        self.assertEqual(self.xblock.current_time, 42)
+
+    @patch.object(VideoXBlock, 'settings', new_callable=PropertyMock)
+    @patch('video_xblock.mixins.time.time')
+    def test_save_playback_progress(self, time_mock, settings_mock):
+        """
+        Test playback progress heartbeats are buffered and flushed to `current_time` once in a flush interval.
+        """
+        settings_mock.return_value = {'playback_progress_interval': 10, 'playback_progress_flush_interval': 60}
+        self.xblock.scope_ids = Mock(usage_id='usage-id', user_id=3)
+        self.xblock.course_id = 'test:course:id'
+        self.xblock.runtime.modulestore = Mock(get_course=Mock)
+        heartbeats = ((1000, 10, False), (1030, 40, False), (1060, 70, True), (1070, 80, False))
+
+        for now, current_time, flushed in heartbeats:
+            time_mock.return_value = now
+            response = self.xblock.save_playback_progress(
+                arrange_request_mock(json.dumps({'currentTime': current_time}))
+            )
+            self.assertEqual(json.loads(response.body.decode())['flushed'], flushed)
+
+        self.assertEqual(self.xblock.current_time, 70)
+        self.assertEqual(self.xblock.player_state['currentTime'], 80)
+
+        self.xblock.save_player_state(arrange_request_mock(json.dumps({'currentTime': 85})))
+
+        self.assertIsNone(self.xblock.get_buffered_playback_progress())
+        self.assertEqual(self.xblock.player_state['currentTime'], 85)
+
+    @patch.object(VideoXBlock, 'settings', new_callable=PropertyMock)
+    @patch('video_xblock.mixins.time.time')
+    def test_save_playback_progress_final(self, time_mock, settings_mock):
+        """
+        Test the final heartbeat of a session is flushed to `current_time` right away.
+        """
+        settings_mock.return_value = {'playback_progress_interval': 10, 'playback_progress_flush_interval': 60}
+        self.xblock.scope_ids = Mock(usage_id='usage-id', user_id=3)
+        time_mock.return_value = 1000
+
+        self.xblock.save_playback_progress(arrange_request_mock(json.dumps({'currentTime': 10})))
+        response = self.xblock.save_playback_progress(
+            arrange_request_mock(json.dumps({'currentTime': 15, 'final': True}))
+        )
+
+        self.assertEqual(json.loads(response.body.decode()), {'success': True, 'flushed': True})
+        self.assertEqual(self.xblock.current_time, 15)
+
+    @patch.object(VideoXBlock, 'settings', new_callable=PropertyMock)
+    def test_save_playback_progress_invalid(self, settings_mock):
+        """
+        Test heartbeat without valid playback position is rejected.
+        """
+        settings_mock.return_value = {'playback_progress_interval': 10}
+        self.xblock.scope_ids = Mock(usage_id='usage-id', user_id=3)
+
+        for body in ('{}', '{"currentTime": null}', '{"currentTime": "foo"}', '{"currentTime": NaN}',
+                     '{"currentTime": Infinity}', '{"currentTime": -1}'):
+            response = self.xblock.save_playback_progress(arrange_request_mock(body))
+
+            self.assertEqual(json.loads(response.body.decode()), {'success': False})
+        self.assertIsNone(self.xblock.get_buffered_playback_progress())
+
+    def test_save_playback_progress_disabled(self):
+        """
+        Test playback progress isn't recorded if it isn't tracked.
+        """
+        response = self.xblock.save_playback_progress(arrange_request_mock(json.dumps({'currentTime': 10})))
+
+        self.assertEqual(json.loads(response.body.decode()), {'success': False})
+        self.assertEqual(self.xblock.current_time, 0)
+
 
 class SettingsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
     """
@@ -382,30 +478,132 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         self.assertEqual(file_name, 'test_transcripts.vtt')
         self.assertEqual(external_url, '/test-location.vtt')
 
-    @patch.object(VideoXBlock, 'get_file_name_from_path')
-    @patch('video_xblock.mixins.requests.get')
-    def test_download_transcript_handler_response_object(self, get_mock, get_filename_mock):
+    def arrange_transcript_asset(self, contentstore_mock, data=b'WEBVTT\n\nvtt transcripts'):
         """
-        Test transcripts downloading works properly.
+        Make mocked contentstore return a transcript asset stream.
+        """
+        content = Mock(
+            length=len(data), content_digest='digest', locked=False,
+            last_modified_at=datetime.datetime(2024, 5, 14, tzinfo=datetime.timezone.utc),
+        )
+        content.stream_data.return_value = iter([data])
+        content.stream_data_in_range.side_effect = lambda first, last: iter([data[first:last + 1]])
+        contentstore_mock.return_value.return_value.find.return_value = content
+        return content
+
+    def arrange_enabled_transcript(self, static_content_mock, path, course_key='course_key'):
+        """
+        Enable a transcript stored as an asset, and make mocked `StaticContent` resolve asset paths.
+        """
+        self.xblock.transcripts = json.dumps([{'lang': 'en', 'label': 'English', 'url': path}])
+        static_content_mock.return_value.get_location_from_path.side_effect = \
+            lambda asset_path: AssetLocation(course_key, asset_path)
+        return AssetLocation(course_key, path)
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_download_transcript_handler_response_object(self, contentstore_mock, static_content_mock):
+        """
+        Test transcripts downloading streams an asset from contentstore.
         """
         # Arrange
-        get_filename_mock.return_value = 'transcript.vtt'
-        get_mock.return_value.text = 'vtt transcripts'
-        request_mock = MagicMock()
-        request_mock.host_url = 'test.host'
-        request_mock.query_string = '/test-query-string'
+        content = self.arrange_transcript_asset(contentstore_mock)
+        asset_location = self.arrange_enabled_transcript(
+            static_content_mock, '/asset-v1:Org+Course+Run+type@asset+block@transcript.vtt'
+        )
+        request = Request.blank('/', query_string='asset-v1:Org+Course+Run+type@asset+block@transcript.vtt')
 
         # Act
-        vtt_response = self.xblock.download_transcript(request_mock, 'unused suffix')
+        vtt_response = self.xblock.download_transcript(request, 'unused suffix')
 
         # Assert
         self.assertIsInstance(vtt_response, Response)
-        self.assertEqual(vtt_response.text, 'vtt transcripts')
-        self.assertEqual(vtt_response.headerlist, [
-            ('Content-Type', 'text/plain'),
-            ('Content-Disposition', 'attachment; filename={}'.format('transcript.vtt'))
-        ])
-        get_mock.assert_called_once_with('test.host/test-query-string')
+        self.assertEqual(vtt_response.status_code, 200)
+        self.assertEqual(vtt_response.body, b'WEBVTT\n\nvtt transcripts')
+        self.assertEqual(vtt_response.content_length, content.length)
+        self.assertEqual(vtt_response.etag, 'digest')
+        self.assertEqual(vtt_response.content_type, 'text/plain')
+        self.assertEqual(vtt_response.content_disposition, 'attachment; filename=transcript.vtt')
+        contentstore_mock.return_value.return_value.find.assert_called_once_with(asset_location, as_stream=True)
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_download_transcript_conditional_and_range(self, contentstore_mock, static_content_mock):
+        """
+        Test transcripts downloading honours conditional and range requests.
+        """
+        content = self.arrange_transcript_asset(contentstore_mock)
+        query_string = 'asset-v1:Org+Course+Run+type@asset+block@transcript.vtt'
+        self.arrange_enabled_transcript(static_content_mock, '/' + query_string)
+
+        not_modified = self.xblock.download_transcript(
+            Request.blank('/', query_string=query_string, if_none_match='"digest"'), 'unused suffix'
+        )
+        partial = self.xblock.download_transcript(
+            Request.blank('/', query_string=query_string, range='bytes=0-5'), 'unused suffix'
+        )
+        not_satisfiable = self.xblock.download_transcript(
+            Request.blank('/', query_string=query_string, range='bytes=1000-'), 'unused suffix'
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.body, b'WEBVTT')
+        self.assertEqual(partial.headers['Content-Range'], 'bytes 0-5/{}'.format(content.length))
+        self.assertEqual(not_satisfiable.status_code, 416)
+        content.stream_data.assert_not_called()
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_download_transcript_not_found(self, contentstore_mock, static_content_mock):
+        """
+        Test downloading of a missing transcript asset responds with 404.
+        """
+        self.arrange_enabled_transcript(static_content_mock, '/missing.vtt')
+        contentstore_mock.return_value.return_value.find.side_effect = NotFoundError
+
+        response = self.xblock.download_transcript(Request.blank('/', query_string='missing.vtt'), 'unused suffix')
+
+        self.assertEqual(response.status_code, 404)
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_download_transcript_not_allowed(self, contentstore_mock, static_content_mock):
+        """
+        Test assets which aren't enabled transcripts of the block's course, or are locked, aren't downloaded.
+        """
+        content = self.arrange_transcript_asset(contentstore_mock)
+        query_string = 'asset-v1:Org+Course+Run+type@asset+block@transcript.vtt'
+
+        self.arrange_enabled_transcript(static_content_mock, '/asset-v1:Org+Course+Run+type@asset+block@en.vtt')
+        not_enabled = self.xblock.download_transcript(Request.blank('/', query_string=query_string), 'unused suffix')
+        self.arrange_enabled_transcript(static_content_mock, '/' + query_string, course_key='other_course_key')
+        other_course = self.xblock.download_transcript(Request.blank('/', query_string=query_string), 'unused suffix')
+        contentstore_mock.return_value.return_value.find.assert_not_called()
+        self.arrange_enabled_transcript(static_content_mock, '/' + query_string)
+        content.locked = True
+        locked = self.xblock.download_transcript(Request.blank('/', query_string=query_string), 'unused suffix')
+
+        self.assertEqual(not_enabled.status_code, 404)
+        self.assertEqual(other_course.status_code, 404)
+        self.assertEqual(locked.status_code, 404)
+        content.stream_data.assert_not_called()
+
+    @patch.object(VideoXBlock, 'fetch_single_3pm_translation')
+    def test_download_3pm_transcript(self, fetch_3pm_translation_mock):
+        """
+        Test directly streamed 3PlayMedia transcript is downloaded without HTTP request to LMS.
+        """
+        fetch_3pm_translation_mock.return_value = Mock(content='WEBVTT')
+        request = Request.blank(
+            '/', query_string='/courses/course/xblock/block/handler/fetch_from_three_play_media?1=123'
+        )
+
+        response = self.xblock.download_transcript(request, 'unused suffix')
+
+        self.assertEqual(response.text, 'WEBVTT')
+        self.assertIn('attachment', response.content_disposition)
+        fetch_3pm_translation_mock.assert_called_once_with(transcript_data={'id': '123', 'language_id': '1'})
 
     @patch.object(VideoXBlock, 'captions_language', new_callable=PropertyMock)
     @patch.object(VideoXBlock, 'transcripts', new_callable=PropertyMock)
@@ -467,25 +665,234 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         self.assertIsInstance(response_text, str)
         self.assertEqual(response_text, 'vtt_content is string data type')        
 
-    @patch('video_xblock.mixins.requests', new_callable=MagicMock)
+    @patch('video_xblock.mixins.StaticContent')
+    @patch('video_xblock.mixins.StaticContentServer')
     @patch.object(VideoXBlock, 'convert_caps_to_vtt')
-    def test_srt_to_vtt(self, convert_caps_to_vtt_mock, requests_mock):
+    def test_srt_to_vtt(self, convert_caps_to_vtt_mock, content_server_mock, static_content_mock):
         """
-        Test xBlock's srt-to-vtt convertation works properly.
+        Test xBlock's srt-to-vtt convertation works properly, and converted transcripts are cached.
         """
         # Arrange
-        request_mock = MagicMock()
+        static_content_mock.get_location_from_path.return_value = 'asset-location'
+        asset_mock = content_server_mock.return_value.load_asset_from_location.return_value
+        asset_mock.content_digest = 'digest'
+        asset_mock.stream_data.return_value = [b'srt ', b'transcripts']
         convert_caps_to_vtt_mock.return_value = 'vtt transcripts'
-        requests_mock.get.return_value.text = text_mock = PropertyMock()
-        text_mock.return_value = 'vtt transcripts'
+        request = Request.blank('/', query_string='/asset-v1:Org+Course+Run+type@asset+block@en.srt')
 
         # Act
-        vtt_response = self.xblock.srt_to_vtt(request_mock, 'unused suffix')
+        vtt_response = self.xblock.srt_to_vtt(request, 'unused suffix')
+        cached_response = self.xblock.srt_to_vtt(request, 'unused suffix')
 
         # Assert
         self.assertIsInstance(vtt_response, Response)
         self.assertEqual(vtt_response.text, 'vtt transcripts')
-        convert_caps_to_vtt_mock.assert_called_once_with(text_mock)
+        self.assertEqual(vtt_response.content_type, 'text/vtt')
+        self.assertTrue(vtt_response.etag)
+        self.assertEqual(cached_response.text, 'vtt transcripts')
+        convert_caps_to_vtt_mock.assert_called_once_with(asset_mock.stream_data.return_value)
+
+    @patch('video_xblock.mixins.StaticContent')
+    @patch('video_xblock.mixins.StaticContentServer')
+    @patch.object(VideoXBlock, 'convert_caps_to_vtt')
+    def test_srt_to_vtt_not_modified(self, convert_caps_to_vtt_mock, content_server_mock, _static_content_mock):
+        """
+        Test srt-to-vtt handler answers conditional request without reading the asset, until it is changed.
+        """
+        # Arrange
+        asset_mock = content_server_mock.return_value.load_asset_from_location.return_value
+        asset_mock.content_digest = 'digest'
+        asset_mock.stream_data.return_value = [b'srt transcripts']
+        convert_caps_to_vtt_mock.return_value = 'vtt transcripts'
+        etag = self.xblock.srt_to_vtt(Request.blank('/'), 'unused suffix').etag
+        asset_mock.stream_data.reset_mock()
+
+        # Act
+        not_modified_response = self.xblock.srt_to_vtt(Request.blank('/', if_none_match=etag), 'unused suffix')
+        asset_mock.content_digest = 'new digest'
+        changed_response = self.xblock.srt_to_vtt(Request.blank('/', if_none_match=etag), 'unused suffix')
+
+        # Assert
+        self.assertEqual(not_modified_response.status_code, 304)
+        self.assertEqual(changed_response.status_code, 200)
+        self.assertNotEqual(changed_response.etag, etag)
+        asset_mock.stream_data.assert_called_once_with()
+
+    def test_get_captions_window(self):
+        """
+        Test captions window is made of video's start and end time.
+        """
+        self.assertIsNone(self.xblock.get_captions_window())
+
+        self.xblock.start_time = datetime.timedelta(seconds=2)
+        self.assertEqual(self.xblock.get_captions_window(), (2000, None))
+
+        self.xblock.end_time = datetime.timedelta(seconds=5)
+        self.assertEqual(self.xblock.get_captions_window(), (2000, 5000))
+
+    @patch('video_xblock.mixins.StaticContent')
+    @patch('video_xblock.mixins.StaticContentServer')
+    def test_srt_to_vtt_trimmed(self, content_server_mock, _static_content_mock):
+        """
+        Test srt-to-vtt handler returns only cues within the clip window, cached per window.
+        """
+        srt = b'1\n00:00:01,000 --> 00:00:02,000\nOne\n\n2\n00:00:03,000 --> 00:00:04,000\nTwo\n'
+        asset_mock = content_server_mock.return_value.load_asset_from_location.return_value
+        asset_mock.content_digest = 'digest'
+        asset_mock.stream_data.side_effect = lambda: iter([srt])
+        untrimmed_response = self.xblock.srt_to_vtt(Request.blank('/'), 'unused suffix')
+        self.xblock.start_time = datetime.timedelta(seconds=2.5)
+
+        trimmed_response = self.xblock.srt_to_vtt(Request.blank('/'), 'unused suffix')
+
+        self.assertIn('One', untrimmed_response.text)
+        self.assertEqual(trimmed_response.text, 'WEBVTT\n\n00:00:03.000 --> 00:00:04.000\nTwo\n\n')
+        self.assertNotEqual(trimmed_response.etag, untrimmed_response.etag)
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_trimmed_transcript(self, contentstore_mock, static_content_mock):
+        """
+        Test stored WebVTT transcript is trimmed to the clip window, and trimmed transcript is cached.
+        """
+        vtt = b'WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nOne\n\n00:00:03.000 --> 00:00:04.000\nTwo\n'
+        content = self.arrange_transcript_asset(contentstore_mock, data=vtt)
+        self.arrange_enabled_transcript(static_content_mock, '/asset-v1:Org+Course+Run+type@asset+block@en.vtt')
+        content.stream_data.side_effect = lambda: iter([vtt])
+        self.xblock.end_time = datetime.timedelta(seconds=2)
+        request = Request.blank('/', query_string='/asset-v1:Org+Course+Run+type@asset+block@en.vtt')
+
+        response = self.xblock.trimmed_transcript(request, 'unused suffix')
+        cached_response = self.xblock.trimmed_transcript(request, 'unused suffix')
+        not_modified_response = self.xblock.trimmed_transcript(
+            Request.blank('/', query_string=request.query_string, if_none_match=response.etag), 'unused suffix'
+        )
+
+        self.assertEqual(response.text, 'WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nOne\n\n')
+        self.assertEqual(response.content_type, 'text/vtt')
+        self.assertEqual(cached_response.text, response.text)
+        self.assertEqual(not_modified_response.status_code, 304)
+        content.stream_data.assert_called_once_with()
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_trimmed_transcript_not_found(self, contentstore_mock, static_content_mock):
+        """
+        Test trimming of missing transcript asset, or an asset which isn't an enabled transcript, responds with 404.
+        """
+        self.arrange_enabled_transcript(static_content_mock, 'missing.vtt')
+        contentstore_mock.return_value.return_value.find.side_effect = NotFoundError
+
+        response = self.xblock.trimmed_transcript(Request.blank('/', query_string='missing.vtt'), 'unused suffix')
+        not_enabled_response = self.xblock.trimmed_transcript(
+            Request.blank('/', query_string='/asset-v1:Org+Course+Run+type@asset+block@secret.vtt'), 'unused suffix'
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(not_enabled_response.status_code, 404)
+        contentstore_mock.return_value.return_value.find.assert_called_once()
+
+    @patch.object(VideoXBlock, 'fetch_single_3pm_translation')
+    def test_fetch_from_three_play_media_trimmed(self, fetch_3pm_translation_mock):
+        """
+        Test 3PlayMedia transcript is trimmed to the clip window.
+        """
+        fetch_3pm_translation_mock.return_value = Mock(
+            content='WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nOne\n\n00:00:03.000 --> 00:00:04.000\nTwo\n'
+        )
+        self.xblock.start_time = datetime.timedelta(seconds=3)
+
+        with patch.object(VideoXBlock, 'trim_captions', wraps=VideoXBlock.trim_captions) as trim_captions_mock:
+            response = self.xblock.fetch_from_three_play_media(
+                Request.blank('/', query_string='1=123'), 'unused suffix'
+            )
+            cached_response = self.xblock.fetch_from_three_play_media(
+                Request.blank('/', query_string='1=123'), 'unused suffix'
+            )
+            not_modified_response = self.xblock.fetch_from_three_play_media(
+                Request.blank('/', query_string='1=123', if_none_match=response.etag), 'unused suffix'
+            )
+
+        self.assertEqual(response.text, 'WEBVTT\n\n00:00:03.000 --> 00:00:04.000\nTwo\n\n')
+        self.assertEqual(cached_response.text, response.text)
+        self.assertEqual(not_modified_response.status_code, 304)
+        trim_captions_mock.assert_called_once()
+
+    def test_trim_captions_keeps_vtt_blocks(self):
+        """
+        Test trimming of WebVTT captions keeps header blocks, cue identifiers and cue settings.
+        """
+        vtt = (
+            'WEBVTT - lecture\n\n'
+            'STYLE\n::cue { color: yellow }\n\n'
+            'intro\n00:00:01.000 --> 00:00:02.000 position:10% align:start\nOne\n\n'
+            'main\n00:00:03.000 --> 00:00:04.000 line:0\nTwo\n'
+        )
+
+        self.assertEqual(VideoXBlock.trim_captions(vtt, (2500, None)), (
+            'WEBVTT - lecture\n\n'
+            'STYLE\n::cue { color: yellow }\n\n'
+            'main\n00:00:03.000 --> 00:00:04.000 line:0\nTwo\n\n'
+        ))
+
+    def test_route_transcripts_trimmed(self):
+        """
+        Test WebVTT transcripts of a clipped video are routed to the trimming handler.
+        """
+        self.xblock.start_time = datetime.timedelta(seconds=3)
+        with patch.object(self.xblock, 'runtime') as runtime_mock, \
+                patch.object(self.xblock, 'get_enabled_transcripts') as get_enabled_transcripts_mock:
+            runtime_mock.handler_url.return_value = 'trimmed.vtt'
+            get_enabled_transcripts_mock.return_value = [{'url': 'test-trans.vtt'}]
+            self.xblock.threeplaymedia_streaming = False
+
+            self.assertEqual(list(self.xblock.route_transcripts()), [{'url': 'trimmed.vtt'}])
+            runtime_mock.handler_url.assert_called_once_with(
+                self.xblock, 'trimmed_transcript', query='test-trans.vtt'
+            )
+
+    @patch.object(VideoXBlock, 'static_content', new_callable=PropertyMock)
+    @patch.object(VideoXBlock, 'contentstore', new_callable=PropertyMock)
+    def test_get_asset_cue_index_cached(self, contentstore_mock, _static_content_mock):
+        """
+        Test cue index of a transcript asset is built once per asset version.
+        """
+        content = self.arrange_transcript_asset(
+            contentstore_mock, data=b'1\n00:00:01,000 --> 00:00:02,000\nHello\n'
+        )
+        content.stream_data.side_effect = lambda: iter([b'1\n00:00:01,000 --> 00:00:02,000\nHello\n'])
+
+        cue_index = self.xblock.get_asset_cue_index('asset-location')
+        cached_cue_index = self.xblock.get_asset_cue_index('asset-location')
+        content.content_digest = 'new digest'
+        self.xblock.get_asset_cue_index('asset-location')
+
+        self.assertEqual(list(cue_index), [(1000, 2000, 'Hello')])
+        self.assertEqual(list(cached_cue_index), list(cue_index))
+        self.assertEqual(content.stream_data.call_count, 2)
+
+    @patch.object(VideoXBlock, 'get_transcript_cue_index')
+    @patch.object(VideoXBlock, 'get_enabled_transcripts')
+    def test_get_transcript_cue(self, enabled_transcripts_mock, cue_index_mock):
+        """
+        Test cue shown at a given time is looked up in a transcript of a requested language.
+        """
+        enabled_transcripts_mock.return_value = [
+            {'lang': 'en', 'url': '/asset-v1:Org+Course+Run+type@asset+block@en.vtt', 'source': 'manual'},
+            {'lang': 'uk', 'url': '/asset-v1:Org+Course+Run+type@asset+block@uk.vtt', 'source': 'manual'},
+        ]
+        cue_index_mock.return_value = CueIndex([Cue(1000, 2500, 'Hello')])
+
+        cue = self.xblock.get_transcript_cue(arrange_request_mock('{"lang": "uk", "time": 1.5}'))
+        no_cue = self.xblock.get_transcript_cue(arrange_request_mock('{"lang": "uk", "time": 3}'))
+        invalid_time = self.xblock.get_transcript_cue(arrange_request_mock('{"lang": "uk", "time": "now"}'))
+        infinite_time = self.xblock.get_transcript_cue(arrange_request_mock('{"lang": "uk", "time": "inf"}'))
+
+        self.assertEqual(json.loads(cue.body.decode()), {'start': 1.0, 'end': 2.5, 'text': 'Hello'})
+        self.assertEqual(json.loads(no_cue.body.decode()), {})
+        self.assertEqual(json.loads(invalid_time.body.decode()), {})
+        self.assertEqual(json.loads(infinite_time.body.decode()), {})
+        cue_index_mock.assert_called_with(enabled_transcripts_mock.return_value[1])
 
     def test_fetch_available_3pm_transcripts_with_errors(self):
         """
@@ -520,11 +927,12 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         test_args = ['id', 'label', 'lang', 'lang_id', 'content', 'format', 'video_id', 'source', 'url']
 
         with patch.object(self.xblock, 'get_3pm_transcripts_list') as threepm_transcripts_mock, \
-                patch.object(self.xblock, 'fetch_single_3pm_translation') as fetch_3pm_translation_mock, \
+                patch.object(self.xblock, 'build_3pm_transcript') as build_3pm_transcript_mock, \
+                patch.object(self.xblock, 'fetch_3pm_translations') as fetch_3pm_translations_mock, \
                 patch.object(self.xblock, 'threeplaymedia_file_id') as file_id_mock, \
                 patch.object(self.xblock, 'threeplaymedia_apikey') as apikey_mock:
             threepm_transcripts_mock.return_value = test_feedback, test_transcripts_list
-            fetch_3pm_translation_mock.return_value = Transcript(*test_args)
+            build_3pm_transcript_mock.return_value = Transcript(*test_args)
 
             # Act:
             transcripts_gen = self.xblock.fetch_available_3pm_transcripts()
@@ -535,9 +943,53 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
             self.assertSequenceEqual(test_args, list(transcripts[0].keys()))
 
             threepm_transcripts_mock.assert_called_once_with(file_id_mock, apikey_mock)
-            fetch_3pm_translation_mock.assert_called_once_with(test_transcripts_list[0])
+            build_3pm_transcript_mock.assert_called_once_with(test_transcripts_list[0])
+            fetch_3pm_translations_mock.assert_not_called()
+
+    def test_fetch_available_3pm_transcripts_with_content(self):
+        """
+        Test available 3PlayMedia transcripts fetching along with their contents.
+        """
+        test_feedback = {'status': Status.success, 'message': 'test_message'}
+        test_transcripts_list = [{'id': 'id_1', 'language_id': '1'}, {'id': 'id_2', 'language_id': '2'}]
+        test_transcript = Transcript('id_1', 'label', 'lang', '1', 'content', 51, 'video_id', 'source', 'url')
+
+        with patch.object(self.xblock, 'get_3pm_transcripts_list') as threepm_transcripts_mock, \
+                patch.object(self.xblock, 'fetch_3pm_translations') as fetch_3pm_translations_mock:
+            threepm_transcripts_mock.return_value = test_feedback, test_transcripts_list
+            fetch_3pm_translations_mock.return_value = [test_transcript, None]
+
+            transcripts = list(self.xblock.fetch_available_3pm_transcripts(with_content=True))
+
+        self.assertEqual(transcripts, [test_transcript._asdict()])
+        fetch_3pm_translations_mock.assert_called_once_with(test_transcripts_list)
+
+    @patch.object(VideoXBlock, 'get_player')
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
+    def test_fetch_3pm_translations(self, requests_get_mock, _player_mock):
+        """
+        Test several 3PlayMedia transcripts are fetched preserving their order.
+        """
+        def get(url):
+            """
+            Respond with transcript ID taken from the URL, fail for the second transcript.
+            """
+            transcript_id = url.split('/')[-1].split('?')[0]
+            return ResponseStub(body='content of {}'.format(transcript_id), ok=transcript_id != 'id_2')
+
+        requests_get_mock.side_effect = get
+        transcripts_data = [{'id': 'id_{}'.format(i), 'language_id': '1'} for i in range(1, 6)]
+
+        transcripts = self.xblock.fetch_3pm_translations(transcripts_data)
 
-    @patch('video_xblock.mixins.requests.get')
+        self.assertIsNone(transcripts[1])
+        self.assertEqual(
+            [transcript.content for transcript in transcripts if transcript is not None],
+            ['content of id_1', 'content of id_3', 'content of id_4', 'content of id_5']
+        )
+        self.assertEqual(requests_get_mock.call_count, 5)
+
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
     def test_get_3pm_transcripts_list_success(self, requests_get_mock):
         """
         Test fetching of the list of available 3PlayMedia transcripts (success case).
@@ -564,7 +1016,7 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         self.assertEqual(feedback, test_feedback)
         requests_get_mock.assert_called_once_with(test_api_url)
 
-    @patch('video_xblock.mixins.requests.get')
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
     def test_get_3pm_transcripts_list_api_failure(self, requests_get_mock):
         """
         Test fetching of the list of available 3PlayMedia transcripts (api failure case).
@@ -585,8 +1037,55 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         self.assertEqual(feedback, test_feedback)
         requests_get_mock.assert_called_once_with(test_api_url)
 
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
+    def test_get_3pm_transcripts_list_cached(self, requests_get_mock):
+        """
+        Test list of available 3PlayMedia transcripts is requested once per file ID and API key.
+        """
+        requests_get_mock.return_value = ResponseStub(body=[{"test": "json_string"}], ok=True)
+
+        self.xblock.get_3pm_transcripts_list('test_file_id', 'test_api_key')
+        feedback, transcripts_list = self.xblock.get_3pm_transcripts_list('test_file_id', 'test_api_key')
+        self.xblock.get_3pm_transcripts_list('test_file_id', 'other_api_key')
+
+        self.assertEqual(feedback['status'], Status.success)
+        self.assertEqual(transcripts_list, [{"test": "json_string"}])
+        self.assertEqual(requests_get_mock.call_count, 2)
+
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
+    def test_get_3pm_transcripts_list_failure_cached(self, requests_get_mock):
+        """
+        Test failed 3PlayMedia API request isn't repeated during failure timeout.
+        """
+        requests_get_mock.side_effect = requests.RequestException()
+
+        self.xblock.get_3pm_transcripts_list('test_file_id', 'test_api_key')
+        feedback, transcripts_list = self.xblock.get_3pm_transcripts_list('test_file_id', 'test_api_key')
+
+        self.assertEqual(feedback['status'], Status.error)
+        self.assertEqual(transcripts_list, [])
+        requests_get_mock.assert_called_once()
+
+    @patch.object(VideoXBlock, 'get_player')
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
+    def test_fetch_single_3pm_translation_cached(self, requests_get_mock, _player_mock):
+        """
+        Test 3PlayMedia transcript content is cached per transcript ID and format.
+        """
+        requests_get_mock.return_value = ResponseStub(body='test_transcript_text')
+        self.xblock.threeplaymedia_file_id = 'test_file_id'
+        self.xblock.threeplaymedia_apikey = 'test_api_key'
+        transcript_data = {'id': 'test_id', 'language_id': '1'}
+
+        self.xblock.fetch_single_3pm_translation(transcript_data)
+        transcript = self.xblock.fetch_single_3pm_translation(transcript_data)
+        self.xblock.fetch_single_3pm_translation(transcript_data, format_id=TPMApiTranscriptFormatID.SRT)
+
+        self.assertEqual(transcript.content, 'test_transcript_text')
+        self.assertEqual(requests_get_mock.call_count, 2)
+
     @patch.object(VideoXBlock, 'get_player')
-    @patch('video_xblock.mixins.requests.get')
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
     def test_fetch_single_3pm_translation_success(self, requests_get_mock, player_mock):
         """
         Test single 3PlayMedia transcript fetching (success case).
@@ -629,7 +1128,7 @@ class TranscriptsMixinTests(VideoXBlockTestBase):  # pylint: disable=test-inheri
         # Assert:
         self.assertEqual(transcript, Transcript(*test_args))
 
-    @patch('video_xblock.mixins.requests.get')
+    @patch('video_xblock.mixins.threeplaymedia_http.get')
     def test_fetch_single_3pm_translation_failure(self, requests_get_mock):
         """
         Test single 3PlayMedia transcript fetching (failure case).
@@ -8,8 +8,10 @@ from ddt import ddt, data
 from mock import patch, Mock, PropertyMock
 
 from video_xblock.constants import TranscriptSource
+from video_xblock import utils
 from video_xblock.utils import (
-    import_from, underscore_to_mixedcase, create_reference_name, normalize_transcripts, filter_transcripts_by_source
+    import_from, underscore_to_mixedcase, create_reference_name, normalize_transcripts, filter_transcripts_by_source,
+    clear_template_cache, get_template_engine, render_resource, render_template
 )
 
 
@@ -132,3 +134,56 @@ class UtilsTest(unittest.TestCase):
         # Assert
         self.assertIsInstance(filtered_transcripts, types.GeneratorType)
         self.assertListEqual(list(filtered_transcripts), three_pm_transcripts)
+
+
+class TemplateCacheTest(unittest.TestCase):
+    """
+    Test compiled templates caching.
+    """
+
+    def setUp(self):
+        clear_template_cache()
+
+    def tearDown(self):
+        clear_template_cache()
+
+    def test_template_engine_is_shared(self):
+        """
+        Test single template engine is used across calls.
+        """
+        self.assertIs(get_template_engine(), get_template_engine())
+
+    @patch.object(utils, 'Engine')
+    def test_render_template_compiles_once(self, engine_mock):
+        """
+        Test template is compiled once and then served from cache.
+        """
+        get_template_mock = engine_mock.return_value.get_template
+        get_template_mock.return_value.render.return_value = '<p>rendered</p>'
+
+        render_template('student_view.html', display_name='one')
+        result = render_template('student_view.html', display_name='two')
+
+        self.assertEqual(result, '<p>rendered</p>')
+        engine_mock.assert_called_once()
+        get_template_mock.assert_called_once_with('student_view.html')
+        self.assertEqual(get_template_mock.return_value.render.call_count, 2)
+
+    @patch.object(utils, 'resource_string', return_value='{{ greeting }}, world!')
+    def test_render_resource_compiles_once(self, resource_string_mock):
+        """
+        Test static resource is read and compiled once per path.
+        """
+        self.assertEqual(render_resource('static/js/context.js', greeting='Hello'), 'Hello, world!')
+        self.assertEqual(render_resource('static/js/context.js', greeting='Bye'), 'Bye, world!')
+        resource_string_mock.assert_called_once_with('static/js/context.js')
+
+    @patch.object(utils, 'resource_string', return_value='{{ greeting }}')
+    def test_clear_template_cache(self, resource_string_mock):
+        """
+        Test cache invalidation forces templates to be compiled again.
+        """
+        render_resource('static/js/context.js', greeting='Hello')
+        clear_template_cache()
+        render_resource('static/js/context.js', greeting='Hello')
+        self.assertEqual(resource_string_mock.call_count, 2)
@@ -5,12 +5,14 @@ Test cases for video_xblock.
 import datetime
 import json
 
-from mock import patch, Mock, MagicMock, PropertyMock
+from mock import call, patch, Mock, MagicMock, PropertyMock
 
 from web_fragments.fragment import FragmentResource
 from xblock.fragment import Fragment
 
 from video_xblock import VideoXBlock, __version__
+from video_xblock.backends.base import BaseVideoPlayer
+from video_xblock.captions import Cue, CueIndex
 from video_xblock.constants import PlayerName, TranscriptSource
 from video_xblock.utils import ugettext as _
 from video_xblock.tests.unit.base import VideoXBlockTestBase
@@ -63,7 +65,7 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         Test `Brightcove` player renders properly.
         """
         # Arrange
-        request_mock, suffix_mock = Mock(), Mock()
+        request_mock, suffix_mock = Mock(if_none_match=[]), Mock()
         render_resource_mock.return_value = 'vtt transcripts'
         handler_url = self.xblock.runtime.handler_url = Mock()
         get_player_html_mock = player_mock.return_value.get_player_html
@@ -84,6 +86,9 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             player_id=self.xblock.player_id,
             player_state=player_state_mock.return_value,
             save_state_url=handler_url.return_value,
+            publish_events_url=handler_url.return_value,
+            playback_progress_url='',
+            playback_progress_interval=0,
             start_time=self.xblock.start_time.total_seconds(),  # pylint: disable=no-member
             transcripts='vtt transcripts',
             url=self.xblock.href,
@@ -100,9 +105,41 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             transcripts=route_transcripts_mock()
         )
         player_mock.assert_called_once_with()
-        handler_url.assert_called_once_with(self.xblock, 'save_player_state')
+        handler_url.assert_has_calls([call(self.xblock, 'save_player_state'), call(self.xblock, 'publish_events')])
         request_mock.assert_not_called()
         suffix_mock.assert_not_called()
+        self.assertEqual(rendered_player.etag, self.xblock.get_player_fingerprint())
+        self.assertEqual(rendered_player.cache_control, 'private, no-cache')
+
+    @patch.object(VideoXBlock, 'get_player')
+    def test_render_player_not_modified(self, player_mock):
+        """
+        Test player isn't rendered if client has its actual version.
+        """
+        # Arrange
+        request_mock = Mock(if_none_match=[self.xblock.get_player_fingerprint()])
+
+        # Act
+        response = self.xblock.render_player(request_mock)
+
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.etag, self.xblock.get_player_fingerprint())
+        player_mock.assert_not_called()
+
+    def test_player_fingerprint(self):
+        """
+        Test player fingerprint changes along with the content and learner's player state.
+        """
+        initial_fingerprint = self.xblock.get_player_fingerprint()
+        self.assertEqual(self.xblock.get_player_fingerprint(), initial_fingerprint)
+
+        self.xblock.href = 'https://example.com/video.mp4'
+        content_fingerprint = self.xblock.get_player_fingerprint()
+        self.assertNotEqual(content_fingerprint, initial_fingerprint)
+
+        self.xblock.current_time = 42.0
+        self.assertNotEqual(self.xblock.get_player_fingerprint(), content_fingerprint)
 
     @patch('video_xblock.video_xblock.render_template')
     @patch('video_xblock.video_xblock.resource_string')
@@ -157,15 +194,16 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             all_languages_mock
     ):
         """
-        Test xBlock's student view gets proper context.
+        Test xBlock's studio view gets proper context, without calling video platform's API.
         """
         # Arrange
         unused_context_stub = object()
         all_languages_mock.__iter__.return_value = [['en', 'English']]
         self.xblock.runtime.handler_url = handler_url_mock = Mock()
-        update_default_transcripts_mock.return_value = (
-            ['stub1', 'stub2'], 'Stub autoupload messate'
-        )
+        self.xblock.default_transcripts = [{'lang': 'en', 'label': 'English'}]
+        self.xblock.discovered_default_transcripts = [
+            {'lang': 'uk', 'label': 'Ukrainian'}, {'lang': 'en', 'label': 'English'}
+        ]
         prepare_fields_mock.side_effect = \
             basic_fields_stub, advanced_fields_stub, transcripts_fields_stub, three_pm_fields_stub = [
                 [{'name': 'display_name'}],
@@ -188,14 +226,13 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
 
         expected_context = {
             'advanced_fields': advanced_fields_stub,
-            'auth_error_message': '',
             'basic_fields': basic_fields_stub,
             'courseKey': 'course_key',
             'default_transcripts': self.xblock.default_transcripts,
             'download_transcript_handler_url': handler_url_mock.return_value,
             'enabled_default_transcripts': [],
             'enabled_managed_transcripts': [],
-            'initial_default_transcripts': ['stub1', 'stub2'],
+            'initial_default_transcripts': self.xblock.discovered_default_transcripts,
             'languages': [{'code': 'en', 'label': 'English'}],
             'player_name': self.xblock.player_name,
             'players': PlayerName,
@@ -203,7 +240,7 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
             'three_pm_fields': three_pm_fields_stub,
             'transcripts': [],
             'transcripts_fields': transcripts_fields_stub,
-            'transcripts_autoupload_message': 'Stub autoupload messate',
+            'transcripts_autoupload_message': '',
             'transcripts_type': 'manual',
             'i18n_service': self.xblock.runtime.service(self.xblock, 'i18n'),
         }
@@ -214,7 +251,7 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         # Assert
         render_template_mock.assert_called_once_with('studio-edit.html', **expected_context)
         handler_url_mock.assert_called_with(self.xblock, 'download_transcript')
-        update_default_transcripts_mock.assert_called_once()
+        update_default_transcripts_mock.assert_not_called()
         authenticate_video_api_mock.assert_not_called()
 
     @staticmethod
@@ -297,6 +334,135 @@ class VideoXBlockTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-te
         self.assertEqual(transcripts, [])
         self.assertFalse(normalize_transcripts_mock.called)
 
+    @patch('video_xblock.video_xblock.BaseVideoPlayer.load_class')
+    def test_get_player_cached(self, load_class_mock):
+        """
+        Test player object is re-created only if player name or metadata change.
+        """
+        # Arrange
+        self.xblock.player_name = PlayerName.BRIGHTCOVE
+        load_class_mock.return_value.side_effect = lambda xblock: Mock()
+
+        # Act
+        player = self.xblock.get_player()
+        same_player = self.xblock.get_player()
+        self.xblock.metadata['client_id'] = 'new_client_id'
+        player_with_new_metadata = self.xblock.get_player()
+        self.xblock.player_name = PlayerName.VIMEO
+        self.xblock.get_player()
+
+        # Assert
+        self.assertIs(same_player, player)
+        self.assertIsNot(player_with_new_metadata, player)
+        self.assertEqual(load_class_mock.call_count, 3)
+        self.assertEqual(load_class_mock.return_value.call_count, 3)
+
+        self.xblock.invalidate_player()
+        self.xblock.get_player()
+        self.assertEqual(load_class_mock.call_count, 4)
+
+    def test_player_classes_cached(self):
+        """
+        Test video player classes are loaded from entry points once.
+        """
+        with patch('xblock.plugin.Plugin.load_classes') as load_classes_mock:
+            load_classes_mock.return_value = iter([('dummy-player', Mock)])
+            BaseVideoPlayer._player_classes = {}  # pylint: disable=protected-access
+            first_classes = BaseVideoPlayer.load_classes()
+            second_classes = BaseVideoPlayer.load_classes()
+        BaseVideoPlayer._player_classes = {}  # pylint: disable=protected-access
+
+        self.assertEqual(first_classes, (('dummy-player', Mock),))
+        self.assertIs(second_classes, first_classes)
+        load_classes_mock.assert_called_once_with(True)
+
+    @patch.object(VideoXBlock, 'fetch_available_3pm_transcripts')
+    def test_get_enabled_transcripts_memoized(self, fetch_3pm_transcripts_mock):
+        """
+        Test enabled transcripts are evaluated once unless fields they depend on are changed.
+        """
+        # Arrange
+        self.xblock.threeplaymedia_streaming = True
+        fetch_3pm_transcripts_mock.side_effect = lambda: iter([{'id': 'PM1', 'source': '3play-media', 'url': 'u'}])
+
+        # Act
+        first_transcripts = self.xblock.get_enabled_transcripts()
+        first_transcripts[0]['url'] = 'changed by caller'
+        second_transcripts = self.xblock.get_enabled_transcripts()
+
+        # Assert
+        fetch_3pm_transcripts_mock.assert_called_once_with()
+        self.assertEqual(second_transcripts, [{'id': 'PM1', 'source': '3play-media', 'url': 'u'}])
+
+        self.xblock.threeplaymedia_file_id = 'another_file_id'
+        self.xblock.get_enabled_transcripts()
+        self.assertEqual(fetch_3pm_transcripts_mock.call_count, 2)
+
+    @patch.object(VideoXBlock, 'fetch_3pm_translations')
+    def test_prefetch_3pm_transcripts(self, fetch_3pm_translations_mock):
+        """
+        Test contents of 3PlayMedia transcripts only are fetched at once.
+        """
+        transcripts = [
+            {'id': 'PM1', 'lang_id': '1', 'source': TranscriptSource.THREE_PLAY_MEDIA},
+            {'id': 'MAN', 'lang_id': '1', 'source': TranscriptSource.MANUAL},
+            {'id': 'PM2', 'lang_id': '2', 'source': TranscriptSource.THREE_PLAY_MEDIA},
+        ]
+        fetch_3pm_translations_mock.return_value = ['transcript 1', None]
+
+        prefetched = self.xblock.prefetch_3pm_transcripts(transcripts)
+
+        self.assertDictEqual(prefetched, {'PM1': 'transcript 1', 'PM2': None})
+        fetch_3pm_translations_mock.assert_called_once_with(
+            [{'id': 'PM1', 'language_id': '1'}, {'id': 'PM2', 'language_id': '2'}]
+        )
+
+    @patch.object(VideoXBlock, 'get_transcript_cue_index')
+    @patch.object(VideoXBlock, 'prefetch_3pm_transcripts')
+    @patch.object(VideoXBlock, 'route_transcripts')
+    def test_index_dictionary(self, route_transcripts_mock, prefetch_mock, cue_index_mock):
+        """
+        Test text of enabled transcripts is taken from their cue indexes.
+        """
+        transcripts = [
+            {'id': 'PM1', 'lang': 'en', 'source': TranscriptSource.THREE_PLAY_MEDIA},
+            {'lang': 'uk', 'url': '/asset-v1:Org+Course+Run+type@asset+block@uk.vtt', 'source': 'manual'},
+            {'lang': 'fr', 'url': '/asset-v1:Org+Course+Run+type@asset+block@fr.vtt', 'source': 'manual'},
+        ]
+        route_transcripts_mock.return_value = iter(transcripts)
+        prefetch_mock.return_value = {'PM1': 'transcript 1'}
+        cue_index_mock.side_effect = [
+            CueIndex([Cue(0, 1000, 'Hello,\nworld!')]), CueIndex([Cue(0, 1000, 'Привіт')]), ValueError
+        ]
+
+        index = self.xblock.index_dictionary()
+
+        self.assertEqual(index['content']['en'], 'Hello, world!')
+        self.assertEqual(index['content']['uk'], 'Привіт')
+        self.assertNotIn('fr', index['content'])
+        self.assertEqual(index['content_type'], 'Video')
+        cue_index_mock.assert_any_call(transcripts[0], 'transcript 1')
+        cue_index_mock.assert_any_call(transcripts[1], None)
+
+    @patch.object(VideoXBlock, 'get_transcript_cue_index')
+    @patch.object(VideoXBlock, 'prefetch_3pm_transcripts')
+    @patch.object(VideoXBlock, 'route_transcripts')
+    def test_index_dictionary_prefetch_failed(self, route_transcripts_mock, prefetch_mock, cue_index_mock):
+        """
+        Test 3PlayMedia transcripts which failed to be prefetched aren't fetched again one by one.
+        """
+        route_transcripts_mock.return_value = iter([
+            {'id': 'PM1', 'lang': 'en', 'source': TranscriptSource.THREE_PLAY_MEDIA},
+            {'id': 'PM2', 'lang': 'uk', 'source': TranscriptSource.THREE_PLAY_MEDIA},
+        ])
+        prefetch_mock.return_value = {'PM1': None}
+
+        index = self.xblock.index_dictionary()
+
+        self.assertNotIn('en', index['content'])
+        self.assertNotIn('uk', index['content'])
+        cue_index_mock.assert_not_called()
+
     @patch.object(VideoXBlock, 'get_enabled_managed_transcripts')
     @patch.object(VideoXBlock, 'fetch_available_3pm_transcripts')
     @patch('video_xblock.video_xblock.normalize_transcripts')
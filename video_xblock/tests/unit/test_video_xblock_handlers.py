@@ -7,6 +7,8 @@ import json
 from mock import patch, Mock, PropertyMock
 
 from video_xblock import VideoXBlock
+from video_xblock.assets import AssetBundle
+from video_xblock.exceptions import ApiClientError
 from video_xblock.tests.unit.base import VideoXBlockTestBase, arrange_request_mock
 
 
@@ -41,10 +43,23 @@ class UploadDefaultTranscriptHandlerTests(VideoXBlockTestBase):  # pylint: disab
     Test cases for `VideoXBlock.upload_default_transcript_handler`.
     """
 
+    @patch.object(VideoXBlock, 'enqueue_job')
+    def test_upload_handler_enqueues_job(self, enqueue_job_mock):
+        """
+        Test xBlock's handler for default transcripts uploading enqueues a job and returns right away.
+        """
+        data = {'label': 'test_label', 'lang': 'test_lang', 'source': 'test_source', 'url': 'test_url'}
+        enqueue_job_mock.return_value = {'job_id': 'job-id', 'status': 'pending'}
+
+        response = self.xblock.upload_default_transcript_handler(arrange_request_mock(json.dumps(data)))
+
+        self.assertEqual(json.loads(response.body.decode()), {'job_id': 'job-id', 'status': 'pending'})
+        enqueue_job_mock.assert_called_once_with('upload_default_transcript_job', data=data)
+
     @patch('video_xblock.video_xblock.create_reference_name')
-    def test_upload_handler_default_transcript_not_in_vtt_case(self, create_reference_name_mock):
+    def test_upload_job_default_transcript_not_in_vtt_case(self, create_reference_name_mock):
         """
-        Test xBlock's handler for default transcripts uploading.
+        Test xBlock's job for default transcripts uploading.
         """
         # Arrange
         request_body = """{"label": "test_label","lang": "test_lang","source": "test_source","url": "test_url"}"""
@@ -71,7 +86,7 @@ class UploadDefaultTranscriptHandlerTests(VideoXBlockTestBase):  # pylint: disab
             type(player_mock).default_transcripts_in_vtt = PropertyMock(return_value=False)
 
             # Act
-            response = self.xblock.upload_default_transcript_handler(request_mock)
+            response = self.xblock.upload_default_transcript_job(request_mock.json)
 
             # Assert
             player_mock.download_default_transcript.assert_called_with(
@@ -84,12 +99,168 @@ class UploadDefaultTranscriptHandlerTests(VideoXBlockTestBase):  # pylint: disab
             convert_caps_mock.assert_called_with(caps=test_subs_text)
             create_transcript_file_mock.assert_called_with(trans_str=prepared_subs_mock, reference_name=test_reference)
             self.assertEqual(
-                response.body.decode(),  # pylint: disable=no-member
-                json.dumps({
+                response,
+                {
                     'success_message': 'Successfully uploaded "test_file_name".',
                     'lang': assert_data['lang'],
                     'url': test_external_url,
                     'label': assert_data['label'],
                     'source': assert_data['source'],
-                })
+                }
             )
+
+
+class DiscoverDefaultTranscriptsHandlerTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
+    """
+    Test cases for `VideoXBlock.discover_default_transcripts`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.player = Mock()
+        self.player.media_id.return_value = 'video-id'
+        self.player.get_default_transcripts.return_value = (
+            [{'lang': 'uk', 'label': 'Ukrainian'}, {'lang': 'en', 'label': 'English'}], ''
+        )
+        self.player.clean_default_transcripts.side_effect = lambda transcripts: transcripts
+        self.player.filter_default_transcripts.side_effect = lambda default, enabled: [
+            transcript for transcript in default if transcript['lang'] != 'uk'
+        ]
+
+    @patch.object(VideoXBlock, 'get_enabled_transcripts')
+    @patch.object(VideoXBlock, 'get_player')
+    def test_discover_default_transcripts(self, player_mock, _enabled_transcripts_mock):
+        """
+        Test default transcripts are fetched once per video and API credentials, and stored in the field.
+        """
+        player_mock.return_value = self.player
+
+        result = json.loads(self.xblock.discover_default_transcripts(arrange_request_mock('{}')).body)
+        self.xblock.metadata.update({'access_token': 'refreshed', 'retranscode-status': 'Submitted'})
+        self.xblock.discover_default_transcripts(arrange_request_mock('{}'))
+        self.xblock.href = 'https://example.com/other-video'
+        self.xblock.discover_default_transcripts(arrange_request_mock('{}'))
+        self.xblock.metadata['client_id'] = 'other_client_id'
+        self.xblock.discover_default_transcripts(arrange_request_mock('{}'))
+
+        self.assertEqual(result, {
+            'initial_default_transcripts': [{'lang': 'uk', 'label': 'Ukrainian'}, {'lang': 'en', 'label': 'English'}],
+            'default_transcripts': [{'lang': 'en', 'label': 'English'}],
+            'transcripts_autoupload_message': '',
+        })
+        self.assertEqual(self.xblock.default_transcripts, [{'lang': 'en', 'label': 'English'}])
+        self.assertEqual(
+            self.xblock.discovered_default_transcripts,
+            [{'lang': 'uk', 'label': 'Ukrainian'}, {'lang': 'en', 'label': 'English'}]
+        )
+        self.assertEqual(self.player.get_default_transcripts.call_count, 3)
+
+    @patch.object(VideoXBlock, 'get_enabled_transcripts')
+    @patch.object(VideoXBlock, 'get_player')
+    def test_discover_default_transcripts_failure(self, player_mock, _enabled_transcripts_mock):
+        """
+        Test failed API request is reported, and cached for a while.
+        """
+        player_mock.return_value = self.player
+        self.player.get_default_transcripts.side_effect = ApiClientError
+
+        result = json.loads(self.xblock.discover_default_transcripts(arrange_request_mock('{}')).body)
+        self.xblock.discover_default_transcripts(arrange_request_mock('{}'))
+
+        self.assertEqual(result['default_transcripts'], [])
+        self.assertEqual(result['transcripts_autoupload_message'], 'Failed to fetch default transcripts.')
+        self.assertEqual(self.xblock.discovered_default_transcripts, [])
+        self.player.get_default_transcripts.assert_called_once()
+
+
+class PlayerBundleHandlerTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
+    """
+    Test cases for `VideoXBlock.player_bundle`.
+    """
+
+    def setUp(self):
+        super(PlayerBundleHandlerTests, self).setUp()
+        self.bundle = AssetBundle('0123456789abcdef', 'js', 'application/javascript', b'var a;\n;\nvar b;')
+        self.request_mock = Mock(if_none_match=[])
+
+    def test_player_bundle(self):
+        """
+        Test bundle is served with long-living cache headers.
+        """
+        with patch.object(self.xblock, 'get_player') as get_player_mock:
+            get_player_mock.return_value.get_asset_bundles.return_value = [self.bundle]
+
+            response = self.xblock.player_bundle(self.request_mock, '0123456789abcdef.js')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, b'var a;\n;\nvar b;')
+        self.assertEqual(response.content_type, 'application/javascript')
+        self.assertEqual(response.etag, '0123456789abcdef')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+
+    def test_player_bundle_not_modified(self):
+        """
+        Test bundle isn't sent again if client has it already.
+        """
+        self.request_mock.if_none_match = ['0123456789abcdef']
+        with patch.object(self.xblock, 'get_player') as get_player_mock:
+            get_player_mock.return_value.get_asset_bundles.return_value = [self.bundle]
+
+            response = self.xblock.player_bundle(self.request_mock, '0123456789abcdef.js')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.body, b'')
+
+    def test_player_bundle_unknown(self):
+        """
+        Test unknown bundle isn't found.
+        """
+        with patch.object(self.xblock, 'get_player') as get_player_mock:
+            get_player_mock.return_value.get_asset_bundles.return_value = [self.bundle]
+
+            response = self.xblock.player_bundle(self.request_mock, 'fedcba9876543210.js')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PublishEventsHandlerTests(VideoXBlockTestBase):  # pylint: disable=test-inherits-tests
+    """
+    Test cases for `VideoXBlock.publish_events`.
+    """
+
+    def test_publish_events_in_order(self):
+        """
+        Test batched events are published in order with their timestamps, and invalid ones are rejected.
+        """
+        self.xblock.runtime.publish = Mock()
+        events = [
+            {'eventType': 'xblock-video.play_video', 'currentTime': 1, 'timestamp': '2024-05-14T00:00:01.000Z'},
+            {'currentTime': 2},
+            {'eventType': 'xblock-video.pause_video', 'currentTime': 3, 'timestamp': '2024-05-14T00:00:03.000Z'},
+        ]
+
+        response = self.xblock.publish_events(arrange_request_mock(json.dumps({'events': events})))
+
+        self.assertEqual(
+            json.loads(response.body.decode()), {'result': 'success', 'published': 2, 'rejected': 1}
+        )
+        self.assertEqual(self.xblock.runtime.publish.call_args_list, [
+            ((self.xblock, 'xblock-video.play_video', {'currentTime': 1, 'timestamp': '2024-05-14T00:00:01.000Z'}),),
+            ((self.xblock, 'xblock-video.pause_video', {'currentTime': 3, 'timestamp': '2024-05-14T00:00:03.000Z'}),),
+        ])
+
+    @patch('video_xblock.video_xblock.MAX_PUBLISHED_EVENTS_BATCH', 1)
+    def test_publish_events_malformed_batch(self):
+        """
+        Test malformed or too large batches aren't published.
+        """
+        self.xblock.runtime.publish = Mock()
+
+        missing = self.xblock.publish_events(arrange_request_mock(json.dumps({})))
+        not_object = self.xblock.publish_events(arrange_request_mock(json.dumps([{'eventType': 'play'}])))
+        too_many = self.xblock.publish_events(arrange_request_mock(json.dumps({'events': [{}, {}]})))
+
+        self.assertEqual(json.loads(missing.body.decode())['result'], 'error')
+        self.assertEqual(json.loads(not_object.body.decode())['result'], 'error')
+        self.assertEqual(json.loads(too_many.body.decode())['result'], 'error')
+        self.xblock.runtime.publish.assert_not_called()
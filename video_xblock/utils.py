@@ -3,15 +3,17 @@ Video xblock helpers.
 """
 
 from collections import namedtuple
+from functools import lru_cache
 import html
 from importlib import import_module
 from xml.sax.saxutils import unescape
 import os.path
-import pkg_resources
 
-from django.template import Engine, Context, Template
+from django.conf import settings
+from django.template import Engine, Context
 from xblock.utils.resources import ResourceLoader
 
+from .assets import static_assets
 from .constants import TranscriptSource
 
 loader = ResourceLoader(__name__)  # pylint: disable=invalid-name
@@ -27,9 +29,55 @@ def import_from(module, klass):
 def resource_string(path):
     """
     Handy helper for getting resources from our kit.
+
+    Resources are read from the package once and then served from memory.
+    """
+    return static_assets.get_text(path)
+
+
+TEMPLATE_DIRS = [os.path.join(os.path.dirname(__file__), 'static/html')]
+TEMPLATE_LIBRARIES = {'video_xblock_tags': 'video_xblock.templatetags'}
+
+
+@lru_cache(maxsize=None)
+def get_template_engine():
+    """
+    Return process-wide template engine used to compile xblock's templates.
+
+    Engine runs in debug mode only if Django's `DEBUG` setting is on.
+    """
+    return Engine(
+        dirs=TEMPLATE_DIRS,
+        debug=getattr(settings, 'DEBUG', False),
+        libraries=TEMPLATE_LIBRARIES,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_template(template_name):
+    """
+    Return compiled template from `static/html` directory, cached by `template_name`.
+    """
+    return get_template_engine().get_template(template_name)
+
+
+@lru_cache(maxsize=None)
+def get_resource_template(path):
+    """
+    Return compiled template made of a static resource, cached by resource `path`.
+    """
+    return get_template_engine().from_string(resource_string(path))
+
+
+def clear_template_cache():
+    """
+    Invalidate compiled templates and template engine.
+
+    Is useful during development, when templates are edited while the process is running.
     """
-    data = pkg_resources.resource_string(__name__, path)
-    return data.decode("utf8")
+    get_resource_template.cache_clear()
+    get_template.cache_clear()
+    get_template_engine.cache_clear()
 
 
 def render_resource(path, **context):
@@ -38,7 +86,7 @@ def render_resource(path, **context):
 
     Returns: django.utils.safestring.SafeText
     """
-    html_template = Template(resource_string(path))
+    html_template = get_resource_template(path)
     return html.unescape(
         html_template.render(Context(context))
     )
@@ -50,10 +98,7 @@ def render_template(template_name, **context):
 
     Returns: django.utils.safestring.SafeText
     """
-    template_dirs = [os.path.join(os.path.dirname(__file__), 'static/html')]
-    libraries = {'video_xblock_tags': 'video_xblock.templatetags'}
-    engine = Engine(dirs=template_dirs, debug=True, libraries=libraries)
-    html_template = engine.get_template(template_name)
+    html_template = get_template(template_name)
 
     return html.unescape(
         html_template.render(Context(context))
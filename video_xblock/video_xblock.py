@@ -12,7 +12,9 @@ Some terms could be useful for subject understanding:
 to "manual" + "default".
 """
 
+import copy
 import datetime
+import hashlib
 import json
 import logging
 import os.path
@@ -22,7 +24,7 @@ from django.utils.translation import get_language
 from opaque_keys.edx.keys import CourseKey
 from webob import Response
 from xblock.core import XBlock
-from xblock.fields import Boolean, Dict, Scope, String
+from xblock.fields import Boolean, Dict, List, Scope, String
 from xblock.fragment import Fragment
 from xblock.utils.resources import ResourceLoader
 from xblock.utils.studio_editable import StudioEditableXBlockMixin
@@ -30,9 +32,12 @@ from xmodule.contentstore.django import contentstore
 
 from . import __version__
 from .backends.base import BaseVideoPlayer
+from .backends.registry import get_player_url_registry
+from .cache import DEFAULT_CACHE_ALIAS, TTLCache, get_cache_backend
 from .constants import PlayerName, TranscriptSource
 from .exceptions import ApiClientError
 from .fields import RelativeTime
+from .jobs import get_job_state, job, submit_job
 from .mixins import (
     ContentStoreMixin,
     LocationMixin,
@@ -55,6 +60,12 @@ from .workbench.mixin import WorkbenchMixin
 loader = ResourceLoader(__name__)
 log = logging.getLogger(__name__)
 
+ASSET_BUNDLE_MAX_AGE = 365 * 24 * 60 * 60  # seconds
+PLAYER_FINGERPRINT_SCOPES = (Scope.content, Scope.settings, Scope.user_state, Scope.preferences)
+DEFAULT_TRANSCRIPTS_CACHE_TIMEOUT = 10 * 60  # seconds
+DEFAULT_TRANSCRIPTS_CACHE_FAILURE_TIMEOUT = 60  # seconds
+MAX_PUBLISHED_EVENTS_BATCH = 100
+
 
 @XBlock.needs('i18n')
 class VideoXBlock(
@@ -190,6 +201,12 @@ class VideoXBlock(
         resettable_editor=False
     )
 
+    discovered_default_transcripts = List(
+        default=[],
+        scope=Scope.content,
+        help=_('All default transcripts found on a video platform last time, enabled ones included.')
+    )
+
     token = String(
         default='',
         display_name=_('Video API Token'),
@@ -224,10 +241,7 @@ class VideoXBlock(
         """
         is_not_provided_href = \
             data.href == self.fields['href'].default  # pylint: disable=unsubscriptable-object
-        is_matched_href = False
-        for _player_name, player_class in BaseVideoPlayer.load_classes():
-            if player_class.match(data.href):
-                is_matched_href = True
+        is_matched_href = get_player_url_registry().match(data.href) is not None
         # Validate provided video href value
         if not (is_not_provided_href or is_matched_href):
             self.add_validation_message(
@@ -318,11 +332,36 @@ class VideoXBlock(
         frag.initialize_js('VideoXBlockStudentViewInit')
         return frag
 
-    def _update_default_transcripts(self, player, transcripts):
+    @property
+    def default_transcripts_cache(self):
         """
-        Private method to fetch/update default transcripts.
+        Return cache of default transcripts lists fetched from video platforms' APIs.
+
+        Cache lifetimes can be tuned with `default_transcripts_cache_timeout` and
+        `default_transcripts_cache_failure_timeout` settings, Django cache with `cache_alias` setting.
         """
-        log.debug("Default transcripts updating...")
+        return TTLCache(
+            namespace='default-transcripts',
+            timeout=self.settings.get('default_transcripts_cache_timeout', DEFAULT_TRANSCRIPTS_CACHE_TIMEOUT),
+            failure_timeout=self.settings.get(
+                'default_transcripts_cache_failure_timeout', DEFAULT_TRANSCRIPTS_CACHE_FAILURE_TIMEOUT
+            ),
+            backend=get_cache_backend(self.settings.get('cache_alias', DEFAULT_CACHE_ALIAS)),
+        )
+
+    def _fetch_default_transcripts(self, player):
+        """
+        Authenticate to a video platform's API and fetch the list of default transcripts.
+
+        Returns:
+            tuple: Distinct default transcripts and autoupload message, None if API request has failed.
+        """
+        # Authenticate to API of the player video platform and update metadata with auth information.
+        # Note that there is no need to authenticate to Youtube API,
+        # whilst for Wistia, a sample authorised request is to be made to ensure authentication succeeded.
+        if self.token:
+            self.authenticate_video_api(self.token.encode(encoding='utf-8'))
+
         # Prepare parameters necessary to make requests to API.
         video_id = player.media_id(self.href)
         kwargs = {'video_id': video_id}
@@ -338,20 +377,64 @@ class VideoXBlock(
         try:
             default_transcripts, transcripts_autoupload_message = player.get_default_transcripts(**kwargs)
         except ApiClientError:
-            default_transcripts, transcripts_autoupload_message = [], _('Failed to fetch default transcripts.')
-        log.debug("Autofetch message: '{}'".format(transcripts_autoupload_message))
+            return None
         # Default transcripts should contain transcripts of distinct languages only
-        distinct_default_transcripts = player.clean_default_transcripts(default_transcripts)
+        return player.clean_default_transcripts(default_transcripts), transcripts_autoupload_message
+
+    def _update_default_transcripts(self, player, transcripts):
+        """
+        Private method to fetch/update default transcripts.
+
+        Lists of default transcripts are cached per xblock, its video and API credentials,
+        so reopening of the editor doesn't call a video platform's API. Other metadata (e.g. access tokens
+        refreshed on authentication, or re-transcoding status) doesn't invalidate cached lists.
+        """
+        log.debug("Default transcripts updating...")
+        credentials = [self.metadata.get(key) for key in ('token', 'client_id', 'client_secret')]
+        key_parts = (str(self.usage_id), str(self.player_name), self.href, self.token, credentials, self.account_id)
+        fetched = self.default_transcripts_cache.get_or_fetch(
+            key_parts, lambda: self._fetch_default_transcripts(player)
+        )
+        if fetched is None:
+            distinct_default_transcripts, transcripts_autoupload_message = [], _('Failed to fetch default transcripts.')
+        else:
+            distinct_default_transcripts, transcripts_autoupload_message = fetched
+            # Kept for the editor to be rendered with, until default transcripts are discovered again.
+            if distinct_default_transcripts != self.discovered_default_transcripts:
+                self.discovered_default_transcripts = distinct_default_transcripts
+        log.debug("Autofetch message: '{}'".format(transcripts_autoupload_message))
         # Needed for frontend
         initial_default_transcripts = distinct_default_transcripts
         # Exclude enabled transcripts from the list of available ones, and remove duplicates
         filtered_default_transcripts = player.filter_default_transcripts(distinct_default_transcripts, transcripts)
-        self.default_transcripts = filtered_default_transcripts
-        if self.default_transcripts:
-            self.default_transcripts.sort(key=lambda l: l['label'])
+        filtered_default_transcripts.sort(key=lambda l: l['label'])
+        # Unchanged field isn't assigned, so that opening of the editor doesn't produce unpublished changes.
+        if filtered_default_transcripts != (self.default_transcripts or []):
+            self.default_transcripts = filtered_default_transcripts
 
         return initial_default_transcripts, transcripts_autoupload_message
 
+    @XBlock.json_handler
+    def discover_default_transcripts(self, _data, _suffix=''):
+        """
+        Fetch transcripts available on a video platform. Called by JavaScript of `studio_view` once it's rendered.
+
+        Arguments:
+            _data (dict): Data from frontend. Not used.
+            _suffix (str): Slug used for routing. Imposed by `XBlock.json_handler`.
+        Returns:
+            response (dict): All default transcripts, ones available to be enabled and autoupload message.
+        """
+        initial_default_transcripts, transcripts_autoupload_message = self._update_default_transcripts(
+            self.get_player(), self.get_enabled_transcripts()
+        )
+        log.debug("Fetched default transcripts: {}".format(initial_default_transcripts))
+        return {
+            'initial_default_transcripts': initial_default_transcripts,
+            'default_transcripts': self.default_transcripts or [],
+            'transcripts_autoupload_message': transcripts_autoupload_message,
+        }
+
     def studio_view(self, _context):
         """
         Render a form for XBlock editing.
@@ -362,25 +445,17 @@ class VideoXBlock(
         languages.sort(key=lambda l: l['label'])
         transcripts = self.get_enabled_transcripts()
         download_transcript_handler_url = self.runtime.handler_url(self, 'download_transcript')
-        auth_error_message = ''
-        # Authenticate to API of the player video platform and update metadata with auth information.
-        # Note that there is no need to authenticate to Youtube API,
-        # whilst for Wistia, a sample authorised request is to be made to ensure authentication succeeded,
-        # since it is needed for the auth status message generation and the player's state update with auth status.
-        if self.token:
-            _auth_data, auth_error_message = self.authenticate_video_api(self.token.encode(encoding='utf-8'))
-
-        initial_default_transcripts, transcripts_autoupload_message = self._update_default_transcripts(
-            player, transcripts
-        )
-        log.debug("Fetched default transcripts: {}".format(initial_default_transcripts))
+        # Default transcripts are rendered as they were discovered last time: a video platform's API
+        # is called by `discover_default_transcripts` handler once the editor is shown.
+        default_transcripts = self.default_transcripts or []
+        # Unfiltered list lets enabled default transcripts be put back to available ones, even if discovery fails.
+        initial_default_transcripts = self.discovered_default_transcripts or default_transcripts
 
         # Prepare basic_fields and advanced_fields for them to be rendered
         basic_fields = self.prepare_studio_editor_fields(player.basic_fields)
         advanced_fields = self.prepare_studio_editor_fields(player.advanced_fields)
         context = {
             'advanced_fields': advanced_fields,
-            'auth_error_message': auth_error_message,
             'basic_fields': basic_fields,
             'courseKey': self.course_key,
             'languages': languages,
@@ -394,11 +469,11 @@ class VideoXBlock(
             'transcripts_fields': self.prepare_studio_editor_fields(player.trans_fields),
             'three_pm_fields': self.prepare_studio_editor_fields(player.three_pm_fields),
             'transcripts_type': '3PM' if self.threeplaymedia_streaming else 'manual',
-            'default_transcripts': self.default_transcripts,
+            'default_transcripts': default_transcripts,
             'enabled_default_transcripts': filter_transcripts_by_source(transcripts),
             'enabled_managed_transcripts': self.get_enabled_managed_transcripts(),
             'initial_default_transcripts': initial_default_transcripts,
-            'transcripts_autoupload_message': transcripts_autoupload_message,
+            'transcripts_autoupload_message': '',
             'download_transcript_handler_url': download_transcript_handler_url,
             'i18n_service': self.runtime.service(self, 'i18n'),
         }
@@ -421,20 +496,63 @@ class VideoXBlock(
         fragment.initialize_js('StudioEditableXBlock', js_context)
         return fragment
 
+    def get_player_fingerprint(self):
+        """
+        Compute a cheap fingerprint of everything the rendered player depends on.
+
+        These are xblock's content and settings (video, transcripts), learner's player state
+        (including buffered playback progress), package version, current language and xblock settings.
+
+        Returns:
+            str: Hex digest to be used as the player page `ETag`.
+        """
+        fields_state = {
+            field_name: field.to_json(field.read_from(self))
+            for field_name, field in self.fields.items()  # pylint: disable=no-member
+            if field.scope in PLAYER_FINGERPRINT_SCOPES
+        }
+        fingerprint = json.dumps(
+            [
+                __version__, get_language(), str(self.block_id), self.settings, fields_state,
+                self.get_buffered_playback_progress(),
+            ],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha1(fingerprint.encode('utf8')).hexdigest()
+
     @XBlock.handler
-    def render_player(self, _request, _suffix=''):
+    def render_player(self, request, _suffix=''):
         """
         View `student_view` loads this handler as an iframe to display actual video player.
 
+        Player page is validated by `ETag`, so unchanged player isn't rendered and sent again.
+
         Arguments:
-            _request (webob.Request): Request to handle. Imposed by `XBlock.handler`.
+            request (webob.Request): Request to handle. Imposed by `XBlock.handler`.
             _suffix (string): Slug used for routing. Imposed by `XBlock.handler`.
         Returns:
             Rendered html string as a Response (webob.Response).
         """
+        etag = self.get_player_fingerprint()
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = self._render_player_response()
+        response.etag = etag
+        response.cache_control = 'private, no-cache'
+        return response
+
+    def _render_player_response(self):
+        """
+        Render video player page.
+        """
         player = self.get_player()
         is_brightcove = str(self.player_name) == PlayerName.BRIGHTCOVE
         save_state_url = self.runtime.handler_url(self, 'save_player_state')
+        playback_progress_interval = self.playback_progress_interval
+        playback_progress_url = (
+            self.runtime.handler_url(self, 'save_playback_progress') if playback_progress_interval else ''
+        )
         transcripts = render_resource(
             'static/html/transcripts.html',
             transcripts=list(self.route_transcripts())
@@ -444,6 +562,9 @@ class VideoXBlock(
             video_id=player.media_id(self.href),
             video_player_id='video_player_{}'.format(self.block_id),
             save_state_url=save_state_url,
+            publish_events_url=self.runtime.handler_url(self, 'publish_events'),
+            playback_progress_url=playback_progress_url,
+            playback_progress_interval=playback_progress_interval,
             player_state=self.player_state,
             start_time=int(self.start_time.total_seconds()),  # pylint: disable=no-member
             end_time=int(self.end_time.total_seconds()),  # pylint: disable=no-member
@@ -452,6 +573,32 @@ class VideoXBlock(
             app_id=self.app_id,
         )
 
+    @XBlock.handler
+    def player_bundle(self, request, suffix=''):
+        """
+        Serve a content-hashed bundle of player's static files, see `BaseVideoPlayer.bundle_assets`.
+
+        Bundle content never changes for a given digest, hence it is cached by browsers for a long time.
+
+        Arguments:
+            request (webob.Request): Request to handle.
+            suffix (string): Bundle file name, e.g. '1f2e3d4c5b6a7980.js'.
+        Returns:
+            Bundle content as a Response (webob.Response).
+        """
+        digest = suffix.split('.')[0]
+        for bundle in self.get_player().get_asset_bundles():
+            if bundle.digest != digest:
+                continue
+            if digest in request.if_none_match:
+                response = Response(status=304)
+            else:
+                response = Response(body=bundle.content, content_type=bundle.content_type, charset='utf8')
+            response.etag = bundle.digest
+            response.cache_control = 'public, max-age={}, immutable'.format(ASSET_BUNDLE_MAX_AGE)
+            return response
+        return Response(status=404)
+
     @XBlock.json_handler
     def publish_event(self, data, _suffix=''):
         """
@@ -463,13 +610,46 @@ class VideoXBlock(
         Returns:
             Data on result (dict).
         """
-        try:
-            event_type = data.pop('eventType')
-        except KeyError:
+        if not self._publish_event(data):
             return {'result': 'error', 'message': 'Missing eventType in JSON data'}
+        return {'result': 'success'}
 
+    @XBlock.json_handler
+    def publish_events(self, data, _suffix=''):
+        """
+        Handler to publish a batch of XBlock events from frontend. Called by JavaScript of `student_view`.
+
+        Events are published in the order they're sent; each of them keeps its client-side `timestamp`.
+
+        Arguments:
+            data (dict): Data from frontend, `events` is a list of events' data.
+            _suffix (string): Slug used for routing. Imposed by `XBlock.json_handler`.
+        Returns:
+            Data on result (dict).
+        """
+        events = data.get('events') if isinstance(data, dict) else None
+        if not isinstance(events, list):
+            return {'result': 'error', 'message': 'Missing events in JSON data'}
+        if len(events) > MAX_PUBLISHED_EVENTS_BATCH:
+            return {'result': 'error', 'message': 'Too many events in a batch'}
+
+        published = sum(1 for event in events if self._publish_event(event))
+        return {'result': 'success', 'published': published, 'rejected': len(events) - published}
+
+    def _publish_event(self, data):
+        """
+        Publish XBlock event, unless its type is missing.
+
+        Arguments:
+            data (dict): Data on the event, including `eventType`.
+        Returns:
+            bool: Whether the event is published.
+        """
+        if not isinstance(data, dict) or 'eventType' not in data:
+            return False
+        event_type = data.pop('eventType')
         self.runtime.publish(self, event_type, data)
-        return {'result': 'success'}
+        return True
 
     def clean_studio_edits(self, data):
         """
@@ -482,23 +662,34 @@ class VideoXBlock(
             data (dict): POST data.
         """
         data['player_name'] = self.fields['player_name'].default  # pylint: disable=unsubscriptable-object
-        for player_name, player_class in BaseVideoPlayer.load_classes():
-            if player_name == PlayerName.DUMMY:
-                continue
-            if player_class.match(data['href']):
-                data['player_name'] = player_name
-                log.debug("Submitted player[{}] with data: {}".format(player_name, data))
-                break
+        player_match = get_player_url_registry().match(data['href'])
+        if player_match and player_match.player_name != PlayerName.DUMMY:
+            data['player_name'] = player_match.player_name
+            log.debug("Submitted player[{}] with data: {}".format(player_match.player_name, data))
 
     def get_player(self):
         """
         Helper method to load video player by entry-point label.
 
+        Player object is created once per xblock instance and re-created only if
+        `player_name` or `metadata` (e.g. API credentials) have changed.
+
         Returns:
             Current player object (instance of a platform-specific player class).
         """
-        player = BaseVideoPlayer.load_class(self.player_name)
-        return player(self)
+        cache_key = (self.player_name, self.metadata)
+        cached = getattr(self, '_player_cache', None)
+        if cached is None or cached[0] != cache_key:
+            player = BaseVideoPlayer.load_class(self.player_name)
+            # Metadata is copied since it can be updated in place.
+            cached = self._player_cache = ((self.player_name, copy.deepcopy(self.metadata)), player(self))
+        return cached[1]
+
+    def invalidate_player(self):
+        """
+        Drop cached player object.
+        """
+        self._player_cache = None
 
     def _get_field_help(self, field_name, field):
         """
@@ -647,6 +838,49 @@ class VideoXBlock(
         """
         return self.get_player().dispatch(request, suffix)
 
+    @job()
+    def dispatch_job(self, suffix):
+        """
+        Run player's slow `dispatch()` entry point, e.g. Brightcove re-transcoding, as a background job.
+
+        Metadata changed by the entry point (e.g. `retranscode-status`) is saved after the job.
+
+        Arguments:
+            suffix (str): Name of the entry point.
+        Returns:
+            Result of the entry point.
+        """
+        return self.get_player().dispatch(None, suffix, background=False)
+
+    def enqueue_job(self, name, **kwargs):
+        """
+        Run a method marked as a job in background on behalf of the current user.
+
+        Arguments:
+            name (str): Name of the method.
+            kwargs: JSON-serializable arguments of the method.
+        Returns:
+            dict: Pending job's state, including `job_id` to be checked with `job_status` handler.
+        """
+        return submit_job(self, name, self.scope_ids.user_id, **kwargs)
+
+    @XBlock.json_handler
+    def job_status(self, data, _suffix=''):
+        """
+        Report state of a background job.
+
+        Arguments:
+            data (dict): Data from frontend, containing `job_id`.
+            _suffix (str): Slug used for routing. Imposed by `XBlock.json_handler`.
+        Returns:
+            response (dict): Job's state: status and, when the job is finished, its result or error.
+        """
+        job_id = str(data.get('job_id', ''))
+        state = get_job_state(job_id) or self.metadata.get('jobs', {}).get(job_id)
+        if state is None or state.get('usage_id') != str(self.scope_ids.usage_id):
+            return {'job_id': job_id, 'status': 'unknown'}
+        return state
+
     @XBlock.handler
     def ui_dispatch(self, _request, suffix):
         """
@@ -807,17 +1041,58 @@ class VideoXBlock(
 
         return Response(json.dumps(response), content_type='application/json', charset='utf8')
 
+    def fetch_default_transcript(self, player, video_id, data):
+        """
+        Download a default transcript from a video platform's API and convert it to WebVTT.
+
+        Doesn't read xblock's fields, so it can be used by worker threads of bulk operations.
+
+        Arguments:
+            player (BaseVideoPlayer): Player of the video the transcript belongs to.
+            video_id (str): Video ID on a video platform.
+            data (dict): Data on a default transcript (lang, label, url and source).
+        Returns:
+            tuple: Reference name of a transcript file and transcript in WebVTT format (empty on failure).
+        """
+        lang_code = str(data.get(u'lang'))
+        source = str(data.get(u'source', ''))
+        reference_name = create_reference_name(str(data.get(u'label')), video_id, source)
+
+        # Fetch text of single default transcript:
+        unicode_subs_text = player.download_default_transcript(str(data.get(u'url')), lang_code)
+        if not unicode_subs_text:
+            return reference_name, u''
+
+        if not player.default_transcripts_in_vtt:
+            return reference_name, self.convert_caps_to_vtt(caps=unicode_subs_text)
+        return reference_name, unicode_subs_text
+
     @XBlock.json_handler
     def upload_default_transcript_handler(self, data, _suffix=''):
         """
         Upload a transcript, fetched from a video platform's API, to video xblock.
 
+        The transcript is fetched and uploaded by a background job; result of the job is
+        reported by `job_status` handler.
+
         Arguments:
             data (dict): Data from frontend on a default transcript to be fetched from a video platform.
             _suffix (str): Slug used for routing. Imposed by `XBlock.json_handler`.
         Returns:
-            response (dict): Data on a default transcript, fetched from a video platform.
+            response (dict): Pending job's state.
+        """
+        log.debug("Enqueuing default transcript upload with data: {}".format(data))
+        return self.enqueue_job('upload_default_transcript_job', data=data)
 
+    @job(persist=False)
+    def upload_default_transcript_job(self, data):
+        """
+        Fetch a transcript from a video platform's API, and save it as an asset.
+
+        Arguments:
+            data (dict): Data on a default transcript to be fetched from a video platform.
+        Returns:
+            response (dict): Data on a default transcript, fetched from a video platform.
         """
         log.debug("Uploading default transcript with data: {}".format(data))
         player = self.get_player()
@@ -825,20 +1100,11 @@ class VideoXBlock(
         lang_code = str(data.get(u'lang'))
         lang_label = str(data.get(u'label'))
         source = str(data.get(u'source', ''))
-        sub_url = str(data.get(u'url'))
-
-        reference_name = create_reference_name(lang_label, video_id, source)
 
-        # Fetch text of single default transcript:
-        unicode_subs_text = player.download_default_transcript(sub_url, lang_code)
-        if not unicode_subs_text:
+        reference_name, prepared_subs = self.fetch_default_transcript(player, video_id, data)
+        if not prepared_subs:
             return {'failure_message': _("Couldn't upload transcript text.")}
 
-        if not player.default_transcripts_in_vtt:
-            prepared_subs = self.convert_caps_to_vtt(caps=unicode_subs_text)
-        else:
-            prepared_subs = unicode_subs_text
-
         file_name, external_url = self.create_transcript_file(
             trans_str=prepared_subs, reference_name=reference_name
         )
@@ -858,13 +1124,23 @@ class VideoXBlock(
     def get_enabled_transcripts(self):
         """
         Get transcripts from different sources depending on current usage mode.
+
+        Transcripts are evaluated once per xblock instance, i.e. once per request, and re-evaluated
+        only if fields they depend on have changed. Callers get their own copies of transcript dicts.
         """
-        if self.threeplaymedia_streaming:
-            transcripts = normalize_transcripts(list(self.fetch_available_3pm_transcripts()))
-        else:
-            transcripts = self.get_enabled_managed_transcripts()
-        log.debug("Getting enabled transcripts: %s", transcripts)
-        return transcripts
+        cache_key = (
+            self.threeplaymedia_streaming, self.threeplaymedia_file_id, self.threeplaymedia_apikey,
+            self.transcripts, self.href, self.player_name
+        )
+        cached = getattr(self, '_enabled_transcripts_cache', None)
+        if cached is None or cached[0] != cache_key:
+            if self.threeplaymedia_streaming:
+                transcripts = normalize_transcripts(list(self.fetch_available_3pm_transcripts()))
+            else:
+                transcripts = self.get_enabled_managed_transcripts()
+            log.debug("Getting enabled transcripts: %s", transcripts)
+            cached = self._enabled_transcripts_cache = (cache_key, transcripts)
+        return [dict(transcript) for transcript in cached[1]]
 
     def get_enabled_managed_transcripts(self):
         """
@@ -880,6 +1156,22 @@ class VideoXBlock(
             log.exception("JSON parser can't handle 'self.transcripts' field value: {}".format(self.transcripts))
             return []
 
+    def prefetch_3pm_transcripts(self, transcripts):
+        """
+        Concurrently fetch contents of 3PlayMedia transcripts among given ones.
+
+        Arguments:
+            transcripts (list): Transcripts' data dicts, as returned by `route_transcripts`.
+        Returns:
+            dict: Fetched transcripts (`Transcript` instances or None on failure) by transcript ID.
+        """
+        transcripts_data = [
+            {'id': transcript['id'], 'language_id': transcript['lang_id']}
+            for transcript in transcripts if transcript.get('source') == TranscriptSource.THREE_PLAY_MEDIA
+        ]
+        fetched = self.fetch_3pm_translations(transcripts_data) if transcripts_data else []
+        return {data['id']: transcript for data, transcript in zip(transcripts_data, fetched)}
+
     def index_dictionary(self):
         """
         Part of edx-platform search index API.
@@ -890,20 +1182,20 @@ class VideoXBlock(
         xblock_body = super(VideoXBlock, self).index_dictionary()
         video_body = {"display_name": self.display_name}
 
-        content = None
-        enabled_transcripts = self.route_transcripts()
+        enabled_transcripts = list(self.route_transcripts())
+        external_transcripts = self.prefetch_3pm_transcripts(enabled_transcripts)
         for transcript in enabled_transcripts:
-            asset_file_name = transcript[u'url'].split('@')[-1]
+            if transcript['source'] not in [
+                    TranscriptSource.MANUAL, TranscriptSource.DEFAULT, TranscriptSource.THREE_PLAY_MEDIA
+            ]:
+                continue
+            external_transcript = external_transcripts.get(transcript.get('id'))
+            if transcript['source'] == TranscriptSource.THREE_PLAY_MEDIA and external_transcript is None:
+                # Failed prefetch isn't repeated transcript by transcript.
+                log.warning("Transcript indexing failure: can't fetch external transcript[{}]".format(transcript))
+                continue
             try:
-                if transcript['source'] in [TranscriptSource.MANUAL, TranscriptSource.DEFAULT]:
-                    asset_location = self.static_content.compute_location(self.course_key, asset_file_name)
-                    asset = self.contentstore().find(asset_location)  # pylint: disable=not-callable
-                    content = asset.data
-                elif transcript['source'] == TranscriptSource.THREE_PLAY_MEDIA:
-                    external_transcript = self.fetch_single_3pm_translation({
-                        'id': transcript['id'], 'language_id': transcript['lang_id']
-                    })
-                    content = external_transcript and external_transcript.content
+                cue_index = self.get_transcript_cue_index(transcript, external_transcript)
             except IOError:
                 log.exception("Transcript indexing failure: can't fetch external transcript[{}]".format(transcript))
             except (ValueError, KeyError, TypeError, AttributeError):
@@ -911,11 +1203,8 @@ class VideoXBlock(
                     "Transcript indexing failure: can't parse transcript for indexing: [{}]".format(transcript)
                 )
             else:
-                if content:
-                    content_ = self.vtt_to_text(content)
-                    video_body.update({transcript[u'lang']: content_})
-            finally:
-                content = None
+                if cue_index:
+                    video_body.update({transcript[u'lang']: cue_index.get_plain_text()})
 
         if "content" in xblock_body:
             xblock_body["content"].update(video_body)